@@ -0,0 +1,63 @@
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class AIWorker:
+    """Runs AI searches on a pooled thread and hands results back through a queue"""
+
+    def __init__(self, max_workers=1, executor=None, notify=None):
+        # A shared executor lets many games queue their searches on the same threads
+        self.owns_executor = executor is None
+        self.executor = executor or ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ai")
+        self.results = queue.Queue()
+        self.generation = 0
+        self.stop_event = threading.Event()
+        self.pending = None
+        self.notify = notify  # Called from the worker thread after each result, e.g. to wake an event loop
+
+    @property
+    def busy(self):
+        """True while a search of the current generation is queued or running"""
+        return self.pending is not None and not self.pending.done()
+
+    def submit(self, search, *args):
+        """Run search(stop_event, *args) on the worker, replacing any in-flight search"""
+        self.cancel()
+        self.pending = self.executor.submit(self._run, self.generation, self.stop_event, search, args)
+
+    def _run(self, generation, stop_event, search, args):
+        if stop_event.is_set():
+            return
+        try:
+            result = search(stop_event, *args)
+        except Exception as e:
+            print(f"AI search failed: {e}")
+            result = None
+        self.results.put((generation, result))
+        if self.notify is not None:
+            self.notify()
+
+    def cancel(self):
+        """Stop the in-flight search and discard anything it still returns"""
+        self.generation += 1
+        self.stop_event.set()
+        self.stop_event = threading.Event()
+        self.pending = None
+
+    def poll(self):
+        """Return the newest result of the current generation without blocking, or None"""
+        latest = None
+        while True:
+            try:
+                generation, result = self.results.get_nowait()
+            except queue.Empty:
+                return latest
+            if generation == self.generation and result is not None:
+                latest = result
+
+    def shutdown(self):
+        """Cancel outstanding work and stop the worker thread, unless it is shared"""
+        self.cancel()
+        if self.owns_executor:
+            self.executor.shutdown(wait=True, cancel_futures=True)
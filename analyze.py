@@ -0,0 +1,324 @@
+import argparse
+import json
+import os
+import sys
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import chess
+import chess.engine
+import chess.pgn
+import chess.polyglot
+
+from engine_manager import EngineManager
+from search import MATE_SCORE, MATE_THRESHOLD, Searcher
+
+DEFAULT_DEPTH = 12        # Engine depth per position
+DEFAULT_NODES = 20000     # Built-in search budget per position when no engine is installed
+DEFAULT_CACHE_SIZE = 200000
+MATE_CP = 1000            # A mate counts as this many centipawns when measuring a move's loss
+
+# Centipawns a move must lose to earn each flag, worst first
+FLAGS = [
+    ("blunder", 200, chess.pgn.NAG_BLUNDER),
+    ("mistake", 100, chess.pgn.NAG_MISTAKE),
+    ("inaccuracy", 50, chess.pgn.NAG_DUBIOUS_MOVE),
+]
+
+# Built-in searcher of each worker process, kept so its tables survive between positions
+_worker_searcher = None
+
+
+def _init_worker():
+    global _worker_searcher
+    _worker_searcher = Searcher()
+
+
+def search_position(board, max_nodes):
+    """Process-pool entry point: analyse board with the built-in search"""
+    result = _worker_searcher.search(board, max_nodes=max_nodes)
+    score = result.score
+    if abs(score) >= MATE_THRESHOLD:
+        plies = MATE_SCORE - abs(score)
+        relative = chess.engine.Mate((plies + 1) // 2 if score > 0 else -(plies // 2))
+    else:
+        relative = chess.engine.Cp(score)
+    best = result.move.uci() if result.move is not None else None
+    return chess.engine.PovScore(relative, board.turn), best
+
+
+def terminal_score(board):
+    """Score of a finished position, or None if the game goes on"""
+    if board.is_checkmate():
+        return chess.engine.PovScore(chess.engine.Mate(0), board.turn)
+    if board.is_stalemate() or board.is_insufficient_material():
+        return chess.engine.PovScore(chess.engine.Cp(0), board.turn)
+    return None
+
+
+def centipawns(score, color):
+    """Score from color's point of view, with mates clamped to MATE_CP"""
+    cp = score.pov(color).score(mate_score=MATE_CP)
+    return max(-MATE_CP, min(MATE_CP, cp))
+
+
+class PositionCache:
+    """LRU of (score, best move) keyed by the Polyglot Zobrist hash"""
+
+    def __init__(self, size=DEFAULT_CACHE_SIZE):
+        self.size = size
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """Return the cached analysis for key, or None"""
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(self, key, entry):
+        """Remember an analysis, dropping the least recently used one if full"""
+        self.entries[key] = entry
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.size:
+            self.entries.popitem(last=False)
+
+
+class GameAnalyser:
+    """Analyse every position of a game on a pool of engine workers"""
+
+    def __init__(self, engine_path=None, workers=1, depth=DEFAULT_DEPTH, max_nodes=DEFAULT_NODES,
+                 cache_size=DEFAULT_CACHE_SIZE):
+        self.cache = PositionCache(cache_size)
+        self.limit = chess.engine.Limit(depth=depth)
+        self.max_nodes = max_nodes
+        self.positions = 0
+
+        # UCI engines are separate processes, so threads are enough to keep them busy;
+        # the built-in search needs processes of its own
+        self.engine = EngineManager(engine_path, pool_size=workers, limit=self.limit)
+        self.engine.start()
+        if self.engine.available:
+            self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="analyse")
+        else:
+            self.engine = None
+            self.executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker)
+
+    @property
+    def name(self):
+        """Name of the analysing engine for PGN headers"""
+        if self.engine is None:
+            return f"ChessGame search ({self.max_nodes} nodes)"
+        return f"{os.path.basename(self.engine.path)} (depth {self.limit.depth})"
+
+    def _engine_position(self, board):
+        analysis = self.engine.analyse(board)
+        if analysis is None:
+            return None
+        score, move = analysis
+        return score, move.uci() if move is not None else None
+
+    def _submit(self, board):
+        if self.engine is not None:
+            return self.executor.submit(self._engine_position, board)
+        return self.executor.submit(search_position, board, self.max_nodes)
+
+    def analyse_positions(self, boards):
+        """Return (score, best move UCI) for each board, searching each new position once"""
+        keys = [chess.polyglot.zobrist_hash(board) for board in boards]
+        results = {}
+        pending = {}
+        for board, key in zip(boards, keys):
+            if key in results or key in pending:
+                continue
+            cached = self.cache.get(key)
+            if cached is not None:
+                results[key] = cached
+                continue
+            score = terminal_score(board)
+            if score is not None:
+                results[key] = (score, None)
+            else:
+                pending[key] = self._submit(board)
+
+        for key, future in pending.items():
+            analysis = future.result()
+            if analysis is not None:
+                self.cache.put(key, analysis)
+                self.positions += 1
+            results[key] = analysis
+        return [results[key] for key in keys]
+
+    def close(self):
+        """Stop the workers and engines"""
+        self.executor.shutdown(wait=True, cancel_futures=True)
+        if self.engine is not None:
+            self.engine.shutdown()
+
+
+def annotate(game, analyser):
+    """Add evals and blunder flags to game's mainline and return its JSON summary"""
+    nodes = list(game.mainline())
+    # One running board; node.board() would replay the game from the start for every ply
+    board = game.board()
+    boards = [board.copy()]
+    for node in nodes:
+        board.push(node.move)
+        boards.append(board.copy())
+    analyses = analyser.analyse_positions(boards)
+
+    moves = []
+    for ply, node in enumerate(nodes):
+        before, after = analyses[ply], analyses[ply + 1]
+        board = boards[ply]
+        record = {"ply": ply + 1, "move": board.san(node.move)}
+        if before is None or after is None:
+            moves.append(record)
+            continue
+
+        node.set_eval(after[0])
+        loss = max(0, centipawns(before[0], board.turn) - centipawns(after[0], board.turn))
+        record["eval"] = str(after[0].white())
+        record["cp"] = centipawns(after[0], chess.WHITE)
+        record["loss"] = loss
+
+        best = chess.Move.from_uci(before[1]) if before[1] else None
+        if best is not None:
+            record["best"] = board.san(best)
+        for flag, threshold, nag in FLAGS:
+            if loss >= threshold and best != node.move:
+                record["flag"] = flag
+                node.nags.add(nag)
+                if best is not None:
+                    node.comment = f"{node.comment} Best: {board.san(best)}".strip()
+                break
+        moves.append(record)
+
+    headers = game.headers
+    flags = [move.get("flag") for move in moves]
+    return {
+        "white": headers.get("White", "?"),
+        "black": headers.get("Black", "?"),
+        "date": headers.get("Date", "?"),
+        "result": headers.get("Result", "*"),
+        "plies": len(nodes),
+        "blunders": flags.count("blunder"),
+        "mistakes": flags.count("mistake"),
+        "inaccuracies": flags.count("inaccuracy"),
+        "moves": moves,
+    }
+
+
+def load_checkpoint(path):
+    """Read a checkpoint, or None if there is none"""
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def save_checkpoint(path, checkpoint):
+    """Write a checkpoint atomically so a crash never leaves a truncated file"""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(checkpoint, f)
+    os.replace(tmp_path, path)
+
+
+def open_output(path, size):
+    """Open an output file, cutting it back to size bytes when resuming"""
+    if path is None:
+        return None
+    if size is None:
+        return open(path, "w")
+    try:
+        f = open(path, "r+")
+    except FileNotFoundError:
+        print(f"{path} is missing; it only gets the games analysed from here on")
+        return open(path, "w")
+    f.seek(size)
+    f.truncate()
+    return f
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Annotate PGN games with engine analysis")
+    parser.add_argument("input", help="PGN file to analyse")
+    parser.add_argument("--pgn", help="annotated PGN output file")
+    parser.add_argument("--jsonl", help="JSONL output file, one summary per game")
+    parser.add_argument("-j", "--workers", type=int, default=os.cpu_count(), help="engine workers")
+    parser.add_argument("--engine", help="UCI engine path (default: STOCKFISH_PATH or stockfish)")
+    parser.add_argument("--depth", type=int, default=DEFAULT_DEPTH, help="engine depth per position")
+    parser.add_argument("--nodes", type=int, default=DEFAULT_NODES,
+                        help="built-in search nodes per position when no engine is installed")
+    parser.add_argument("--cache-size", type=int, default=DEFAULT_CACHE_SIZE,
+                        help="positions remembered across games")
+    parser.add_argument("--checkpoint", help="checkpoint file (default: <input>.checkpoint)")
+    parser.add_argument("--resume", action="store_true", help="continue from the checkpoint")
+    args = parser.parse_args(argv)
+
+    if args.pgn is None and args.jsonl is None:
+        args.jsonl = os.path.splitext(args.input)[0] + ".analysis.jsonl"
+    checkpoint_path = args.checkpoint or args.input + ".checkpoint"
+    checkpoint = load_checkpoint(checkpoint_path) if args.resume else None
+    if checkpoint is None:
+        checkpoint = {"offset": 0, "games": 0, "pgn_size": None, "jsonl_size": None}
+    elif checkpoint["games"]:
+        print(f"Resuming after game {checkpoint['games']}")
+
+    analyser = GameAnalyser(args.engine, args.workers, args.depth, args.nodes, args.cache_size)
+    pgn_file = open_output(args.pgn, checkpoint["pgn_size"])
+    jsonl_file = open_output(args.jsonl, checkpoint["jsonl_size"])
+    started = time.perf_counter()
+    analysed = 0
+    try:
+        with open(args.input, encoding="utf-8", errors="replace") as source:
+            source.seek(checkpoint["offset"])
+
+            # One game in memory at a time; its positions are analysed in parallel
+            while True:
+                game = chess.pgn.read_game(source)
+                if game is None:
+                    break
+                game.headers["Annotator"] = analyser.name
+                summary = annotate(game, analyser)
+                summary["game"] = checkpoint["games"]
+
+                if pgn_file is not None:
+                    pgn_file.write(str(game) + "\n\n")
+                    pgn_file.flush()
+                    checkpoint["pgn_size"] = pgn_file.tell()
+                if jsonl_file is not None:
+                    jsonl_file.write(json.dumps(summary) + "\n")
+                    jsonl_file.flush()
+                    checkpoint["jsonl_size"] = jsonl_file.tell()
+                checkpoint["offset"] = source.tell()
+                checkpoint["games"] += 1
+                save_checkpoint(checkpoint_path, checkpoint)
+
+                analysed += 1
+                print(f"Game {checkpoint['games']}: {summary['white']} - {summary['black']} "
+                      f"{summary['result']} ({summary['blunders']} blunders, "
+                      f"{summary['mistakes']} mistakes)")
+    finally:
+        analyser.close()
+        for f in (pgn_file, jsonl_file):
+            if f is not None:
+                f.close()
+
+    elapsed = time.perf_counter() - started
+    cache = analyser.cache
+    print(f"Analysed {analysed} games, {analyser.positions} positions in {elapsed:.1f} s "
+          f"(cache {cache.hits} hits, {cache.misses} misses)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
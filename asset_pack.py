@@ -0,0 +1,179 @@
+import array
+import io
+import json
+import math
+import mmap
+import os
+import struct
+import sys
+import wave
+
+import pygame
+
+PACK_MAGIC = b"CHESSPAK"
+PACK_VERSION = 2
+HEADER = struct.Struct("<8sHI")  # magic, version, index length
+
+SAMPLE_RATE = 44100
+
+# Built-in sound effects: frequency (Hz), volume (0-1), duration (s)
+SOUND_TONES = {
+    "move": (440, 0.5, 0.5),       # A4
+    "capture": (330, 0.7, 0.5),    # E4
+    "check": (660, 0.8, 0.5),      # E5
+    "checkmate": (880, 1.0, 1.0),  # A5
+    "stalemate": (220, 0.6, 1.0),  # A3
+    "select": (550, 0.4, 0.2),     # C#5
+    "timeout": (110, 0.9, 1.0),    # A2
+}
+
+
+def synthesize_tone(freq, volume, duration, sample_rate=SAMPLE_RATE):
+    """Return 16-bit little-endian mono PCM for a sine tone"""
+    num_samples = int(sample_rate * duration)
+    try:
+        import numpy as np
+    except ImportError:
+        # Slower pure-Python path, still without a struct.pack per sample
+        step = 2 * math.pi * freq / sample_rate
+        samples = array.array('h', (int(math.sin(i * step) * volume * 32767) for i in range(num_samples)))
+        if sys.byteorder == 'big':
+            samples.byteswap()
+        return samples.tobytes()
+
+    samples = np.sin(2 * np.pi * np.arange(num_samples) * freq / sample_rate)
+    return (samples * volume * 32767).astype('<i2').tobytes()
+
+
+def read_wav(path):
+    """Read a WAV file as (sample_rate, channels, sample_width, frames)"""
+    with wave.open(path, 'rb') as wav_file:
+        return (wav_file.getframerate(), wav_file.getnchannels(), wav_file.getsampwidth(),
+                wav_file.readframes(wav_file.getnframes()))
+
+
+def source_stamps(paths):
+    """{"dir/name": [mtime_ns, size]} of the source files that exist, to tell when a pack is stale"""
+    stamps = {}
+    for path in paths:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        name = os.path.join(os.path.basename(os.path.dirname(path)), os.path.basename(path))
+        stamps[name.replace(os.sep, "/")] = [stat.st_mtime_ns, stat.st_size]
+    return stamps
+
+
+def encode_pack(square_size, sprites, sounds, sources=None):
+    """Serialize sprites {key: Surface} and sounds {name: (rate, channels, width, pcm)}"""
+    index = {"version": PACK_VERSION, "square_size": square_size, "sources": sources or {},
+             "sprites": {}, "sounds": {}}
+    chunks = []
+    offset = 0
+
+    for key, surface in sorted(sprites.items()):
+        raw = pygame.image.tobytes(surface, "RGBA")
+        width, height = surface.get_size()
+        index["sprites"][key] = [offset, len(raw), width, height]
+        chunks.append(raw)
+        offset += len(raw)
+
+    for name, (rate, channels, width, pcm) in sorted(sounds.items()):
+        index["sounds"][name] = [offset, len(pcm), rate, channels, width]
+        chunks.append(pcm)
+        offset += len(pcm)
+
+    index_bytes = json.dumps(index).encode("utf-8")
+    return HEADER.pack(PACK_MAGIC, PACK_VERSION, len(index_bytes)) + index_bytes + b"".join(chunks)
+
+
+def write_pack(path, data):
+    """Write a pack atomically so a crash never leaves a truncated file"""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+class AssetPack:
+    """Pre-scaled piece sprites and PCM sounds read from a single buffer"""
+
+    def __init__(self, buffer):
+        magic, version, index_length = HEADER.unpack_from(buffer, 0)
+        if magic != PACK_MAGIC:
+            raise ValueError("not an asset pack")
+        self.buffer = buffer
+        self.version = version
+        start = HEADER.size
+        self.index = json.loads(bytes(buffer[start:start + index_length]).decode("utf-8"))
+        self.data = memoryview(buffer)[start + index_length:]
+
+    @classmethod
+    def load(cls, path, square_size, sources=None):
+        """Memory-map the pack at path, or return None if it is missing or stale"""
+        try:
+            with open(path, 'rb') as f:
+                buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            pack = cls(buffer)
+        except (OSError, ValueError, struct.error) as e:
+            if os.path.exists(path):
+                print(f"Ignoring unreadable asset pack {path}: {e}")
+            return None
+
+        if pack.version != PACK_VERSION or pack.index.get("square_size") != square_size:
+            return None
+        # Any image or sound edited, added or removed since the pack was built
+        if sources is not None and pack.index.get("sources") != sources:
+            return None
+        return pack
+
+    def sprite(self, key):
+        """Decode one sprite into a display-format surface"""
+        offset, length, width, height = self.index["sprites"][key]
+        surface = pygame.image.frombuffer(self.data[offset:offset + length], (width, height), "RGBA")
+        return surface.convert_alpha() if pygame.display.get_surface() else surface.copy()
+
+    def sprites(self):
+        """Decode every sprite"""
+        return {key: self.sprite(key) for key in self.index["sprites"]}
+
+    def sound_names(self):
+        """Names of the sounds stored in the pack"""
+        return list(self.index["sounds"])
+
+    def sound(self, name):
+        """Decode one sound into a pygame Sound"""
+        offset, length, rate, channels, width = self.index["sounds"][name]
+        wav_buffer = io.BytesIO()
+        with wave.open(wav_buffer, 'wb') as wav_file:
+            wav_file.setnchannels(channels)
+            wav_file.setsampwidth(width)
+            wav_file.setframerate(rate)
+            wav_file.writeframes(self.data[offset:offset + length])
+        wav_buffer.seek(0)
+        return pygame.mixer.Sound(file=wav_buffer)
+
+
+class LazySounds:
+    """Sounds from an asset pack, each decoded the first time it is played"""
+
+    def __init__(self, pack):
+        self.pack = pack
+        self.loaded = {}
+
+    def __contains__(self, name):
+        return name in self.pack.index["sounds"]
+
+    def get(self, name):
+        """Return the decoded sound, or None if it is missing or cannot be decoded"""
+        if name in self.loaded:
+            return self.loaded[name]
+        sound = None
+        if name in self:
+            try:
+                sound = self.pack.sound(name)
+            except pygame.error as e:
+                print(f"Could not load sound {name}: {e}")
+        self.loaded[name] = sound
+        return sound
@@ -0,0 +1,164 @@
+import chess
+import numpy as np
+
+from search import KING_END_TABLE, PIECE_TABLES, PIECE_VALUES
+
+# Planes: White pawn..king, then Black pawn..king
+PLANES = [(color, piece_type) for color in (chess.WHITE, chess.BLACK) for piece_type in chess.PIECE_TYPES]
+WHITE_KING, BLACK_KING = 5, 11
+MOBILITY_WEIGHT = 4  # Centipawns per attacked square
+
+FULL = np.uint64(0xFFFFFFFFFFFFFFFF)
+NOT_A = np.uint64(0xFEFEFEFEFEFEFEFE)
+NOT_AB = np.uint64(0xFCFCFCFCFCFCFCFC)
+NOT_H = np.uint64(0x7F7F7F7F7F7F7F7F)
+NOT_GH = np.uint64(0x3F3F3F3F3F3F3F3F)
+
+# (shift, mask of squares a step may land on) per sliding direction
+DIAGONALS = [(9, NOT_A), (7, NOT_H), (-7, NOT_A), (-9, NOT_H)]
+ORTHOGONALS = [(8, FULL), (-8, FULL), (1, NOT_A), (-1, NOT_H)]
+
+
+def _weights(king_table):
+    """(12, 64) piece plus piece-square values, positive for White"""
+    weights = np.zeros((12, 64), dtype=np.int32)
+    for plane, (color, piece_type) in enumerate(PLANES):
+        table = king_table if piece_type == chess.KING else PIECE_TABLES[piece_type]
+        for square in chess.SQUARES:
+            # Tables are written rank 8 first, so White squares are flipped
+            if color == chess.WHITE:
+                weights[plane, square] = PIECE_VALUES[piece_type] + table[square ^ 56]
+            else:
+                weights[plane, square] = -(PIECE_VALUES[piece_type] + table[square])
+    return weights
+
+
+def _weight_matrix():
+    """(768, 3) columns: everything but kings, middlegame kings, endgame kings"""
+    middlegame = _weights(PIECE_TABLES[chess.KING])
+    endgame = _weights(KING_END_TABLE)
+    kings = np.zeros((12, 1), dtype=np.int32)
+    kings[[WHITE_KING, BLACK_KING]] = 1
+    columns = [middlegame * (1 - kings), middlegame * kings, endgame * kings]
+
+    # float32 matrix products are far faster than integer ones and exact at these magnitudes
+    return np.stack([column.ravel() for column in columns], axis=1).astype(np.float32)
+
+
+WEIGHTS = _weight_matrix()
+
+
+def board_row(board):
+    """Piece-type and colour bitboards of one board, split into planes by split_rows"""
+    return (board.pawns, board.knights, board.bishops, board.rooks, board.queens, board.kings,
+            board.occupied_co[chess.WHITE], board.occupied_co[chess.BLACK])
+
+
+def split_rows(rows):
+    """(N, 8) board rows to (N, 12) piece bitboards in plane order"""
+    rows = np.array(rows, dtype=np.uint64).reshape(-1, 8)
+    return (rows[:, None, :6] & rows[:, 6:, None]).reshape(-1, 12)
+
+
+def encode(boards):
+    """Return (bitboards, turns): (N, 12) uint64 piece bitboards and (N,) side to move"""
+    bitboards = split_rows([board_row(board) for board in boards])
+    turns = np.array([board.turn for board in boards], dtype=bool)
+    return bitboards, turns
+
+
+def planes(bitboards):
+    """(N, 12, 64) 0/1 piece-square planes, square index = bit index"""
+    as_bytes = bitboards.astype("<u8").view(np.uint8).reshape(len(bitboards), 12, 8)
+    return np.unpackbits(as_bytes, axis=2, bitorder="little")
+
+
+def popcount(bitboards):
+    """Bits set in each uint64"""
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(bitboards).astype(np.int32)
+    as_bytes = np.ascontiguousarray(bitboards, dtype="<u8").view(np.uint8)
+    counts = np.unpackbits(as_bytes).reshape(bitboards.shape + (64,))
+    return counts.sum(axis=-1, dtype=np.int32)
+
+
+def _shift(bitboards, shift):
+    if shift > 0:
+        return bitboards << np.uint64(shift)
+    return bitboards >> np.uint64(-shift)
+
+
+def _slide(sliders, empty, shift, mask):
+    """Kogge-Stone fill: squares sliders attack in one direction, blockers included"""
+    empty = empty & mask
+    sliders = sliders | (empty & _shift(sliders, shift))
+    empty = empty & _shift(empty, shift)
+    sliders = sliders | (empty & _shift(sliders, 2 * shift))
+    empty = empty & _shift(empty, 2 * shift)
+    sliders = sliders | (empty & _shift(sliders, 4 * shift))
+    return _shift(sliders, shift) & mask
+
+
+def knight_attacks(knights):
+    """Squares attacked by every knight in each bitboard"""
+    one = ((knights >> np.uint64(1)) & NOT_H) | ((knights << np.uint64(1)) & NOT_A)
+    two = ((knights >> np.uint64(2)) & NOT_GH) | ((knights << np.uint64(2)) & NOT_AB)
+    return (one << np.uint64(16)) | (one >> np.uint64(16)) | (two << np.uint64(8)) | (two >> np.uint64(8))
+
+
+def mobility(bitboards, color):
+    """Squares attacked by color's knights, bishops, rooks and queens that it does not occupy"""
+    base = 0 if color == chess.WHITE else 6
+    own = np.bitwise_or.reduce(bitboards[:, base:base + 6], axis=1)
+    occupied = np.bitwise_or.reduce(bitboards, axis=1)
+    empty = ~occupied
+    queens = bitboards[:, base + 4]
+    diagonal = bitboards[:, base + 2] | queens
+    orthogonal = bitboards[:, base + 3] | queens
+
+    diagonal_attacks = np.zeros_like(own)
+    for shift, mask in DIAGONALS:
+        diagonal_attacks |= _slide(diagonal, empty, shift, mask)
+    orthogonal_attacks = np.zeros_like(own)
+    for shift, mask in ORTHOGONALS:
+        orthogonal_attacks |= _slide(orthogonal, empty, shift, mask)
+
+    free = ~own
+    return (popcount(knight_attacks(bitboards[:, base + 1]) & free)
+            + popcount(diagonal_attacks & free) + popcount(orthogonal_attacks & free))
+
+
+def evaluate_encoded(bitboards, turns, mobility_weight=MOBILITY_WEIGHT):
+    """Scores in centipawns from each side to move's point of view"""
+    if not len(bitboards):
+        return np.zeros(0, dtype=np.int32)
+    terms = planes(bitboards).reshape(len(bitboards), 768).astype(np.float32) @ WEIGHTS
+    terms = np.rint(terms).astype(np.int32)
+
+    # Same endgame test as search.is_endgame: no queens, or at most two minors and rooks
+    queens = bitboards[:, 4] | bitboards[:, 10]
+    minors_and_rooks = np.bitwise_or.reduce(bitboards[:, [1, 2, 3, 7, 8, 9]], axis=1)
+    endgame = (queens == 0) | (popcount(minors_and_rooks) <= 2)
+    score = terms[:, 0] + np.where(endgame, terms[:, 2], terms[:, 1])
+
+    if mobility_weight:
+        score += mobility_weight * (mobility(bitboards, chess.WHITE) - mobility(bitboards, chess.BLACK))
+    return np.where(turns, score, -score).astype(np.int32)
+
+
+def evaluate_batch(boards, mobility_weight=MOBILITY_WEIGHT):
+    """Evaluate many boards in one call; with mobility_weight=0 this matches search.evaluate"""
+    bitboards, turns = encode(boards)
+    return evaluate_encoded(bitboards, turns, mobility_weight)
+
+
+def evaluate_moves(board, moves, mobility_weight=MOBILITY_WEIGHT):
+    """Score the position after each move from the mover's point of view"""
+    rows = []
+    for move in moves:
+        board.push(move)
+        rows.append(board_row(board))
+        board.pop()
+    bitboards = split_rows(rows)
+    turns = np.full(len(rows), not board.turn, dtype=bool)
+    return -evaluate_encoded(bitboards, turns, mobility_weight)
@@ -0,0 +1,318 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import chess
+
+from game_core import GameCore
+from search import Searcher
+
+DEFAULT_BASELINE = "bench_baseline.json"
+DEFAULT_OUTPUT = "bench_results.json"
+DEFAULT_THRESHOLD = 0.20  # Flag anything more than 20% worse than the baseline
+
+# (name, FEN, depth, expected leaf count) from the standard perft test suite
+PERFT_POSITIONS = [
+    ("startpos", chess.STARTING_FEN, 3, 8902),
+    ("kiwipete", "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1", 2, 2039),
+    ("endgame", "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1", 4, 43238),
+    ("promotions", "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1", 3, 9467),
+    ("tricky", "rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8", 3, 62379),
+]
+
+# Imports this directory's modules into a fresh interpreter, wherever it is started from
+STARTUP_CHILD = (
+    "import sys; sys.path.insert(0, {!r}); import bench; bench.startup_child(sys.argv[1] == 'True')"
+    .format(os.path.dirname(os.path.abspath(__file__)))
+)
+# startup_timings stages spent opening or rebuilding the asset pack and decoding it
+ASSET_STAGES = ("pack open", "pack rebuild", "sprites", "sounds")
+
+# Positions the AI is timed on: opening, middlegame and endgame
+AI_POSITIONS = [
+    ("opening", chess.STARTING_FEN),
+    ("middlegame", "r1bq1rk1/pp2bppp/2n1pn2/3p4/2PP4/2N1PN2/PP3PPP/R2QKB1R w KQ - 0 8"),
+    ("endgame", "8/5pk1/6p1/8/3R4/6P1/5PKP/3r4 w - - 0 40"),
+]
+
+
+def load_game_module():
+    """Import the pygame front-end"""
+    import chess_gui
+    return chess_gui
+
+
+def use_dummy_video():
+    """Render offscreen so benchmarks run without a display"""
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+
+def time_call(function, repeat, number=1):
+    """Median seconds per call of function over repeat rounds of number calls"""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        samples.append((time.perf_counter() - start) / number)
+    return statistics.median(samples)
+
+
+def metric(value, unit, better):
+    return {"value": round(value, 4), "unit": unit, "better": better}
+
+
+def perft(core, depth):
+    """Count leaf nodes through the move index and status tracker the game uses"""
+    moves = core.legal_move_index().moves
+    if depth == 1:
+        return len(moves)
+
+    board = core.board
+    tracker = core.status_tracker
+    nodes = 0
+    for move in moves:
+        board.push(move)
+        tracker.push(board)
+        nodes += perft(core, depth - 1)
+        board.pop()
+        tracker.pop(board)
+    return nodes
+
+
+def bench_perft(quick=False):
+    """Perft nodes per second on the standard test positions"""
+    metrics = {}
+    for name, fen, depth, expected in PERFT_POSITIONS:
+        if quick:
+            depth = max(1, depth - 1)
+            expected = None
+        core = GameCore(ai_enabled=False)
+        core.set_position(chess.Board(fen))
+
+        start = time.perf_counter()
+        nodes = perft(core, depth)
+        elapsed = time.perf_counter() - start
+        if expected is not None and nodes != expected:
+            raise AssertionError(f"perft {name} depth {depth}: {nodes} nodes, expected {expected}")
+        metrics[f"perft.{name}.nps"] = metric(nodes / elapsed, "nodes/s", "higher")
+
+    # Selecting a piece: valid moves for every piece of the side to move on a cold cache
+    core = GameCore(ai_enabled=False)
+    positions = [chess.Board(fen) for _, fen, _, _ in PERFT_POSITIONS]
+
+    def click_all():
+        for board in positions:
+            core.set_position(board)
+            core.move_cache.clear()
+            for square in chess.SquareSet(board.occupied_co[board.turn]):
+                core.get_valid_moves(square)
+
+    clicks = sum(chess.popcount(board.occupied_co[board.turn]) for board in positions)
+    seconds = time_call(click_all, repeat=5 if quick else 20)
+    metrics["moves.get_valid_moves_us"] = metric(seconds / clicks * 1e6, "us", "lower")
+    return metrics
+
+
+def bench_frame(quick=False):
+    """Offscreen draw times of the board, pieces, UI and whole frames"""
+    use_dummy_video()
+    module = load_game_module()
+    game = make_game(module)
+    repeat = 20 if quick else 100
+    try:
+        game.render_frame()
+
+        def rebuild_pieces():
+            game.piece_layer_key = None
+            game.draw_pieces()
+
+        def full_frame():
+            game.full_redraw = True
+            game.render_frame()
+
+        metrics = {
+            "frame.draw_board_ms": time_call(game.draw_board, repeat),
+            "frame.draw_pieces_ms": time_call(rebuild_pieces, repeat),
+            "frame.draw_pieces_cached_ms": time_call(game.draw_pieces, repeat),
+            "frame.draw_ui_ms": time_call(game.draw_ui, repeat),
+            "frame.full_ms": time_call(full_frame, repeat),
+            "frame.idle_ms": time_call(game.render_frame, repeat),
+        }
+        # Idle frames redraw the same labels, so nearly every lookup should hit
+        hit_rate = game.text_cache.hit_rate()
+    finally:
+        game.shutdown()
+        if os.path.exists(os.environ["CHESS_GAME_LOG"]):
+            os.remove(os.environ["CHESS_GAME_LOG"])
+    metrics = {name: metric(seconds * 1000, "ms", "lower") for name, seconds in metrics.items()}
+    metrics["frame.text_cache_hit_rate"] = metric(hit_rate * 100, "%", "higher")
+    return metrics
+
+
+def bench_ai(quick=False, nodes=20000):
+    """AI move latency and search speed with a fixed node budget"""
+    if quick:
+        nodes //= 4
+    metrics = {}
+    for name, fen in AI_POSITIONS:
+        # A fresh searcher per position so earlier searches do not warm the tables
+        core = GameCore(searcher=Searcher(), ai_max_nodes=nodes, ai_think_time=60)
+        core.set_position(chess.Board(fen))
+        start = time.perf_counter()
+        core.choose_ai_move()
+        elapsed = time.perf_counter() - start
+        result = core.last_search
+        metrics[f"ai.{name}.latency_ms"] = metric(elapsed * 1000, "ms", "lower")
+        metrics[f"ai.{name}.nps"] = metric(result.nodes / result.time if result.time else 0.0,
+                                           "nodes/s", "higher")
+    return metrics
+
+
+def make_game(module):
+    """A ChessGame that leaves the player's game log alone"""
+    os.environ["CHESS_GAME_LOG"] = os.path.join(tempfile.gettempdir(), f"bench-{os.getpid()}.log")
+    game = module.ChessGame()
+    game.ai_enabled = False
+    return game
+
+
+def startup_child(rebuild):
+    """Measure one cold start in this fresh interpreter and print it as JSON"""
+    use_dummy_video()
+    start = time.perf_counter()
+    module = load_game_module()
+    imported = time.perf_counter() - start
+    if rebuild:
+        # Point the pack at a missing file so the sprites and sounds are rebuilt
+        module.ASSET_PACK_PATH = os.path.join(tempfile.gettempdir(), f"bench-{os.getpid()}.pack")
+    game = make_game(module)
+    timings = dict(game.startup_timings, imports=imported, total=time.perf_counter() - start)
+    game.shutdown()
+    for path in (module.ASSET_PACK_PATH if rebuild else None, os.environ["CHESS_GAME_LOG"]):
+        if path and os.path.exists(path):
+            os.remove(path)
+    print(json.dumps(timings))
+
+
+def bench_startup(quick=False):
+    """Cold-start time of ChessGame in fresh interpreters, with and without the asset pack"""
+    runs = 1 if quick else 5
+    modes = (("warm_pack", False), ("rebuild_pack", True))
+    totals = {name: [] for name, _ in modes}
+    assets = {name: [] for name, _ in modes}
+    # Alternate the modes so disk cache and bytecode warm-up favour neither
+    for _ in range(runs):
+        for name, rebuild in modes:
+            output = subprocess.run([sys.executable, "-c", STARTUP_CHILD, str(rebuild)],
+                                    capture_output=True, text=True, check=True,
+                                    cwd=tempfile.gettempdir()).stdout
+            timings = json.loads(output.strip().splitlines()[-1])
+            totals[name].append(timings["total"])
+            # The module imports are the same either way and swamp the pack's share of the total
+            assets[name].append(sum(timings.get(stage, 0.0) for stage in ASSET_STAGES))
+
+    metrics = {}
+    for name, _ in modes:
+        metrics[f"startup.{name}_ms"] = metric(statistics.median(totals[name]) * 1000, "ms", "lower")
+        metrics[f"startup.{name}_assets_ms"] = metric(statistics.median(assets[name]) * 1000, "ms", "lower")
+    return metrics
+
+
+SUITES = {
+    "perft": bench_perft,
+    "frame": bench_frame,
+    "ai": bench_ai,
+    "startup": bench_startup,
+}
+
+
+def compare(metrics, baseline, threshold):
+    """Return (name, value, baseline value, change) rows and the names that regressed"""
+    thresholds = baseline.get("thresholds", {})
+    rows = []
+    regressions = []
+    for name, current in metrics.items():
+        previous = baseline.get("metrics", {}).get(name)
+        if previous is None or not previous["value"]:
+            rows.append((name, current, None, None))
+            continue
+        change = (current["value"] - previous["value"]) / previous["value"]
+        worse = change if current["better"] == "lower" else -change
+        if worse > thresholds.get(name, threshold):
+            regressions.append(name)
+        rows.append((name, current, previous["value"], change))
+    return rows, regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark move generation, rendering, AI and startup")
+    parser.add_argument("suites", nargs="*", help=f"suites to run: {', '.join(SUITES)} (default: all)")
+    parser.add_argument("--quick", action="store_true", help="smaller workloads for a fast check")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="JSON results file")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="baseline JSON to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="store these results as the baseline")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed slowdown before a metric counts as a regression")
+    args = parser.parse_args(argv)
+
+    unknown = [name for name in args.suites if name not in SUITES]
+    if unknown:
+        parser.error(f"unknown suite {unknown[0]!r}")
+
+    metrics = {}
+    for name in args.suites or SUITES:
+        print(f"Running {name}...")
+        metrics.update(SUITES[name](quick=args.quick))
+
+    results = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "machine": platform.platform(),
+        "quick": args.quick,
+        "metrics": metrics,
+    }
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        # Quick runs use smaller workloads, so they are only comparable with each other
+        if baseline.get("quick") != args.quick and not args.save_baseline:
+            print(f"Baseline {args.baseline} was recorded {'without' if args.quick else 'with'} --quick; "
+                  f"not comparing")
+            baseline = {}
+    rows, regressions = compare(metrics, baseline, args.threshold)
+    for name, current, previous, change in rows:
+        line = f"{name:32} {current['value']:>14,.2f} {current['unit']:8}"
+        if previous is not None:
+            line += f" baseline {previous:>14,.2f} ({change:+.1%})"
+            if name in regressions:
+                line += "  REGRESSION"
+        print(line.rstrip())
+
+    if args.save_baseline:
+        # Keep hand-tuned per-metric thresholds across baseline refreshes
+        results["thresholds"] = baseline.get("thresholds", {})
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Saved baseline to {args.baseline}")
+        return 0
+
+    if regressions:
+        print(f"{len(regressions)} regressions beyond {args.threshold:.0%}: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
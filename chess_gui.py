@@ -0,0 +1,1153 @@
+import math
+import sys
+import os
+import pygame
+import chess
+import time
+from concurrent.futures import ThreadPoolExecutor
+from ai_worker import AIWorker
+from asset_pack import (AssetPack, LazySounds, SOUND_TONES, encode_pack, read_wav, source_stamps, synthesize_tone,
+                        write_pack)
+from engine_manager import EngineManager
+from game_core import DEFAULT_TIME_CONTROL, FISCHER, GameCore
+from game_log import GameRecorder
+from live_analysis import LiveAnalyser, format_score, white_score
+from opening_book import OpeningBook
+from profiler import FrameProfiler
+from render_cache import AtlasCache, TextCache
+from selfplay import DEFAULT_OPENINGS, opening_board
+from tablebase import Tablebase
+
+# Constants
+WINDOW_WIDTH = 800   # Initial window size; the window can be resized or made fullscreen
+WINDOW_HEIGHT = 600
+BOARD_SIZE = 400
+SQUARE_SIZE = BOARD_SIZE // 8
+SIDE_MARGIN = 200    # Room for the performance overlay and the analysis panel
+TOP_MARGIN = 100     # Room for the clocks above the board and the status line below it
+MIN_SQUARE_SIZE = 24
+SPRITE_SIZE = 256    # Piece sprites are stored at this size and scaled once per square size
+FPS = 60              # Upper bound; frames are only drawn when something changes
+MAX_IDLE_WAIT = 1.0   # Longest the loop sleeps when no input, AI result or clock change is due
+WAKE_EVENT = pygame.event.custom_type()  # Posted by worker threads when they have news for the screen
+WHITE = (255, 255, 255)
+BLACK = (0, 0, 0)
+LIGHT_SQUARE = (240, 217, 181)  # Light brown
+DARK_SQUARE = (181, 136, 99)    # Dark brown
+HIGHLIGHT = (124, 252, 0)       # Green highlight
+MOVE_HIGHLIGHT = (102, 255, 255, 128)  # Light blue with transparency
+ARROW_COLOR = (0, 110, 230)     # Blue best-move arrow
+ASSET_PACK_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets.pack")
+IMAGES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "images")
+SOUNDS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sounds")
+SIMUL_TIME_CONTROL = 600  # Seconds per side on each simul board
+SIMUL_THINK_TIME = 0.25   # Longest AI search per simul move; boards queue for the AI thread
+TILE_PADDING = 6
+TILE_LABEL_HEIGHT = 18
+
+def board_key(board):
+    """Cheap key that changes whenever any piece on board moves"""
+    return (board.pawns, board.knights, board.bishops, board.rooks,
+            board.queens, board.kings, board.occupied_co[chess.WHITE])
+
+class AssetLoader:
+    """Piece sprites and sound effects from the asset pack, shared by the game and simul views"""
+    
+    def init_assets(self):
+        """Load sprites and sounds from the asset pack, rebuilding it if missing or stale"""
+        start = time.perf_counter()
+        self.asset_pack = AssetPack.load(ASSET_PACK_PATH, SPRITE_SIZE, source_stamps(self.asset_sources()))
+        if self.asset_pack is None:
+            self.asset_pack = self.build_asset_pack()
+            self.startup_timings["pack rebuild"] = time.perf_counter() - start
+        else:
+            self.startup_timings["pack open"] = time.perf_counter() - start
+        
+        # Full-size sprites, scaled into one atlas per square size as the window changes
+        start = time.perf_counter()
+        self.atlases = AtlasCache(self.asset_pack.sprites())
+        self.startup_timings["sprites"] = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        self.init_sounds()
+        self.startup_timings["sounds"] = time.perf_counter() - start
+    
+    def build_asset_pack(self):
+        """Rebuild the asset pack from the image and sound files"""
+        self.piece_images = {}
+        self.load_images()
+        sounds = self.load_sound_data()
+        # Stamped after loading, since missing files were just created as placeholders
+        data = encode_pack(SPRITE_SIZE, self.piece_images, sounds, source_stamps(self.asset_sources()))
+        
+        try:
+            write_pack(ASSET_PACK_PATH, data)
+        except OSError as e:
+            print(f"Could not save asset pack {ASSET_PACK_PATH}: {e}")
+        return AssetPack(data)
+    
+    def asset_sources(self):
+        """Paths of the image and sound files the asset pack is built from"""
+        images = [os.path.join(IMAGES_DIR, f"{color}{piece}.png") for color in "wb" for piece in "prnbqk"]
+        return images + [os.path.join(SOUNDS_DIR, f"{name}.wav") for name in SOUND_TONES]
+    
+    def load_images(self):
+        """Load chess piece images"""
+        pieces = ['p', 'r', 'n', 'b', 'q', 'k']
+        colors = ['w', 'b']
+        
+        # Create images directory if it doesn't exist
+        images_dir = IMAGES_DIR
+        if not os.path.exists(images_dir):
+            os.makedirs(images_dir)
+        
+        # Try to load images, or create placeholder images
+        for color in colors:
+            for piece in pieces:
+                piece_key = color + piece
+                image_path = os.path.join(images_dir, f"{piece_key}.png")
+                
+                try:
+                    if os.path.exists(image_path):
+                        img = pygame.image.load(image_path)
+                    else:
+                        # Create a placeholder image
+                        img = self.create_placeholder_piece(color, piece)
+                        # Save the placeholder for future use
+                        pygame.image.save(img, image_path)
+                    
+                    # Stored at sprite size; atlases scale it to the square size
+                    self.piece_images[piece_key] = pygame.transform.smoothscale(
+                        img.convert_alpha(), (SPRITE_SIZE, SPRITE_SIZE))
+                except Exception as e:
+                    print(f"Error loading image for {piece_key}: {e}")
+                    # Create a simple colored rectangle as fallback
+                    self.piece_images[piece_key] = self.create_simple_piece(color, piece)
+    
+    def create_placeholder_piece(self, color, piece_type):
+        """Create a placeholder image for a chess piece"""
+        # Create a surface for the piece
+        img = pygame.Surface((100, 100), pygame.SRCALPHA)
+        
+        # Colors
+        piece_color = (255, 255, 255) if color == 'w' else (0, 0, 0)
+        outline_color = (0, 0, 0) if color == 'w' else (255, 255, 255)
+        
+        # Draw the base circle
+        pygame.draw.circle(img, piece_color, (50, 50), 40)
+        pygame.draw.circle(img, outline_color, (50, 50), 40, 2)
+        
+        # Draw piece-specific features
+        if piece_type == 'p':  # Pawn
+            pygame.draw.circle(img, outline_color, (50, 40), 15, 2)
+            pygame.draw.rect(img, piece_color, (35, 50, 30, 20))
+            pygame.draw.rect(img, outline_color, (35, 50, 30, 20), 2)
+        elif piece_type == 'r':  # Rook
+            pygame.draw.rect(img, piece_color, (25, 25, 50, 50))
+            pygame.draw.rect(img, outline_color, (25, 25, 50, 50), 2)
+            pygame.draw.rect(img, outline_color, (30, 15, 10, 10), 2)
+            pygame.draw.rect(img, outline_color, (60, 15, 10, 10), 2)
+            pygame.draw.rect(img, outline_color, (45, 15, 10, 10), 2)
+        elif piece_type == 'n':  # Knight
+            pygame.draw.polygon(img, outline_color, [(30, 20), (70, 30), (60, 70), (30, 60)], 2)
+            pygame.draw.circle(img, outline_color, (40, 30), 5)
+        elif piece_type == 'b':  # Bishop
+            pygame.draw.polygon(img, outline_color, [(50, 20), (70, 70), (30, 70)], 2)
+            pygame.draw.circle(img, outline_color, (50, 30), 10, 2)
+        elif piece_type == 'q':  # Queen
+            pygame.draw.polygon(img, outline_color, [(50, 20), (70, 70), (30, 70)], 2)
+            pygame.draw.circle(img, outline_color, (50, 40), 15, 2)
+            pygame.draw.rect(img, outline_color, (45, 15, 10, 10), 2)
+        elif piece_type == 'k':  # King
+            pygame.draw.polygon(img, outline_color, [(50, 20), (70, 70), (30, 70)], 2)
+            pygame.draw.rect(img, outline_color, (45, 15, 10, 20), 2)
+            pygame.draw.rect(img, outline_color, (40, 10, 20, 5), 2)
+        
+        return img
+    
+    def create_simple_piece(self, color, piece_type):
+        """Create a simple colored shape for a chess piece"""
+        img = pygame.Surface((SPRITE_SIZE, SPRITE_SIZE), pygame.SRCALPHA)
+        
+        # Colors
+        piece_color = (255, 255, 255) if color == 'w' else (0, 0, 0)
+        outline_color = (0, 0, 0) if color == 'w' else (255, 255, 255)
+        
+        # Draw the piece based on type
+        if piece_type == 'p':  # Pawn
+            pygame.draw.circle(img, piece_color, (SPRITE_SIZE//2, SPRITE_SIZE//2), SPRITE_SIZE//3)
+        elif piece_type == 'r':  # Rook
+            pygame.draw.rect(img, piece_color, (SPRITE_SIZE//4, SPRITE_SIZE//4, SPRITE_SIZE//2, SPRITE_SIZE//2))
+        elif piece_type == 'n':  # Knight
+            points = [(SPRITE_SIZE//4, SPRITE_SIZE//4), (3*SPRITE_SIZE//4, SPRITE_SIZE//4), 
+                     (3*SPRITE_SIZE//4, 3*SPRITE_SIZE//4), (SPRITE_SIZE//4, 3*SPRITE_SIZE//4)]
+            pygame.draw.polygon(img, piece_color, points)
+        elif piece_type == 'b':  # Bishop
+            pygame.draw.polygon(img, piece_color, [(SPRITE_SIZE//2, SPRITE_SIZE//4), 
+                                                 (3*SPRITE_SIZE//4, 3*SPRITE_SIZE//4), 
+                                                 (SPRITE_SIZE//4, 3*SPRITE_SIZE//4)])
+        elif piece_type == 'q':  # Queen
+            pygame.draw.circle(img, piece_color, (SPRITE_SIZE//2, SPRITE_SIZE//2), SPRITE_SIZE//3)
+            pygame.draw.rect(img, outline_color, (SPRITE_SIZE//3, SPRITE_SIZE//3, SPRITE_SIZE//3, SPRITE_SIZE//3), 2)
+        elif piece_type == 'k':  # King
+            pygame.draw.circle(img, piece_color, (SPRITE_SIZE//2, SPRITE_SIZE//2), SPRITE_SIZE//3)
+            pygame.draw.line(img, outline_color, (SPRITE_SIZE//2, SPRITE_SIZE//4), 
+                           (SPRITE_SIZE//2, 3*SPRITE_SIZE//4), 2)
+            pygame.draw.line(img, outline_color, (SPRITE_SIZE//4, SPRITE_SIZE//2), 
+                           (3*SPRITE_SIZE//4, SPRITE_SIZE//2), 2)
+        
+        # Draw outline
+        if piece_type == 'p':
+            pygame.draw.circle(img, outline_color, (SPRITE_SIZE//2, SPRITE_SIZE//2), SPRITE_SIZE//3, 2)
+        elif piece_type == 'r':
+            pygame.draw.rect(img, outline_color, (SPRITE_SIZE//4, SPRITE_SIZE//4, SPRITE_SIZE//2, SPRITE_SIZE//2), 2)
+        elif piece_type in ['n', 'b']:
+            if piece_type == 'n':
+                points = [(SPRITE_SIZE//4, SPRITE_SIZE//4), (3*SPRITE_SIZE//4, SPRITE_SIZE//4), 
+                         (3*SPRITE_SIZE//4, 3*SPRITE_SIZE//4), (SPRITE_SIZE//4, 3*SPRITE_SIZE//4)]
+            else:
+                points = [(SPRITE_SIZE//2, SPRITE_SIZE//4), (3*SPRITE_SIZE//4, 3*SPRITE_SIZE//4), 
+                         (SPRITE_SIZE//4, 3*SPRITE_SIZE//4)]
+            pygame.draw.polygon(img, outline_color, points, 2)
+        elif piece_type in ['q', 'k']:
+            pygame.draw.circle(img, outline_color, (SPRITE_SIZE//2, SPRITE_SIZE//2), SPRITE_SIZE//3, 2)
+        
+        # Add text label
+        text = self.small_font.render(piece_type.upper(), True, outline_color)
+        text_rect = text.get_rect(center=(SPRITE_SIZE//2, SPRITE_SIZE//2))
+        img.blit(text, text_rect)
+        
+        return img
+    
+    def init_sounds(self):
+        """Initialize sound effects"""
+        # Initialize mixer
+        pygame.mixer.init()
+        
+        # Sounds are decoded from the pack the first time they are played
+        self.sounds = LazySounds(self.asset_pack)
+    
+    def load_sound_data(self):
+        """Read the PCM data of every sound file, creating missing ones"""
+        # Create sounds directory if it doesn't exist
+        sounds_dir = SOUNDS_DIR
+        if not os.path.exists(sounds_dir):
+            os.makedirs(sounds_dir)
+        
+        # Sound file paths
+        self.sound_files = {
+            "move": os.path.join(sounds_dir, "move.wav"),
+            "capture": os.path.join(sounds_dir, "capture.wav"),
+            "check": os.path.join(sounds_dir, "check.wav"),
+            "checkmate": os.path.join(sounds_dir, "checkmate.wav"),
+            "stalemate": os.path.join(sounds_dir, "stalemate.wav"),
+            "select": os.path.join(sounds_dir, "select.wav"),
+            "timeout": os.path.join(sounds_dir, "timeout.wav")
+        }
+        
+        # Create simple sounds if they don't exist
+        for sound_name, filepath in self.sound_files.items():
+            if not os.path.exists(filepath):
+                self._create_simple_sound(sound_name, filepath)
+        
+        # Read sounds
+        sound_data = {}
+        for sound_name, filepath in self.sound_files.items():
+            try:
+                sound_data[sound_name] = read_wav(filepath)
+            except Exception as e:
+                print(f"Could not load sound: {filepath} ({e})")
+        return sound_data
+    
+    def _create_simple_sound(self, sound_type, filepath):
+        """Create a simple sound file"""
+        try:
+            import wave
+            
+            # Parameters for sound generation
+            freq, volume, duration = SOUND_TONES.get(sound_type, (440, 0.5, 0.5))
+            sample_rate = 44100
+            
+            # Write the whole sine wave to a WAV file in one call
+            with wave.open(filepath, 'w') as wav_file:
+                wav_file.setnchannels(1)  # Mono
+                wav_file.setsampwidth(2)  # 2 bytes (16 bits)
+                wav_file.setframerate(sample_rate)
+                wav_file.writeframes(synthesize_tone(freq, volume, duration, sample_rate))
+        except Exception as e:
+            print(f"Error creating sound file {filepath}: {e}")
+    
+    def play_sound(self, sound_name):
+        """Play a sound effect"""
+        sound = self.sounds.get(sound_name)
+        if sound is not None:
+            sound.play()
+
+class ChessGame(AssetLoader, GameCore):
+    def __init__(self, trace_path=None, time_control=DEFAULT_TIME_CONTROL, increment=0.0, increment_mode=FISCHER):
+        startup_begin = time.perf_counter()
+        
+        # Start the UCI engine once, in the background, and reuse it for every AI move
+        engine = EngineManager()
+        engine.start(background=True)
+        
+        # Game state, clocks and AI live in the headless core
+        super().__init__(time_control=time_control, increment=increment, increment_mode=increment_mode,
+                         ai_delay=0.5, engine=engine, book=OpeningBook(), tablebase=Tablebase(),
+                         ponder=True, recorder=GameRecorder())
+        
+        # Initialize pygame
+        pygame.init()
+        self.screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT), pygame.RESIZABLE)
+        self.windowed_size = (WINDOW_WIDTH, WINDOW_HEIGHT)
+        self.fullscreen = False
+        pygame.display.set_caption("Chess Game")
+        self.clock = pygame.time.Clock()
+        self.ai_notify = self.wake
+        
+        # Initialize UI state
+        self.selected_square = None
+        self.valid_moves = frozenset()
+        self.show_help = False
+        
+        # Font for text
+        self.font = pygame.font.SysFont('Arial', 24)
+        self.small_font = pygame.font.SysFont('Arial', 18)
+        self.text_cache = TextCache()
+        
+        # Frame and AI instrumentation, only active while the HUD is shown or a trace is written
+        self.profiler = FrameProfiler(trace_path=trace_path)
+        self.hud_font = None
+        self.hud_next_update = 0.0
+        
+        # Live analysis: eval bar and best-move arrow, engine started on first use
+        self.analysis_mode = False
+        self.analyser = None
+        self.analysis = None
+        
+        # Load piece images and sounds from the asset pack
+        self.startup_timings = {"pygame": time.perf_counter() - startup_begin}
+        self.init_assets()
+        
+        # Prerendered layers so frames only redraw what changed
+        self.init_render_cache()
+        
+        # Pick up a game left unfinished by a crash or quit
+        if self.resume_recorded_game():
+            print(f"Resumed game after {len(self.board.move_stack)} moves")
+            if self.ai_enabled and not self.game_over and self.board.turn == chess.BLACK:
+                self.request_ai_move()
+        
+        self.startup_timings["total"] = time.perf_counter() - startup_begin
+        print("Startup: " + ", ".join(f"{name} {seconds * 1000:.1f} ms"
+                                      for name, seconds in self.startup_timings.items()))
+    
+    def init_render_cache(self):
+        """Lay the window out and prerender the static board, labels and highlight overlay"""
+        # Board geometry only changes when the window does, so compute it here
+        self.window_width, self.window_height = self.screen.get_size()
+        self.square_size = max(MIN_SQUARE_SIZE, min((self.window_width - 2 * SIDE_MARGIN) // 8,
+                                                    (self.window_height - 2 * TOP_MARGIN) // 8))
+        self.board_size = self.square_size * 8
+        self.board_x = (self.window_width - self.board_size) // 2
+        self.board_y = (self.window_height - self.board_size) // 2
+        self.board_rect = pygame.Rect(self.board_x, self.board_y, self.board_size, self.board_size)
+        
+        # Sprites for this square size, from the atlas cache
+        self.piece_images = self.atlases.get(self.square_size).sprites
+        
+        # Regions redrawn by draw_ui: the timer/status band above the board and the status line below it
+        self.ui_rects = [
+            pygame.Rect(0, 0, self.window_width, self.board_y),
+            pygame.Rect(0, self.window_height - 60, self.window_width, 60),
+        ]
+        
+        # Background layer: window fill, squares and rank/file labels
+        self.background = pygame.Surface((self.window_width, self.window_height)).convert()
+        self.background.fill(WHITE)
+        for rank in range(8):
+            for file in range(8):
+                x = self.board_x + file * self.square_size
+                y = self.board_y + (7 - rank) * self.square_size  # Flip rank for display
+                is_light = (rank + file) % 2 == 0
+                color = LIGHT_SQUARE if is_light else DARK_SQUARE
+                pygame.draw.rect(self.background, color, (x, y, self.square_size, self.square_size))
+        
+        for i in range(8):
+            # Rank labels (1-8)
+            rank_label = self.small_font.render(str(8 - i), True, BLACK)
+            self.background.blit(rank_label, (self.board_x - 20, self.board_y + i * self.square_size + self.square_size//2 - 10))
+            
+            # File labels (a-h)
+            file_label = self.small_font.render(chr(97 + i), True, BLACK)
+            self.background.blit(file_label, (self.board_x + i * self.square_size + self.square_size//2 - 5, self.board_y + self.board_size + 10))
+        
+        # Semi-transparent overlay behind the help screen
+        self.help_overlay = pygame.Surface((self.window_width, self.window_height), pygame.SRCALPHA)
+        self.help_overlay.fill((0, 0, 0, 200))  # Black with alpha
+        
+        # One reusable overlay for every valid-move square
+        self.highlight_surface = pygame.Surface((self.square_size, self.square_size), pygame.SRCALPHA)
+        self.highlight_surface.fill(MOVE_HIGHLIGHT)
+        
+        # Piece layer, rebuilt only when the position changes
+        self.piece_layer = pygame.Surface((self.board_size, self.board_size), pygame.SRCALPHA)
+        self.piece_layer_key = None
+        
+        # Performance overlay to the left of the board
+        self.hud_rect = pygame.Rect(5, self.board_y, max(0, self.board_x - 30), self.board_size)
+        
+        # Eval bar and principal variation to the right of the board
+        analysis_x = self.board_x + self.board_size + 10
+        self.analysis_rect = pygame.Rect(analysis_x, self.board_y, max(0, self.window_width - analysis_x - 5),
+                                         self.board_size)
+        self.last_analysis_state = None
+        
+        # What was last drawn, used to find dirty regions
+        self.last_board_state = None
+        self.last_ui_state = None
+        self.full_redraw = True
+    
+    def square_origin(self, square):
+        """Top-left screen position of a square"""
+        x = self.board_x + chess.square_file(square) * self.square_size
+        y = self.board_y + (7 - chess.square_rank(square)) * self.square_size  # Flip rank for display
+        return x, y
+    
+    def draw_board(self):
+        """Draw the chess board"""
+        # Squares come from the prerendered background
+        self.screen.blit(self.background, self.board_rect, self.board_rect)
+        
+        # Highlight selected square
+        if self.selected_square is not None:
+            x, y = self.square_origin(self.selected_square)
+            pygame.draw.rect(self.screen, HIGHLIGHT, (x, y, self.square_size, self.square_size), 3)
+        
+        # Highlight valid moves
+        for square in self.valid_moves:
+            self.screen.blit(self.highlight_surface, self.square_origin(square))
+    
+    def position_key(self):
+        """Cheap key that changes whenever any piece moves"""
+        return board_key(self.board)
+    
+    def draw_pieces(self):
+        """Draw the chess pieces on the board"""
+        key = self.position_key()
+        if key != self.piece_layer_key:
+            self.piece_layer_key = key
+            self.piece_layer.fill((0, 0, 0, 0))
+            
+            # Draw each piece
+            for square, piece in self.board.piece_map().items():
+                # Position inside the board layer
+                x = chess.square_file(square) * self.square_size
+                y = (7 - chess.square_rank(square)) * self.square_size  # Flip rank for display
+                
+                # Get the piece image
+                color = 'w' if piece.color == chess.WHITE else 'b'
+                piece_key = color + piece.symbol().lower()
+                
+                if piece_key in self.piece_images:
+                    self.piece_layer.blit(self.piece_images[piece_key], (x, y))
+        
+        self.screen.blit(self.piece_layer, self.board_rect)
+    
+    def render_frame(self):
+        """Redraw whatever changed since the last frame and return the dirty rectangles"""
+        board_state = (self.position_key(), self.selected_square, self.valid_moves, self.analysis_arrow())
+        ui_state = self.ui_state()
+        analysis_state = (self.analysis_mode, self.analysis, self.board.turn)
+        board_changed = board_state != self.last_board_state
+        ui_changed = ui_state != self.last_ui_state
+        analysis_changed = analysis_state != self.last_analysis_state
+        self.last_board_state = board_state
+        self.last_ui_state = ui_state
+        self.last_analysis_state = analysis_state
+        
+        # The help overlay covers everything, so any change redraws the whole window
+        profiler = self.profiler
+        if self.full_redraw or (self.show_help and (board_changed or ui_changed or analysis_changed)):
+            self.full_redraw = False
+            self.screen.blit(self.background, (0, 0))
+            self.draw_board()
+            profiler.mark("draw_board")
+            self.draw_pieces()
+            self.draw_arrow()
+            profiler.mark("draw_pieces")
+            self.draw_ui()
+            self.draw_analysis()
+            profiler.mark("draw_ui")
+            if self.show_help:
+                self.draw_help_screen()
+            if profiler.show_hud:
+                self.draw_hud()
+                profiler.mark("hud")
+            return [self.screen.get_rect()]
+        
+        dirty = []
+        if board_changed:
+            self.draw_board()
+            profiler.mark("draw_board")
+            self.draw_pieces()
+            self.draw_arrow()
+            profiler.mark("draw_pieces")
+            dirty.append(self.board_rect)
+        if ui_changed:
+            self.draw_ui()
+            profiler.mark("draw_ui")
+            dirty.extend(self.ui_rects)
+        if analysis_changed:
+            self.draw_analysis()
+            profiler.mark("draw_ui")
+            dirty.append(self.analysis_rect)
+        
+        # The overlay's numbers change constantly, so refresh it a few times a second
+        if profiler.show_hud and time.perf_counter() >= self.hud_next_update:
+            self.draw_hud()
+            profiler.mark("hud")
+            dirty.append(self.hud_rect)
+        return dirty
+    
+    def draw_hud(self):
+        """Draw the performance overlay"""
+        self.hud_next_update = time.perf_counter() + 0.25
+        if self.hud_font is None:
+            self.hud_font = pygame.font.SysFont('Consolas,Courier New,monospace', 13)
+        
+        self.screen.blit(self.background, self.hud_rect, self.hud_rect)
+        panel = pygame.Surface(self.hud_rect.size, pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 170))
+        y = 4
+        lines = self.profiler.summary_lines()
+        cache = self.text_cache
+        lines.append(f"text cache {cache.hit_rate():4.0%} hit  {cache.misses} miss")
+        for line in lines:
+            # Rendered directly: these strings change every refresh and would churn the text cache
+            panel.blit(self.hud_font.render(line, True, WHITE), (4, y))
+            y += self.hud_font.get_linesize()
+        self.screen.blit(panel, self.hud_rect)
+    
+    def analysis_arrow(self):
+        """(from, to) squares of the analysed best move, or None"""
+        if not self.analysis_mode or self.analysis is None or self.analysis.move is None:
+            return None
+        return self.analysis.move.from_square, self.analysis.move.to_square
+    
+    def draw_arrow(self):
+        """Draw the best-move arrow over the pieces"""
+        arrow = self.analysis_arrow()
+        if arrow is None:
+            return
+        half = self.square_size // 2
+        (x1, y1), (x2, y2) = [(x + half, y + half) for x, y in map(self.square_origin, arrow)]
+        angle = math.atan2(y2 - y1, x2 - x1)
+        head = self.square_size * 0.35
+        
+        # Stop the shaft at the base of the head so its end stays hidden
+        base = (x2 - head * math.cos(angle), y2 - head * math.sin(angle))
+        pygame.draw.line(self.screen, ARROW_COLOR, (x1, y1), base, 7)
+        left = (base[0] + head * 0.5 * math.sin(angle), base[1] - head * 0.5 * math.cos(angle))
+        right = (base[0] - head * 0.5 * math.sin(angle), base[1] + head * 0.5 * math.cos(angle))
+        pygame.draw.polygon(self.screen, ARROW_COLOR, [(x2, y2), left, right])
+    
+    def draw_analysis(self):
+        """Draw the eval bar, depth, score and principal variation beside the board"""
+        rect = self.analysis_rect
+        self.screen.blit(self.background, rect, rect)
+        if not self.analysis_mode:
+            return
+        
+        # White's share of the bar follows the expected score, so it moves little once a side is winning
+        bar = pygame.Rect(rect.x, rect.y, 18, rect.height)
+        pygame.draw.rect(self.screen, (60, 60, 60), bar)
+        result = self.analysis
+        if result is None:
+            white_share = 0.5
+        else:
+            score = white_score(result, self.board)
+            white_share = 1 / (1 + 10 ** (-max(-2000, min(2000, score)) / 400))
+        white_height = round(bar.height * white_share)
+        pygame.draw.rect(self.screen, (245, 245, 245), (bar.x, bar.bottom - white_height, bar.width, white_height))
+        pygame.draw.rect(self.screen, BLACK, bar, 1)
+        
+        # Rendered directly: the PV changes with every depth and would churn the text cache
+        x = bar.right + 8
+        if result is None:
+            lines = ["Analysing..."]
+        else:
+            lines = [format_score(white_score(result, self.board)), f"Depth {result.depth}"]
+            # One line per full move of the principal variation
+            board = self.board.copy(stack=False)
+            for move in result.pv[:10]:
+                if not board.is_legal(move):
+                    break
+                if board.turn == chess.WHITE:
+                    lines.append(f"{board.fullmove_number}. {board.san(move)}")
+                elif len(lines) == 2:
+                    lines.append(f"{board.fullmove_number}... {board.san(move)}")
+                else:
+                    lines[-1] += f" {board.san(move)}"
+                board.push(move)
+        y = rect.y
+        for line in lines:
+            self.screen.blit(self.small_font.render(line, True, BLACK), (x, y))
+            y += self.small_font.get_linesize()
+    
+    def update_analysis(self):
+        """Keep the analysis on the shown position and pick up its newest depth; call once per frame"""
+        if not self.analysis_mode:
+            return
+        
+        # Leave the CPU to the AI while it thinks
+        if self.ai_thinking:
+            self.analyser.stop()
+        else:
+            self.analyser.follow(self.board)
+        self.analysis = self.analyser.poll()
+    
+    def toggle_analysis(self):
+        """Turn live analysis on or off"""
+        self.analysis_mode = not self.analysis_mode
+        if self.analysis_mode:
+            if self.analyser is None:
+                self.analyser = LiveAnalyser(notify=self.wake)
+        else:
+            self.analyser.stop()
+            self.analysis = None
+    
+    def take_back(self):
+        """Undo the last move; against the AI, undo its reply too so it is the player's turn"""
+        self.selected_square = None
+        self.valid_moves = frozenset()
+        if self.undo_move() and self.ai_enabled and self.board.turn == chess.BLACK:
+            self.undo_move()
+    
+    def replay(self):
+        """Redo a taken-back move; against the AI, redo its reply too or let it find one"""
+        self.selected_square = None
+        self.valid_moves = frozenset()
+        if not self.redo_move() or not self.ai_enabled or self.game_over or self.board.turn != chess.BLACK:
+            return
+        if self.redo_stack:
+            self.redo_move()
+        else:
+            self.request_ai_move()
+    
+    def ui_state(self):
+        """Everything draw_ui shows, used to skip redrawing unchanged text"""
+        return (self.format_time(self.white_time), self.format_time(self.black_time),
+                self.board.turn, self.ai_enabled, self.status.is_check, self.game_over, self.winner,
+                self.tablebase_result)
+    
+    def render_text(self, font, text, color):
+        """Render text through the cache so unchanged strings are not re-rasterized"""
+        return self.text_cache.render(font, text, color)
+    
+    def draw_ui(self):
+        """Draw UI elements like timer, game status, etc."""
+        # Clear the text regions back to the background
+        for rect in self.ui_rects:
+            self.screen.blit(self.background, rect, rect)
+        
+        # Draw timer
+        white_timer = self.format_time(self.white_time)
+        black_timer = self.format_time(self.black_time)
+        
+        white_text = self.render_text(self.font, f"White: {white_timer}", BLACK)
+        black_text = self.render_text(self.font, f"Black: {black_timer}", BLACK)
+        
+        self.screen.blit(white_text, (20, 20))
+        self.screen.blit(black_text, (20, 50))
+        
+        # Draw current player indicator
+        current_player = "White" if self.board.turn == chess.WHITE else "Black"
+        player_text = self.render_text(self.font, f"Current Player: {current_player}", BLACK)
+        self.screen.blit(player_text, (self.window_width - 250, 20))
+        
+        # Draw AI status
+        ai_status = "ON" if self.ai_enabled else "OFF"
+        ai_text = self.render_text(self.font, f"AI: {ai_status}", BLACK)
+        self.screen.blit(ai_text, (self.window_width - 250, 50))
+        
+        # Draw game status
+        status_text = ""
+        if self.tablebase_result:
+            status_text = self.tablebase_result
+        if self.status.is_check:
+            status_text = "CHECK!"
+        if self.game_over:
+            if self.winner == "Draw" and self.status.is_draw:
+                status_text = f"Game Over - Draw ({self.status.reason})"
+            elif self.winner == "Draw":
+                status_text = "Game Over - Draw"
+            else:
+                status_text = f"Game Over - {self.winner} wins!"
+        
+        if status_text:
+            status_render = self.render_text(self.font, status_text, (255, 0, 0))
+            self.screen.blit(status_render, ((self.window_width - status_render.get_width()) // 2, self.window_height - 50))
+        
+        # Draw help text
+        help_text = self.render_text(self.small_font, "Press H for help", BLACK)
+        self.screen.blit(help_text, (self.window_width - 150, self.window_height - 30))
+    
+    def draw_help_screen(self):
+        """Draw the help screen overlay"""
+        # Semi-transparent overlay
+        self.screen.blit(self.help_overlay, (0, 0))
+        
+        # Draw help text
+        title = self.render_text(self.font, "CHESS GAME HELP", WHITE)
+        self.screen.blit(title, ((self.window_width - title.get_width()) // 2, 100))
+        
+        help_items = [
+            "Click on a piece to select it",
+            "Click on a highlighted square to move",
+            "R: Reset the game",
+            "H: Toggle this help screen",
+            "A: Toggle AI opponent",
+            "P: Toggle performance overlay",
+            "E: Toggle live analysis",
+            "Left/Right: Take back / replay a move",
+            "F11: Toggle fullscreen",
+            "Q: Quit the game"
+        ]
+        
+        y = 150
+        for item in help_items:
+            text = self.render_text(self.small_font, item, WHITE)
+            self.screen.blit(text, ((self.window_width - text.get_width()) // 2, y))
+            y += 30
+        
+        # Draw exit instruction
+        exit_text = self.render_text(self.small_font, "Press H to return to the game", WHITE)
+        self.screen.blit(exit_text, ((self.window_width - exit_text.get_width()) // 2, self.window_height - 100))
+    
+    def get_square_at_pos(self, pos):
+        """Convert screen position to chess square"""
+        # Check if click is within the board, using the geometry from the last layout
+        if not self.board_rect.collidepoint(pos):
+            return None
+        
+        # Calculate file and rank
+        x, y = pos
+        file = (x - self.board_x) // self.square_size
+        rank = 7 - ((y - self.board_y) // self.square_size)  # Flip rank for display
+        
+        # Convert to square index
+        return chess.square(file, rank)
+    
+    def toggle_fullscreen(self):
+        """Switch between a resizable window and fullscreen at the display's resolution"""
+        self.fullscreen = not self.fullscreen
+        if self.fullscreen:
+            self.windowed_size = self.screen.get_size()
+            self.screen = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
+        else:
+            self.screen = pygame.display.set_mode(self.windowed_size, pygame.RESIZABLE)
+        self.init_render_cache()
+    
+    def request_ai_move(self):
+        """Start the AI search, timing it for the performance overlay"""
+        self.profiler.ai_started()
+        super().request_ai_move()
+    
+    def apply_ai_result(self):
+        """Play a finished AI move and record its search statistics"""
+        played = super().apply_ai_result()
+        if played:
+            self.profiler.ai_finished(self.last_search)
+        return played
+    
+    def reset_game(self):
+        """Reset the game to the starting position"""
+        self.selected_square = None
+        self.valid_moves = frozenset()
+        super().reset_game()
+    
+    def wake(self):
+        """Wake the main loop; safe to call from worker threads"""
+        try:
+            pygame.event.post(pygame.event.Event(WAKE_EVENT))
+        except pygame.error:
+            pass  # The window is already closed
+    
+    def next_frame_delay(self):
+        """Seconds until the screen next needs updating unless input or a worker wakes the loop first"""
+        if self.full_redraw:
+            return 0.0
+        delay = MAX_IDLE_WAIT
+        
+        # The next whole second on the running clock, which is also the exact moment of flag fall
+        change = self.next_clock_change()
+        if change is not None:
+            delay = min(delay, change - self.time_source())
+        if self.profiler.show_hud:
+            delay = min(delay, self.hud_next_update - time.perf_counter())
+        return max(delay, 0.0)
+    
+    def wait_for_events(self):
+        """Sleep until an event arrives or the next frame is due, then return every pending event"""
+        delay = self.next_frame_delay()
+        events = []
+        if delay > 0:
+            # Round up so a clock change is never drawn a millisecond early
+            event = pygame.event.wait(math.ceil(delay * 1000) + 1)
+            if event.type != pygame.NOEVENT:
+                events.append(event)
+        events.extend(pygame.event.get())
+        return events
+    
+    def run(self):
+        """Main game loop, drawing a frame only for input, AI and analysis results and clock changes"""
+        running = True
+        
+        profiler = self.profiler
+        
+        # Pointer movement changes nothing on screen, so it should not wake the loop
+        pygame.event.set_blocked(pygame.MOUSEMOTION)
+        
+        while running:
+            events = self.wait_for_events()
+            profiler.begin_frame()
+            
+            # Handle events
+            for event in events:
+                if event.type == pygame.QUIT:
+                    running = False
+                
+                # The display surface follows the window; lay out again only if its size changed
+                elif event.type == pygame.VIDEORESIZE and not self.fullscreen:
+                    self.screen = pygame.display.get_surface()
+                    if self.screen.get_size() != (self.window_width, self.window_height):
+                        self.init_render_cache()
+                
+                # Handle keyboard input
+                elif event.type == pygame.KEYDOWN:
+                    if event.key == pygame.K_q:
+                        running = False
+                    elif event.key == pygame.K_r:
+                        self.reset_game()
+                    elif event.key == pygame.K_h:
+                        self.show_help = not self.show_help
+                        self.full_redraw = True
+                    elif event.key == pygame.K_a:
+                        self.ai_enabled = not self.ai_enabled
+                        if not self.ai_enabled:
+                            self.cancel_ai()
+                    elif event.key == pygame.K_p:
+                        profiler.toggle_hud()
+                        self.full_redraw = True
+                    elif event.key == pygame.K_e:
+                        self.toggle_analysis()
+                    elif event.key == pygame.K_LEFT:
+                        self.take_back()
+                    elif event.key == pygame.K_RIGHT:
+                        self.replay()
+                    elif event.key == pygame.K_F11:
+                        self.toggle_fullscreen()
+                
+                # Handle mouse input
+                elif (event.type == pygame.MOUSEBUTTONDOWN and not self.game_over and not self.show_help
+                      and not self.ai_thinking):
+                    if event.button == 1:  # Left click
+                        square = self.get_square_at_pos(event.pos)
+                        
+                        if square is not None:
+                            if self.selected_square is None:
+                                # Try to select a piece
+                                piece = self.board.piece_at(square)
+                                if piece is not None and piece.color == self.board.turn:
+                                    self.selected_square = square
+                                    self.valid_moves = self.get_valid_moves(square)
+                                    self.play_sound("select")
+                            else:
+                                # Try to move the selected piece, always promoting to queen for simplicity
+                                move = self.find_move(self.selected_square, square, promotion=chess.QUEEN)
+                                if move is not None:
+                                    profiler.input_move()
+                                    self.make_move(move)
+                                    
+                                    # AI's turn
+                                    if self.ai_enabled and not self.game_over and self.board.turn == chess.BLACK:
+                                        self.request_ai_move()
+                                
+                                # Clear selection
+                                self.selected_square = None
+                                self.valid_moves = frozenset()
+            
+            profiler.mark("events")
+            
+            # Play the AI's move once its search has finished
+            self.apply_ai_result()
+            profiler.mark("ai")
+            
+            # Stream the background analysis into the eval bar
+            self.update_analysis()
+            profiler.mark("analysis")
+            
+            # Update timer
+            self.update_timer()
+            profiler.mark("update_timer")
+            
+            # Draw only what changed and update just those regions
+            dirty_rects = self.render_frame()
+            if dirty_rects:
+                pygame.display.update(dirty_rects)
+                profiler.mark("flip")
+                profiler.move_shown()
+            profiler.end_frame()
+            
+            # Cap the frame rate during bursts of input; costs nothing after an idle wait
+            self.clock.tick(FPS)
+        
+        # Clean up
+        if self.analyser is not None:
+            self.analyser.stop()
+        self.profiler.close()
+        self.shutdown()
+        pygame.quit()
+        sys.exit()
+
+class SimulView(AssetLoader):
+    """Many concurrent games in one window: a simultaneous exhibition or a self-play spectator view"""
+    
+    def __init__(self, games=8, spectate=False, time_control=SIMUL_TIME_CONTROL, think_time=SIMUL_THINK_TIME):
+        pygame.init()
+        self.screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT), pygame.RESIZABLE)
+        pygame.display.set_caption("Chess Simul" if not spectate else "Chess Self-Play")
+        self.clock = pygame.time.Clock()
+        self.font = pygame.font.SysFont('Arial', 13)
+        self.small_font = pygame.font.SysFont('Arial', 18)
+        self.text_cache = TextCache()
+        self.startup_timings = {}
+        self.init_assets()
+        
+        # One headless core per board. The player takes White everywhere and the AI Black,
+        # or the AI plays both sides when spectating. Searches are CPU-bound and share the
+        # interpreter lock, so all boards queue on one AI thread rather than one thread each
+        self.spectate = spectate
+        self.ai_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="simul-ai")
+        self.games = []
+        for _ in range(games):
+            game = GameCore(time_control=time_control, ai_think_time=think_time)
+            game.ai_worker = AIWorker(executor=self.ai_executor)
+            self.games.append(game)
+        self.requested = [None] * games  # Ply each board's pending AI search was requested at
+        self.set_openings()
+        
+        # Click-to-move on one board at a time
+        self.selected = None  # (board index, square)
+        self.valid_moves = frozenset()
+        self.layout()
+    
+    def layout(self):
+        """Tile the window with as large boards as fit and prerender one board's squares"""
+        width, height = self.window_size = self.screen.get_size()
+        count = len(self.games)
+        best = None
+        for columns in range(1, count + 1):
+            rows = -(-count // columns)
+            square = min((width // columns - TILE_PADDING) // 8,
+                         (height // rows - TILE_PADDING - TILE_LABEL_HEIGHT) // 8)
+            if best is None or square > best[0]:
+                best = (max(square, 4), columns, rows)
+        self.square_size, columns, rows = best
+        board_size = self.square_size * 8
+        tile_width, tile_height = width // columns, height // rows
+        
+        # Board and label rectangles of every tile, boards centred in their tiles
+        self.board_rects = []
+        self.label_rects = []
+        for i in range(count):
+            column, row = i % columns, i // columns
+            x = column * tile_width + (tile_width - board_size) // 2
+            y = row * tile_height + (tile_height - board_size - TILE_LABEL_HEIGHT) // 2
+            self.board_rects.append(pygame.Rect(x, y, board_size, board_size))
+            self.label_rects.append(pygame.Rect(x, y + board_size, board_size, TILE_LABEL_HEIGHT))
+        
+        # Shared by every board: squares, highlights and the sprite atlas for this size
+        self.board_surface = pygame.Surface((board_size, board_size)).convert()
+        for square in chess.SQUARES:
+            is_light = (chess.square_rank(square) + chess.square_file(square)) % 2 == 0
+            color = LIGHT_SQUARE if is_light else DARK_SQUARE
+            pygame.draw.rect(self.board_surface, color, self.square_rect(square, (0, 0)))
+        self.highlight_surface = pygame.Surface((self.square_size, self.square_size), pygame.SRCALPHA)
+        self.highlight_surface.fill(MOVE_HIGHLIGHT)
+        self.selected_surface = pygame.Surface((self.square_size, self.square_size), pygame.SRCALPHA)
+        pygame.draw.rect(self.selected_surface, HIGHLIGHT, self.selected_surface.get_rect(), 3)
+        self.piece_images = self.atlases.get(self.square_size).sprites
+        self.piece_sprites = {
+            (color, piece_type): self.piece_images[('w' if color == chess.WHITE else 'b') + chess.piece_symbol(piece_type)]
+            for color in chess.COLORS for piece_type in chess.PIECE_TYPES
+        }
+        self.square_offsets = [self.square_rect(square, (0, 0)).topleft for square in chess.SQUARES]
+        
+        self.screen.fill(WHITE)
+        self.last_states = [None] * count
+        self.full_redraw = True
+    
+    def square_rect(self, square, origin):
+        """Screen rectangle of a square on the board whose top-left corner is origin"""
+        size = self.square_size
+        return pygame.Rect(origin[0] + chess.square_file(square) * size,
+                           origin[1] + (7 - chess.square_rank(square)) * size, size, size)
+    
+    def label(self, game):
+        """Clocks and state shown under a board"""
+        if game.game_over:
+            status = {"White": "1-0", "Black": "0-1", "Draw": "1/2"}.get(game.winner, "")
+        else:
+            status = "W" if game.board.turn == chess.WHITE else "B"
+        return f"{game.format_time(game.white_time)} {game.format_time(game.black_time)} {status}"
+    
+    def board_state(self, i):
+        """Everything drawn for board i, used to skip boards that have not changed"""
+        game = self.games[i]
+        selected = self.selected[1] if self.selected is not None and self.selected[0] == i else None
+        return board_key(game.board), selected, self.label(game), game.status.is_check
+    
+    def render_frame(self):
+        """Redraw the boards that changed in one batched blit and return their dirty rectangles"""
+        changed = []
+        for i in range(len(self.games)):
+            state = self.board_state(i)
+            if self.full_redraw or state != self.last_states[i]:
+                self.last_states[i] = state
+                changed.append(i)
+        self.full_redraw = False
+        if not changed:
+            return []
+        
+        # One blits call for every changed board, in layer order: squares, highlights, pieces, labels
+        squares, highlights, pieces, labels = [], [], [], []
+        dirty = []
+        for i in changed:
+            game = self.games[i]
+            rect, label_rect = self.board_rects[i], self.label_rects[i]
+            squares.append((self.board_surface, rect))
+            dirty.extend((rect, label_rect))
+            if self.selected is not None and self.selected[0] == i:
+                highlights.append((self.selected_surface, self.square_rect(self.selected[1], rect.topleft)))
+                highlights.extend((self.highlight_surface, self.square_rect(square, rect.topleft))
+                                  for square in self.valid_moves)
+            
+            # Straight from the bitboards, one atlas sprite per piece kind
+            x, y = rect.topleft
+            board = game.board
+            for (color, piece_type), sprite in self.piece_sprites.items():
+                for square in chess.scan_forward(board.pieces_mask(piece_type, color)):
+                    dx, dy = self.square_offsets[square]
+                    pieces.append((sprite, (x + dx, y + dy)))
+            
+            color = (200, 0, 0) if game.game_over or game.status.is_check else BLACK
+            labels.append((self.render_text(self.label(game), color), (label_rect.x, label_rect.y + 2)))
+            self.screen.fill(WHITE, label_rect)
+        self.screen.blits(squares + highlights + pieces + labels, doreturn=False)
+        return dirty
+    
+    def render_text(self, text, color):
+        """Render text through the cache so unchanged strings are not re-rasterized"""
+        return self.text_cache.render(self.font, text, color)
+    
+    def ai_plays(self, game):
+        """True if the side to move on game's board is played by the AI"""
+        return self.spectate or game.board.turn == chess.BLACK
+    
+    def update_games(self):
+        """Advance every board's clock and AI; call once per frame"""
+        for i, game in enumerate(self.games):
+            # Checked before polling, so an idle worker's result is already in the queue
+            idle = not game.ai_thinking
+            played = game.apply_ai_result()
+            game.update_timer()
+            ply = len(game.board.move_stack)
+            if idle and not played and self.requested[i] == ply:
+                # The search came back empty or its result was dropped as stale: ask again
+                self.requested[i] = None
+            if not game.game_over and self.ai_plays(game) and self.requested[i] != ply:
+                self.requested[i] = ply
+                game.request_ai_move()
+    
+    def board_at(self, pos):
+        """(board index, square) under a screen position, or None"""
+        for i, rect in enumerate(self.board_rects):
+            if rect.collidepoint(pos):
+                file = (pos[0] - rect.x) // self.square_size
+                rank = 7 - (pos[1] - rect.y) // self.square_size
+                return i, chess.square(file, rank)
+        return None
+    
+    def click(self, pos):
+        """Select a piece or move the selected one on the clicked board"""
+        hit = self.board_at(pos)
+        if hit is None:
+            self.selected = None
+            return
+        i, square = hit
+        game = self.games[i]
+        if game.game_over or self.ai_plays(game):
+            return
+        
+        if self.selected is not None and self.selected[0] == i:
+            move = game.find_move(self.selected[1], square, promotion=chess.QUEEN)
+            self.selected = None
+            self.valid_moves = frozenset()
+            if move is not None:
+                game.make_move(move)
+                return
+        
+        # Select a piece of the side to move, possibly on another board
+        piece = game.board.piece_at(square)
+        if piece is not None and piece.color == game.board.turn:
+            self.selected = (i, square)
+            self.valid_moves = game.get_valid_moves(square)
+    
+    def set_openings(self):
+        """Start spectated boards from different openings so they do not all play the same game"""
+        if self.spectate:
+            for i, game in enumerate(self.games):
+                game.set_position(opening_board(DEFAULT_OPENINGS[i % len(DEFAULT_OPENINGS)]))
+    
+    def reset(self):
+        """Start every game again"""
+        for game in self.games:
+            game.reset_game()
+        self.set_openings()
+        self.requested = [None] * len(self.games)
+        self.selected = None
+        self.valid_moves = frozenset()
+    
+    def run(self):
+        """Main loop of the simul view"""
+        running = True
+        while running:
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    running = False
+                elif event.type == pygame.VIDEORESIZE:
+                    self.screen = pygame.display.get_surface()
+                    if self.screen.get_size() != self.window_size:
+                        self.layout()
+                elif event.type == pygame.KEYDOWN:
+                    if event.key == pygame.K_q:
+                        running = False
+                    elif event.key == pygame.K_r:
+                        self.reset()
+                elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+                    self.click(event.pos)
+            
+            self.update_games()
+            dirty_rects = self.render_frame()
+            if dirty_rects:
+                pygame.display.update(dirty_rects)
+            self.clock.tick(FPS)
+        
+        # Clean up
+        for game in self.games:
+            game.shutdown()
+        self.ai_executor.shutdown(wait=True, cancel_futures=True)
+        pygame.quit()
+        sys.exit()
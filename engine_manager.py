@@ -0,0 +1,162 @@
+import os
+import queue
+import shutil
+import threading
+
+import chess
+import chess.engine
+
+# Default search limit, same depth the old per-move Stockfish() call used
+DEFAULT_LIMIT = chess.engine.Limit(depth=15)
+IDLE_POLL = 0.1  # Seconds between checks for shutdown while waiting for an idle engine
+
+
+class EngineManager:
+    """Keep a small pool of UCI engine processes alive between moves"""
+
+    def __init__(self, path=None, pool_size=1, options=None, limit=None):
+        self.path = path or os.environ.get("STOCKFISH_PATH") or shutil.which("stockfish")
+        self.pool_size = max(1, pool_size)
+        self.options = options or {}
+        self.limit = limit or DEFAULT_LIMIT
+
+        self._idle = queue.Queue()
+        self._engines = []
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._started = False
+        self._closed = False
+        self._game = 0
+        self.restarts = 0
+
+    @property
+    def available(self):
+        """True if an engine binary was found and the pool is not shut down"""
+        return self.path is not None and not self._closed
+
+    def start(self, background=False):
+        """Launch the engine processes, optionally on a background thread"""
+        if background:
+            threading.Thread(target=self.start, daemon=True).start()
+            return
+
+        with self._lock:
+            if self._started or not self.available:
+                self._ready.set()
+                return
+            self._started = True
+
+            for _ in range(self.pool_size):
+                engine = self._spawn()
+                if engine is not None:
+                    self._engines.append(engine)
+                    self._idle.put(engine)
+
+            # Nothing came up, so behave as if no engine was installed
+            if not self._engines:
+                self.path = None
+            self._ready.set()
+
+    def _spawn(self):
+        """Start one engine process and apply the configured options"""
+        try:
+            engine = chess.engine.SimpleEngine.popen_uci(self.path)
+            if self.options:
+                engine.configure(self.options)
+            return engine
+        except (OSError, chess.engine.EngineError, chess.engine.EngineTerminatedError) as e:
+            print(f"Could not start engine {self.path}: {e}")
+            return None
+
+    def _restart(self, engine):
+        """Replace a crashed engine with a fresh process"""
+        self._close_engine(engine)
+        with self._lock:
+            if engine in self._engines:
+                self._engines.remove(engine)
+            if self._closed:
+                return None
+            replacement = self._spawn()
+            if replacement is not None:
+                self._engines.append(replacement)
+                self.restarts += 1
+            elif not self._engines:
+                # The last engine is gone, so behave as if none was installed
+                self.path = None
+            return replacement
+
+    def new_game(self):
+        """Tell the engines the next position belongs to a new game"""
+        self._game += 1
+
+    def best_move(self, board, limit=None):
+        """Return the engine's best move for board, or None if no engine is usable"""
+        result = self._call(lambda engine: engine.play(board, limit or self.limit, game=self._game))
+        return result.move if result is not None else None
+
+    def analyse(self, board, limit=None):
+        """Return the engine's (score, best move) for board, or None if no engine is usable"""
+        info = self._call(lambda engine: engine.analyse(board, limit or self.limit, game=self._game))
+        if info is None or "score" not in info:
+            return None
+        pv = info.get("pv")
+        return info["score"], pv[0] if pv else None
+
+    def _call(self, command):
+        """Run command(engine) on an idle engine and return its result, or None"""
+        if not self._started:
+            self.start()
+        self._ready.wait()
+        if not self.available or not self._engines:
+            return None
+
+        engine = self._acquire()
+        if engine is None:
+            return None
+        try:
+            # One retry after restarting an engine that died mid-game
+            for _ in range(2):
+                if engine is None:
+                    return None
+                try:
+                    return command(engine)
+                except chess.engine.EngineTerminatedError:
+                    engine = self._restart(engine)
+                except chess.engine.EngineError as e:
+                    print(f"Engine error: {e}")
+                    return None
+            return None
+        finally:
+            if engine is not None:
+                self._idle.put(engine)
+
+    def _acquire(self):
+        """Wait for an idle engine; None once the pool is shut down or has lost every engine"""
+        while self.available and self._engines:
+            try:
+                engine = self._idle.get(timeout=IDLE_POLL)
+            except queue.Empty:
+                continue
+            if self._closed:
+                return None
+            return engine
+        return None
+
+    def _close_engine(self, engine):
+        """Quit an engine process, killing it if it does not answer"""
+        try:
+            engine.quit()
+        except Exception:
+            try:
+                engine.close()
+            except Exception:
+                pass
+
+    def shutdown(self):
+        """Stop every engine process"""
+        with self._lock:
+            self._closed = True
+            engines, self._engines = self._engines, []
+        for engine in engines:
+            self._close_engine(engine)
+        self._ready.set()
@@ -0,0 +1,191 @@
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import chess
+
+from game_core import GameCore
+from tablebase import Tablebase
+
+DEFAULT_TIMES = (0.1, 0.5, 2.0)  # Seconds per position when no budgets are given
+DEFAULT_OUTPUT = "epd_results.json"
+
+# Headless core of each worker process; its tables are cleared before every search
+_worker_core = None
+
+
+def _init_worker(syzygy):
+    global _worker_core
+    _worker_core = GameCore(tablebase=Tablebase(syzygy) if syzygy else None)
+
+
+def load_suite(path):
+    """Read (id, EPD line) pairs; positions without a bm or am operation are skipped"""
+    positions = []
+    name = os.path.splitext(os.path.basename(path))[0]
+    with open(path) as f:
+        for number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            try:
+                _, operations = chess.Board.from_epd(line)
+            except ValueError as e:
+                print(f"{path}:{number}: skipped, {e}")
+                continue
+            if "bm" not in operations and "am" not in operations:
+                print(f"{path}:{number}: skipped, no bm or am operation")
+                continue
+            positions.append((str(operations.get("id", f"{name}:{number}")), line))
+    return positions
+
+
+def budget_label(budget):
+    """Column heading of a ("time", seconds) or ("nodes", count) budget; distinct budgets get distinct headings"""
+    kind, limit = budget
+    if kind == "nodes":
+        return f"{limit}n"
+    text = f"{limit:g}"
+    return f"{text if float(text) == limit else repr(limit)}s"
+
+
+def solve_position(epd, budget):
+    """Process-pool entry point: run the AI on one position within budget and grade its move"""
+    board, operations = chess.Board.from_epd(epd)
+    best_moves = operations.get("bm", [])
+    avoid_moves = operations.get("am", [])
+
+    def solves(move):
+        return move is not None and (not best_moves or move in best_moves) and move not in avoid_moves
+
+    # Start cold, so one budget's search never helps the next
+    core = _worker_core
+    core.searcher.clear()
+    core.last_search = None
+
+    kind, limit = budget
+    iterations = []
+    start = time.perf_counter()
+    if kind == "time":
+        move = core.choose_ai_move(board, budget=(limit, limit), on_iteration=iterations.append)
+    else:
+        move = core.choose_ai_move(board, budget=(None, None), max_nodes=limit, on_iteration=iterations.append)
+    elapsed = time.perf_counter() - start
+    search = core.last_search
+
+    # Solved from the first depth after which the answer never changed back; without a
+    # completed depth to credit, the answer only arrived with the final result
+    solved = solves(move)
+    solve_time = solve_nodes = None
+    if solved:
+        solve_time, solve_nodes = elapsed, search.nodes if search is not None else 0
+        for result in reversed(iterations):
+            if not solves(result.move):
+                break
+            solve_time, solve_nodes = result.time, result.nodes
+
+    return {
+        "move": board.san(move) if move is not None else None,
+        "solved": solved,
+        "solve_time": solve_time,
+        "solve_nodes": solve_nodes,
+        "time": elapsed,
+        "depth": search.depth if search is not None else 0,
+        "nodes": search.nodes if search is not None else 0,
+        "nps": search.nps if search is not None else 0,
+    }
+
+
+def summarise(positions, label):
+    """Solve rate, mean time-to-solution and overall nodes/sec of one budget"""
+    results = [position["results"][label] for position in positions]
+    solved = [result for result in results if result["solved"]]
+    seconds = sum(result["time"] for result in results)
+    return {
+        "solved": len(solved),
+        "total": len(results),
+        "rate": len(solved) / len(results) if results else 0.0,
+        "mean_solve_time": sum(result["solve_time"] for result in solved) / len(solved) if solved else None,
+        "nps": int(sum(result["nodes"] for result in results) / seconds) if seconds > 0 else 0,
+    }
+
+
+def print_table(positions, labels, summary):
+    """Time-to-solution per position and budget, '-' where unsolved, then the per-budget totals"""
+    width = max([len("position")] + [len(position["id"]) for position in positions])
+    print(f"{'position':<{width}}" + "".join(f"{label:>9}" for label in labels) + f"{'knps':>7}")
+    for position in positions:
+        cells = []
+        for label in labels:
+            result = position["results"][label]
+            cells.append(f"{result['solve_time']:9.2f}" if result["solved"] else f"{'-':>9}")
+        knps = position["results"][labels[-1]]["nps"] / 1000
+        print(f"{position['id']:<{width}}" + "".join(cells) + f"{knps:7.0f}")
+
+    rows = [
+        ("solved", lambda s: f"{s['solved']}/{s['total']}"),
+        ("rate", lambda s: f"{s['rate']:.0%}"),
+        ("mean time", lambda s: f"{s['mean_solve_time']:.2f}" if s["mean_solve_time"] is not None else "-"),
+        ("knps", lambda s: f"{s['nps'] / 1000:.0f}"),
+    ]
+    for name, cell in rows:
+        print(f"{name:<{width}}" + "".join(f"{cell(summary[label]):>9}" for label in labels))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure the AI's solve rate on EPD test suites")
+    parser.add_argument("suites", nargs="+", help="EPD files with bm and/or am operations")
+    parser.add_argument("--time", type=float, nargs="+", default=[], metavar="SECONDS",
+                        help=f"time budgets per position (default: {' '.join(map(str, DEFAULT_TIMES))})")
+    parser.add_argument("--nodes", type=int, nargs="+", default=[], metavar="COUNT",
+                        help="node budgets per position")
+    parser.add_argument("-j", "--workers", type=int, default=os.cpu_count(),
+                        help="worker processes; more than the free cores skews time budgets")
+    parser.add_argument("--syzygy", help="directory with Syzygy tablebase files")
+    parser.add_argument("--json", default=DEFAULT_OUTPUT, help="JSON results file")
+    args = parser.parse_args(argv)
+
+    budgets = [("time", seconds) for seconds in args.time] + [("nodes", count) for count in args.nodes]
+    if not budgets:
+        budgets = [("time", seconds) for seconds in DEFAULT_TIMES]
+    # Results are keyed by label, so a budget given twice is run once
+    budgets = list(dict.fromkeys(budgets))
+    labels = [budget_label(budget) for budget in budgets]
+
+    suite = []
+    for path in args.suites:
+        suite.extend(load_suite(path))
+    if not suite:
+        parser.error("no positions to test")
+
+    # Every position under every budget is one task; the pool keeps all cores busy
+    tasks = [(epd, budget) for _, epd in suite for budget in budgets]
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.workers, initializer=_init_worker,
+                             initargs=(args.syzygy,)) as pool:
+        results = list(pool.map(solve_position, *zip(*tasks)))
+
+    positions = []
+    for index, (position_id, epd) in enumerate(suite):
+        board, operations = chess.Board.from_epd(epd)
+        positions.append({
+            "id": position_id,
+            "fen": board.fen(),
+            "bm": [board.san(move) for move in operations.get("bm", [])],
+            "am": [board.san(move) for move in operations.get("am", [])],
+            "results": dict(zip(labels, results[index * len(budgets):(index + 1) * len(budgets)])),
+        })
+    summary = {label: summarise(positions, label) for label in labels}
+
+    print_table(positions, labels, summary)
+    print(f"{len(suite)} positions, {len(budgets)} budgets in {time.perf_counter() - started:.1f} s")
+    with open(args.json, "w") as f:
+        json.dump({"budgets": labels, "summary": summary, "positions": positions}, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
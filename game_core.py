@@ -0,0 +1,488 @@
+import math
+import time
+
+import chess
+import chess.engine
+
+from ai_worker import AIWorker
+from game_status import StatusTracker
+from move_index import MoveIndexCache
+from search import MATE_THRESHOLD, MAX_PLY, Searcher
+from time_manager import Ponderer, TimeManager
+
+DEFAULT_TIME_CONTROL = 180  # 3 minutes per side
+
+# Increment modes: Fischer adds the increment after every move, Bronstein gives back
+# the time a move took, up to the increment
+FISCHER = "fischer"
+BRONSTEIN = "bronstein"
+
+
+def monotonic():
+    """Seconds from the monotonic nanosecond counter, which wall-clock adjustments never move"""
+    return time.monotonic_ns() / 1e9
+
+
+class ManualClock:
+    """Time source that only moves when told to, for tests and batch games"""
+
+    def __init__(self, start=0.0):
+        self.now = start
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        """Move the clock forward"""
+        self.now += seconds
+
+
+class GameCore:
+    """Game state, clocks and AI turns without any pygame dependency"""
+
+    def __init__(self, time_control=DEFAULT_TIME_CONTROL, ai_enabled=True, ai_delay=0.0,
+                 time_source=monotonic, engine=None, searcher=None,
+                 ai_think_time=None, ai_max_nodes=None, book=None, tablebase=None,
+                 increment=0.0, ponder=False, recorder=None, increment_mode=FISCHER):
+        # Game state
+        self.board = chess.Board()
+        self.game_over = False
+        self.winner = None
+        self.ai_enabled = ai_enabled
+        self.game_started = False
+        self.move_cache = MoveIndexCache()
+        self.status_tracker = StatusTracker(self.board)
+        self.status = self.status_tracker.reset(self.board)
+        self.tablebase_result = None
+        self.redo_stack = []  # Moves taken back, most recent last
+
+        # AI: optional opening book, endgame tablebase and UCI engine pool,
+        # with the built-in engine as fallback
+        self.ai_delay = ai_delay
+        self.book = book
+        self.tablebase = tablebase
+        self.engine = engine
+        self._searcher = searcher
+        self.ai_max_nodes = ai_max_nodes
+        self.time_manager = TimeManager(max_time=ai_think_time)
+        self.ponderer = Ponderer(self.searcher) if ponder else None
+        self.last_search = None
+        self.ai_worker = None  # Created on the first non-blocking AI request
+        self.ai_notify = None  # Called from the worker thread when an AI result is ready
+
+        # Timer
+        self.time_control = time_control
+        self.increment = increment
+        self.increment_mode = increment_mode
+        self.time_source = time_source
+        self.white_time = time_control
+        self.black_time = time_control
+        self.turn_start_time = time_control  # Mover's clock when the turn began, for Bronstein
+        self.last_tick = None
+        self.current_player = chess.WHITE
+
+        # Optional on-disk log of every move, used to resume interrupted games
+        self.recorder = recorder
+
+    @property
+    def searcher(self):
+        """Built-in engine, created on first use so idle games stay small"""
+        if self._searcher is None:
+            self._searcher = Searcher()
+        return self._searcher
+
+    def play_sound(self, sound_name):
+        """Hook for front-ends; the headless core makes no sound"""
+
+    def format_time(self, seconds):
+        """Format time in MM:SS format"""
+        minutes = int(seconds) // 60
+        seconds = int(seconds) % 60
+        return f"{minutes:02d}:{seconds:02d}"
+
+    def remaining(self):
+        """Clock of the side to move"""
+        return self.white_time if self.board.turn == chess.WHITE else self.black_time
+
+    def flag_deadline(self):
+        """time_source value at which the side to move runs out of time, or None while the clock is stopped"""
+        if not self.game_started or self.game_over or self.last_tick is None:
+            return None
+        return self.last_tick + self.remaining()
+
+    def next_clock_change(self):
+        """time_source value at which the side to move's displayed clock next changes, or None"""
+        deadline = self.flag_deadline()
+        if deadline is None:
+            return None
+        # Clocks show whole seconds, so the next change is when the fraction runs out
+        remaining = self.remaining()
+        return self.last_tick + remaining - math.floor(remaining)
+
+    def update_timer(self):
+        """Update the chess timer"""
+        if not self.game_started or self.game_over:
+            return
+
+        current_time = self.time_source()
+        if self.last_tick is None:
+            self.last_tick = current_time
+            return
+
+        elapsed = current_time - self.last_tick
+        self.last_tick = current_time
+
+        if self.board.turn == chess.WHITE:
+            self.white_time -= elapsed
+            if self.white_time <= 0:
+                self.white_time = 0
+                self.game_over = True
+                self.winner = "Black"
+                self.record_result("time forfeit")
+                self.play_sound("timeout")
+        else:
+            self.black_time -= elapsed
+            if self.black_time <= 0:
+                self.black_time = 0
+                self.game_over = True
+                self.winner = "White"
+                self.record_result("time forfeit")
+                self.play_sound("timeout")
+
+    def set_position(self, board):
+        """Continue the game from board, keeping its move history"""
+        self.board = board
+        self.status = self.status_tracker.reset(board)
+        self.redo_stack = []
+        if self.status.is_game_over:
+            self.game_over = True
+            self.winner = self.status.winner
+
+    def resume_recorded_game(self):
+        """Continue the unfinished game left in the recorder's log, clocks included"""
+        if self.recorder is None:
+            return False
+        game = self.recorder.unfinished_game()
+        if game is None:
+            return False
+
+        self.set_position(game.board())
+        self.time_control = game.time_control
+        self.increment = game.increment
+        self.increment_mode = game.increment_mode
+        self.white_time, self.black_time = game.clock
+        self.turn_start_time = self.remaining()
+        self.game_started = self.board.fullmove_number > 1
+        self.last_tick = None
+
+        # The game ended just before the crash, before its result was written
+        if self.game_over:
+            self.record_result(self.status.reason)
+        return True
+
+    def record_result(self, reason):
+        """Write the finished game's result to the recorder"""
+        if self.recorder is not None:
+            self.recorder.finish(self.winner, reason)
+
+    def legal_move_index(self):
+        """Legal moves of the current position, computed once per position"""
+        return self.move_cache.get(self.board)
+
+    def get_valid_moves(self, square):
+        """Get the target squares of all valid moves for the piece at the given square"""
+        return self.legal_move_index().targets_from(square)
+
+    def find_move(self, from_square, to_square, promotion=chess.QUEEN):
+        """Return the legal move between two squares, or None"""
+        return self.legal_move_index().find(from_square, to_square, promotion)
+
+    def choose_ai_move(self, board=None, remaining=None, stop_event=None, budget=None, max_depth=MAX_PLY,
+                       max_nodes=None, on_iteration=None):
+        """Pick a move for the side to move of board (default: the game board) without playing it"""
+        move, self.last_search = self.select_ai_move(board, remaining, stop_event, budget, max_depth, max_nodes,
+                                                     on_iteration)
+        return move
+
+    def select_ai_move(self, board=None, remaining=None, stop_event=None, budget=None, max_depth=MAX_PLY,
+                       max_nodes=None, on_iteration=None):
+        """(move, search result or None) like choose_ai_move, leaving last_search alone for worker threads"""
+        if board is None:
+            board = self.board
+        if remaining is None:
+            remaining = self.white_time if board.turn == chess.WHITE else self.black_time
+
+        # The searcher is shared with the ponder thread, so stop it first
+        pondered = self.ponderer.stop(board) if self.ponderer is not None else None
+
+        index = self.move_cache.get(board)
+        if not index.moves:
+            return None, None
+
+        # A forced move needs no thinking
+        if len(index) == 1:
+            return index.moves[0], None
+
+        # Book moves cost no engine time
+        if self.book is not None:
+            book_move = self.book.choose(board)
+            if book_move is not None and book_move in index:
+                return book_move, None
+
+        # Perfect play straight from the endgame tables
+        if self.tablebase is not None:
+            tablebase_move = self.tablebase.best_move(board)
+            if tablebase_move is not None:
+                return tablebase_move, None
+
+        # A budget from the clock, unless the caller gives its own (soft, hard) think times,
+        # where None means no limit
+        if budget is None:
+            budget = self.time_manager.budget(board, remaining, self.increment, len(index))
+        soft, hard = budget
+        if max_nodes is None:
+            max_nodes = self.ai_max_nodes
+
+        # Try to use the persistent engine if available, within the same budget
+        if self.engine is not None:
+            if stop_event is not None and stop_event.is_set():
+                return None, None
+            best_move = self.engine.best_move(board.copy(), self.engine_limit(soft, hard, max_depth, max_nodes))
+            if stop_event is not None and stop_event.is_set():
+                return None, None
+            if best_move and best_move in index:
+                return best_move, None
+
+        # On a ponder hit the opponent's thinking time already paid for part of the search
+        if pondered is not None and pondered.move in index:
+            if (soft is not None and pondered.time >= soft) or abs(pondered.score) >= MATE_THRESHOLD:
+                return pondered.move, pondered
+            if soft is not None:
+                soft = max(soft - pondered.time, 0.0)
+
+        search = self.searcher.search(board, max_time=hard, soft_time=soft, max_depth=max_depth,
+                                      max_nodes=max_nodes, stop_event=stop_event, on_iteration=on_iteration)
+        return search.move, search
+
+    def engine_limit(self, soft, hard, max_depth=MAX_PLY, max_nodes=None):
+        """UCI engine limit for a (soft, hard) budget; the engine's own depth limit still applies"""
+        times = [seconds for seconds in (soft, hard) if seconds is not None]
+        depth = self.engine.limit.depth
+        if max_depth < MAX_PLY:
+            depth = min(depth, max_depth) if depth is not None else max_depth
+        return chess.engine.Limit(time=min(times) if times else None, depth=depth, nodes=max_nodes)
+
+    def start_pondering(self, move):
+        """Ponder on the reply the last search expects after move"""
+        if self.ponderer is None or self.game_over or self.last_search is None:
+            return
+        pv = self.last_search.pv
+        if len(pv) >= 2 and pv[0] == move and self.board.is_legal(pv[1]):
+            self.ponderer.start(self.board, pv[1])
+
+    def ai_move(self):
+        """Make a move for the AI"""
+        if not self.ai_enabled or self.game_over or self.board.turn == chess.WHITE:
+            return
+
+        # Optional delay so AI moves feel more natural in the GUI
+        if self.ai_delay:
+            time.sleep(self.ai_delay)
+
+        self.last_search = None
+        move = self.choose_ai_move()
+        if move is not None:
+            self.make_move(move)
+            self.start_pondering(move)
+
+    @property
+    def ai_thinking(self):
+        """True while a non-blocking AI search is in flight"""
+        return self.ai_worker is not None and self.ai_worker.busy
+
+    def request_ai_move(self):
+        """Start an AI search on a snapshot of the position without blocking"""
+        if not self.ai_enabled or self.game_over:
+            return
+        if self.ai_worker is None:
+            self.ai_worker = AIWorker(notify=self.ai_notify)
+        board = self.board.copy()
+        remaining = self.white_time if board.turn == chess.WHITE else self.black_time
+        # Budgeted here so the worker never reads the time manager or increment while they change
+        budget = self.time_manager.budget(board, remaining, self.increment, len(self.legal_move_index()))
+        self.ai_worker.submit(self._search_snapshot, board, remaining, budget)
+
+    def _search_snapshot(self, stop_event, board, remaining, budget):
+        """Worker-side AI turn; only ever touches the snapshot it was given"""
+        # Optional delay so AI moves feel more natural in the GUI
+        if self.ai_delay and stop_event.wait(self.ai_delay):
+            return None
+        # The search result travels back with the move; last_search is set on the main thread
+        move, search = self.select_ai_move(board, remaining, stop_event, budget)
+        if move is None or stop_event.is_set():
+            return None
+        return board, move, search
+
+    def apply_ai_result(self):
+        """Play a finished AI move, if one is waiting; call once per frame"""
+        if self.ai_worker is None:
+            return False
+        result = self.ai_worker.poll()
+        if result is None:
+            return False
+
+        # Discard results for a position that has changed since the search started
+        board, move, search = result
+        if self.game_over or board.move_stack != self.board.move_stack or board.fen() != self.board.fen():
+            return False
+        self.last_search = search
+        self.make_move(move)
+        self.start_pondering(move)
+        return True
+
+    def cancel_ai(self):
+        """Stop any in-flight AI search and drop its result"""
+        if self.ai_worker is not None:
+            self.ai_worker.cancel()
+
+    def make_move(self, move):
+        """Make a chess move and update the game state"""
+        # Charge the mover's clock up to this instant, so a move made after flag fall never counts
+        # and leaves the redo line as it was
+        self.update_timer()
+        if self.game_over:
+            return
+
+        # Replaying the next taken-back move keeps the rest of the line for redo
+        if self.redo_stack and self.redo_stack[-1] == move:
+            self.redo_stack.pop()
+        else:
+            self.redo_stack.clear()
+
+        # Check if it's a capture
+        is_capture = self.board.is_capture(move)
+
+        # Make the move, crediting any increment to the mover
+        if self.game_started and self.increment:
+            credit = self.increment
+            if self.increment_mode == BRONSTEIN:
+                credit = min(credit, max(self.turn_start_time - self.remaining(), 0.0))
+            if self.board.turn == chess.WHITE:
+                self.white_time += credit
+            else:
+                self.black_time += credit
+        self.board.push(move)
+        self.turn_start_time = self.remaining()
+
+        # Start timer after white's first move
+        if not self.game_started and self.board.fullmove_number > 1:
+            self.game_started = True
+            self.last_tick = self.time_source()
+
+        # Compute check, mate and draw state once for this position
+        self.status = self.status_tracker.push(self.board)
+        if self.recorder is not None:
+            self.recorder.record_move(self.board, self.time_control, self.increment,
+                                      self.white_time, self.black_time, self.increment_mode)
+
+        # Play appropriate sound
+        if self.status.is_check:
+            self.play_sound("check")
+        elif is_capture:
+            self.play_sound("capture")
+        else:
+            self.play_sound("move")
+
+        # Check for game end conditions
+        if self.status.is_checkmate:
+            self.game_over = True
+            self.winner = self.status.winner
+            self.record_result(self.status.reason)
+            self.play_sound("checkmate")
+        elif self.status.is_draw:
+            self.game_over = True
+            self.winner = "Draw"
+            self.record_result(self.status.reason)
+            self.play_sound("stalemate")
+
+        # Announce the known result of tablebase positions
+        if self.tablebase is not None and not self.game_over:
+            self.tablebase_result = self.tablebase.describe(self.board)
+        else:
+            self.tablebase_result = None
+
+    def undo_move(self):
+        """Take back the last move, keeping it for redo_move; returns False if there is none"""
+        if not self.board.move_stack:
+            return False
+        self.cancel_ai()
+        if self.ponderer is not None:
+            self.ponderer.stop()
+
+        # Charge the side to move for its thinking so far, before the turn passes back
+        self.update_timer()
+
+        # The tracker drops the position's key, so repetition counts stay exact without a replay
+        move = self.board.pop()
+        self.status = self.status_tracker.pop(self.board)
+        self.redo_stack.append(move)
+        self.turn_start_time = self.remaining()
+        if self.recorder is not None:
+            self.recorder.record_undo(self.white_time, self.black_time)
+
+        self.game_over = False
+        self.winner = None
+        if self.tablebase is not None:
+            self.tablebase_result = self.tablebase.describe(self.board)
+        self.play_sound("select")
+        return True
+
+    def redo_move(self):
+        """Replay the last move taken back; returns False if there is none"""
+        if not self.redo_stack:
+            return False
+        self.cancel_ai()
+        if self.ponderer is not None:
+            self.ponderer.stop()
+        self.make_move(self.redo_stack[-1])
+        return True
+
+    def reset_game(self):
+        """Reset the game to the starting position"""
+        self.cancel_ai()
+        if self.ponderer is not None:
+            self.ponderer.stop()
+        if not self.game_over:
+            self.record_result("abandoned")
+        self.board.reset()
+        self.status = self.status_tracker.reset(self.board)
+        self.redo_stack = []
+        self.game_over = False
+        self.winner = None
+        self.tablebase_result = None
+        self.white_time = self.time_control
+        self.black_time = self.time_control
+        self.turn_start_time = self.time_control
+        self.last_tick = None
+        self.game_started = False
+        if self.engine is not None:
+            self.engine.new_game()
+        self.play_sound("select")
+
+    def shutdown(self):
+        """Release the AI worker, engine processes, ponder thread, opening book and game log"""
+        if self.ai_worker is not None:
+            self.ai_worker.shutdown()
+        if self.ponderer is not None:
+            self.ponderer.stop()
+        if self.engine is not None:
+            self.engine.shutdown()
+        if self.book is not None:
+            self.book.close()
+        if self.tablebase is not None:
+            self.tablebase.close()
+        if self.recorder is not None:
+            # Keep the clocks of an unfinished game so the next session resumes it exactly
+            self.update_timer()
+            self.recorder.record_clock(self.white_time, self.black_time)
+            self.recorder.close()
@@ -0,0 +1,433 @@
+import argparse
+import heapq
+import mmap
+import os
+import struct
+import sys
+
+import chess
+import chess.pgn
+import chess.polyglot
+
+DEFAULT_LOG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "games.log")
+
+# Every record is 12 bytes and starts with its type, so the log can be walked backwards
+LOG_MAGIC = b"CHESSLOG"
+LOG_VERSION = 1
+RECORD_SIZE = 12
+LOG_HEADER = struct.Struct("<8sHxx")
+START = struct.Struct("<BBIIH")    # type, increment mode, time control ms, increment ms, FEN records
+FEN = struct.Struct("<B11s")       # type, next 11 bytes of the starting FEN
+MOVE = struct.Struct("<BxHII")     # type, 16-bit move, white ms, black ms after the move
+END = struct.Struct("<BBB9x")      # type, winner, reason
+RECORD_START, RECORD_FEN, RECORD_MOVE, RECORD_CLOCK, RECORD_END, RECORD_UNDO = 1, 2, 3, 4, 5, 6
+
+WINNERS = (None, "White", "Black", "Draw")
+INCREMENT_MODES = ("fischer", "bronstein")
+REASONS = (None, "checkmate", "stalemate", "insufficient material", "threefold repetition",
+           "50-move rule", "time forfeit", "abandoned")
+
+INDEX_MAGIC = b"CHESSIDX"
+INDEX_VERSION = 2
+INDEX_HEADER = struct.Struct("<8sHxx")  # magic, version
+INDEX_RUN = struct.Struct("<QQ")        # log bytes covered once this run is in, entry count
+INDEX_ENTRY = struct.Struct("<QIHxx")   # Zobrist key, game record number, ply
+MERGE_RATIO = 2  # Runs at the tail are merged while the run before is at most this many times larger
+
+
+def encode_move(move):
+    """Pack a move into 16 bits: from, to and promotion piece"""
+    return move.from_square | move.to_square << 6 | (move.promotion or 0) << 12
+
+
+def decode_move(code):
+    """Unpack a 16-bit move"""
+    return chess.Move(code & 63, code >> 6 & 63, code >> 12 or None)
+
+
+def _ms(seconds):
+    return max(0, int(round(seconds * 1000)))
+
+
+class GameRecord:
+    """One game read back from the log"""
+
+    def __init__(self, number, time_control, increment, fen, increment_mode="fischer"):
+        self.number = number  # Record number of its START record, unique within the log
+        self.time_control = time_control
+        self.increment = increment
+        self.increment_mode = increment_mode
+        self.fen = fen
+        self.moves = []
+        self.clock = (time_control, time_control)
+        self.winner = None
+        self.reason = None
+        self.finished = False
+
+    def board(self, ply=None):
+        """Board after ply moves (default: all of them)"""
+        board = chess.Board(self.fen) if self.fen else chess.Board()
+        for move in self.moves[:ply]:
+            board.push(move)
+        return board
+
+    def to_pgn(self):
+        """The game as a chess.pgn.Game"""
+        game = chess.pgn.Game.from_board(self.board())
+        game.headers["Result"] = {"White": "1-0", "Black": "0-1", "Draw": "1/2-1/2"}.get(self.winner, "*")
+        if self.reason:
+            game.headers["Termination"] = self.reason
+        return game
+
+
+def _parse(data, offset, end):
+    """Yield the games whose START record lies in data[offset:end]"""
+    game = None
+    while offset + RECORD_SIZE <= end:
+        kind = data[offset]
+        if kind == RECORD_START:
+            if game is not None:
+                yield game
+            _, mode, time_control, increment, fen_records = START.unpack_from(data, offset)
+            fen_bytes = bytearray()
+            number = offset // RECORD_SIZE
+            for _ in range(fen_records):
+                offset += RECORD_SIZE
+                if offset + RECORD_SIZE > end:
+                    return
+                fen_bytes += FEN.unpack_from(data, offset)[1]
+            fen = fen_bytes.rstrip(b"\0").decode("ascii")
+            mode = INCREMENT_MODES[mode] if mode < len(INCREMENT_MODES) else INCREMENT_MODES[0]
+            game = GameRecord(number, time_control / 1000, increment / 1000, fen, mode)
+        elif game is not None and kind in (RECORD_MOVE, RECORD_CLOCK, RECORD_UNDO):
+            _, code, white_ms, black_ms = MOVE.unpack_from(data, offset)
+            if kind == RECORD_MOVE:
+                game.moves.append(decode_move(code))
+            elif kind == RECORD_UNDO and game.moves:
+                game.moves.pop()
+            game.clock = (white_ms / 1000, black_ms / 1000)
+        elif game is not None and kind == RECORD_END:
+            _, winner, reason = END.unpack_from(data, offset)
+            game.winner = WINNERS[winner] if winner < len(WINNERS) else None
+            game.reason = REASONS[reason] if reason < len(REASONS) else None
+            game.finished = True
+            yield game
+            game = None
+        offset += RECORD_SIZE
+    if game is not None:
+        yield game
+
+
+def read_games(path, start=LOG_HEADER.size):
+    """Stream every game in the log from byte offset start"""
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size <= start:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            if data[:len(LOG_MAGIC)] != LOG_MAGIC:
+                raise ValueError(f"{path} is not a game log")
+            yield from _parse(data, start, size - size % RECORD_SIZE)
+
+
+def read_game(path, number):
+    """Read the game whose START record has the given record number"""
+    for game in read_games(path, number * RECORD_SIZE):
+        return game
+    return None
+
+
+class GameRecorder:
+    """Append-only log of every game played, written move by move"""
+
+    def __init__(self, path=None):
+        self.path = path or os.environ.get("CHESS_GAME_LOG") or DEFAULT_LOG_PATH
+        self.file = None
+        self.in_game = False
+        self._opened = False
+
+    def open(self):
+        """Open the log for appending, creating it and dropping any torn last record"""
+        self._opened = True
+        try:
+            self.file = open(self.path, "a+b")
+            self.file.seek(0)
+            header = self.file.read(LOG_HEADER.size)
+            if not header:
+                self.file.write(LOG_HEADER.pack(LOG_MAGIC, LOG_VERSION))
+                self.file.flush()
+            elif header[:len(LOG_MAGIC)] != LOG_MAGIC:
+                raise OSError("not a game log")
+
+            size = os.fstat(self.file.fileno()).st_size
+            if size % RECORD_SIZE:
+                self.file.truncate(size - size % RECORD_SIZE)
+        except OSError as e:
+            print(f"Could not open game log {self.path}: {e}")
+            self.close()
+        return self.file is not None
+
+    @property
+    def available(self):
+        """True if the log is open for writing"""
+        if not self._opened:
+            self.open()
+        return self.file is not None
+
+    def _write(self, data):
+        try:
+            self.file.write(data)
+            self.file.flush()
+        except OSError as e:
+            print(f"Could not write game log {self.path}: {e}")
+            self.close()
+
+    def unfinished_game(self):
+        """The last game in the log if it never got a result, so it can be resumed"""
+        if not self.available:
+            return None
+        size = os.fstat(self.file.fileno()).st_size
+
+        # Walk back to the last START record; a game is at most a few hundred records
+        with mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            offset = size - RECORD_SIZE
+            while offset >= LOG_HEADER.size:
+                kind = data[offset]
+                if kind == RECORD_END:
+                    return None
+                if kind == RECORD_START:
+                    break
+                offset -= RECORD_SIZE
+            else:
+                return None
+            game = next(_parse(data, offset, size), None)
+
+        if game is None:
+            # A crash cut the START record's FEN short
+            self.file.truncate(offset)
+            return None
+        self.in_game = True
+        return game
+
+    def start_game(self, board, time_control, increment, increment_mode="fischer"):
+        """Begin a new game record for board's starting position"""
+        fen = board.root().fen()
+        fen_bytes = b"" if fen == chess.STARTING_FEN else fen.encode("ascii")
+        chunks = [fen_bytes[i:i + 11] for i in range(0, len(fen_bytes), 11)]
+        mode = INCREMENT_MODES.index(increment_mode) if increment_mode in INCREMENT_MODES else 0
+        data = START.pack(RECORD_START, mode, _ms(time_control), _ms(increment), len(chunks))
+        data += b"".join(FEN.pack(RECORD_FEN, chunk) for chunk in chunks)
+        self._write(data)
+        self.in_game = True
+
+    def record_move(self, board, time_control, increment, white_time, black_time, increment_mode="fischer"):
+        """Append the move just pushed on board with both clocks, starting the game if needed"""
+        if not self.available:
+            return
+        if not self.in_game:
+            # Record the game from its starting position, with any moves made before logging started
+            self.start_game(board, time_control, increment, increment_mode)
+            for move in board.move_stack[:-1]:
+                self._write(MOVE.pack(RECORD_MOVE, encode_move(move), _ms(white_time), _ms(black_time)))
+        self._write(MOVE.pack(RECORD_MOVE, encode_move(board.peek()), _ms(white_time), _ms(black_time)))
+
+    def record_undo(self, white_time, black_time):
+        """Take back the last recorded move of the game in progress"""
+        if self.in_game and self.file is not None:
+            self._write(MOVE.pack(RECORD_UNDO, 0, _ms(white_time), _ms(black_time)))
+
+    def record_clock(self, white_time, black_time):
+        """Snapshot the clocks of the game in progress, e.g. on quit"""
+        if self.in_game and self.file is not None:
+            self._write(MOVE.pack(RECORD_CLOCK, 0, _ms(white_time), _ms(black_time)))
+
+    def finish(self, winner, reason):
+        """Close the game in progress with its result"""
+        if self.in_game and self.file is not None:
+            winner_code = WINNERS.index(winner) if winner in WINNERS else 0
+            reason_code = REASONS.index(reason) if reason in REASONS else 0
+            self._write(END.pack(RECORD_END, winner_code, reason_code))
+        self.in_game = False
+
+    def close(self):
+        """Close the log file"""
+        if self.file is not None:
+            try:
+                self.file.close()
+            except OSError:
+                pass
+            self.file = None
+
+
+class PositionIndex:
+    """Memory-mapped Zobrist key -> (game, ply) table over a game log, kept as a few sorted runs"""
+
+    def __init__(self, path):
+        self.path = path
+        self.file = None
+        self.data = None
+        self.runs = []  # (offset of the first entry, entry count), largest first
+        self.covered = LOG_HEADER.size
+        self.end = INDEX_HEADER.size  # Just past the last complete run
+        self.open()
+
+    @property
+    def count(self):
+        """Entries in the index"""
+        return sum(count for _, count in self.runs)
+
+    def open(self):
+        """Map the index file, if there is one"""
+        self.close()
+        self.runs = []
+        self.covered = LOG_HEADER.size
+        self.end = INDEX_HEADER.size
+        if not os.path.exists(self.path) or os.path.getsize(self.path) < INDEX_HEADER.size:
+            return
+        self.file = open(self.path, "rb")
+        self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version = INDEX_HEADER.unpack_from(self.data, 0)
+        if magic != INDEX_MAGIC:
+            self.close()
+            raise ValueError(f"{self.path} is not a position index")
+        if version != INDEX_VERSION:
+            # An older layout is rebuilt from the log by the next update
+            self.close()
+            return
+
+        offset = INDEX_HEADER.size
+        size = len(self.data)
+        while offset + INDEX_RUN.size <= size:
+            covered, count = INDEX_RUN.unpack_from(self.data, offset)
+            start = offset + INDEX_RUN.size
+            end = start + count * INDEX_ENTRY.size
+            # A run cut short by a crash is dropped; the games it covered are indexed again
+            if end > size:
+                break
+            self.runs.append((start, count))
+            self.covered = covered
+            self.end = offset = end
+
+    def _key_at(self, start, i):
+        return struct.unpack_from("<Q", self.data, start + i * INDEX_ENTRY.size)[0]
+
+    def _entries(self, start, count, first=0):
+        for i in range(first, count):
+            yield INDEX_ENTRY.unpack_from(self.data, start + i * INDEX_ENTRY.size)
+
+    def find(self, board):
+        """Return every (game record number, ply) where board's position occurred"""
+        if self.data is None:
+            return []
+        key = chess.polyglot.zobrist_hash(board)
+
+        found = []
+        for start, count in self.runs:
+            # Binary search for the first entry with this key
+            low, high = 0, count
+            while low < high:
+                mid = (low + high) // 2
+                if self._key_at(start, mid) < key:
+                    low = mid + 1
+                else:
+                    high = mid
+
+            for entry_key, game, ply in self._entries(start, count, low):
+                if entry_key != key:
+                    break
+                found.append((game, ply))
+        return found
+
+    def update(self, log_path):
+        """Index the finished games added to the log since the last update; returns how many"""
+        new_entries = []
+        covered = self.covered
+        games = 0
+        with open(log_path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size > covered:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                    for game in _parse(data, covered, size - size % RECORD_SIZE):
+                        # A game followed by another is settled: indexed if finished, otherwise
+                        # abandoned for good. The last game may still be in progress, so the
+                        # next update starts again from its START record
+                        covered = game.number * RECORD_SIZE
+                        if not game.finished:
+                            continue
+                        board = game.board(0)
+                        new_entries.append((chess.polyglot.zobrist_hash(board), game.number, 0))
+                        for ply, move in enumerate(game.moves, 1):
+                            board.push(move)
+                            new_entries.append((chess.polyglot.zobrist_hash(board), game.number, ply))
+                        covered = self._end_of(data, game, size)
+                        games += 1
+        if covered == self.covered:
+            return 0
+        new_entries.sort()
+
+        # Append the new entries as a run, first merging in the runs at the tail that are not
+        # much larger, so there are only logarithmically many runs and most updates only append
+        keep = len(self.runs)
+        merged = len(new_entries)
+        while keep and self.runs[keep - 1][1] <= MERGE_RATIO * max(merged, 1):
+            keep -= 1
+            merged += self.runs[keep][1]
+        entries = list(heapq.merge(*(self._entries(start, count) for start, count in self.runs[keep:]),
+                                   new_entries))
+        offset = self.runs[keep][0] - INDEX_RUN.size if keep < len(self.runs) else self.end
+        fresh = not self.runs
+        self.close()
+
+        with open(self.path, "wb" if fresh else "r+b") as out:
+            if fresh:
+                out.write(INDEX_HEADER.pack(INDEX_MAGIC, INDEX_VERSION))
+                offset = INDEX_HEADER.size
+            # Truncate first, so a crash part way through never leaves old entries behind a new run header
+            out.seek(offset)
+            out.truncate()
+            out.write(INDEX_RUN.pack(covered, len(entries)))
+            out.write(b"".join(INDEX_ENTRY.pack(*entry) for entry in entries))
+        self.open()
+        return games
+
+    @staticmethod
+    def _end_of(data, game, size):
+        """Byte offset just past the END record of a finished game"""
+        offset = game.number * RECORD_SIZE
+        while offset < size and data[offset] != RECORD_END:
+            offset += RECORD_SIZE
+        return offset + RECORD_SIZE
+
+    def close(self):
+        """Unmap the index file"""
+        if self.data is not None:
+            self.data.close()
+            self.data = None
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Index the game log and find positions in it")
+    parser.add_argument("--log", default=DEFAULT_LOG_PATH, help="game log file")
+    parser.add_argument("--index", help="position index file (default: <log>.idx)")
+    parser.add_argument("fen", nargs="?", help="position to look up after updating the index")
+    args = parser.parse_args(argv)
+
+    index = PositionIndex(args.index or args.log + ".idx")
+    games = index.update(args.log)
+    print(f"Indexed {games} new games, {index.count} positions in total")
+
+    if args.fen:
+        hits = index.find(chess.Board(args.fen))
+        for number, ply in hits:
+            game = read_game(args.log, number)
+            print(f"Game {number}, ply {ply}: {game.to_pgn().headers['Result']} {game.reason or ''}")
+        print(f"{len(hits)} occurrences")
+    index.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,90 @@
+from collections import Counter
+
+import chess
+import chess.polyglot
+
+
+class GameStatus:
+    """Check, mate and draw state of one position, computed once per move"""
+
+    def __init__(self, board, occurrences=1):
+        self.turn = board.turn
+        self.is_check = board.is_check()
+
+        # One legal move generation answers both mate and stalemate
+        has_moves = any(board.generate_legal_moves())
+        self.is_checkmate = self.is_check and not has_moves
+        self.is_stalemate = not self.is_check and not has_moves
+        self.is_insufficient_material = board.is_insufficient_material()
+        self.occurrences = occurrences
+        self.is_repetition = occurrences >= 3
+        self.is_fifty_moves = board.halfmove_clock >= 100
+
+        self.reason = None
+        if self.is_checkmate:
+            self.reason = "checkmate"
+        elif self.is_stalemate:
+            self.reason = "stalemate"
+        elif self.is_insufficient_material:
+            self.reason = "insufficient material"
+        elif self.is_repetition:
+            self.reason = "threefold repetition"
+        elif self.is_fifty_moves:
+            self.reason = "50-move rule"
+
+    @property
+    def is_game_over(self):
+        """True if the position ends the game"""
+        return self.reason is not None
+
+    @property
+    def is_draw(self):
+        """True if the position is a drawn end of game"""
+        return self.reason is not None and not self.is_checkmate
+
+    @property
+    def winner(self):
+        """'White', 'Black', 'Draw', or None while the game goes on"""
+        if self.is_checkmate:
+            return "White" if self.turn == chess.BLACK else "Black"
+        if self.is_draw:
+            return "Draw"
+        return None
+
+
+class StatusTracker:
+    """Counts Zobrist keys along the game so repetitions need no replay"""
+
+    def __init__(self, board=None):
+        self.counts = Counter()
+        self.keys = []
+        self.reset(board or chess.Board())
+
+    def reset(self, board):
+        """Start tracking board, replaying its move stack once"""
+        self.counts.clear()
+        self.keys = []
+        replay = board.root()
+        self._add(replay)
+        for move in board.move_stack:
+            replay.push(move)
+            self._add(replay)
+        return GameStatus(board, self.counts[self.keys[-1]])
+
+    def _add(self, board):
+        key = chess.polyglot.zobrist_hash(board)
+        self.counts[key] += 1
+        self.keys.append(key)
+
+    def push(self, board):
+        """Record the position reached by the move just pushed on board"""
+        self._add(board)
+        return GameStatus(board, self.counts[self.keys[-1]])
+
+    def pop(self, board):
+        """Forget the last position after a move was popped from board"""
+        key = self.keys.pop()
+        self.counts[key] -= 1
+        if not self.counts[key]:
+            del self.counts[key]
+        return GameStatus(board, self.counts[self.keys[-1]])
@@ -0,0 +1,95 @@
+import queue
+import threading
+from collections import OrderedDict
+
+import chess
+import chess.polyglot
+
+from search import MATE_SCORE, MATE_THRESHOLD, Searcher
+
+ANALYSIS_DEPTH = 24         # Iterative deepening stops here; deeper results come from the cache
+ANALYSIS_CACHE_SIZE = 4096  # Positions whose deepest analysis is remembered
+
+
+def white_score(result, board):
+    """A search score from White's point of view"""
+    return result.score if board.turn == chess.WHITE else -result.score
+
+
+def format_score(score):
+    """Centipawns as pawns, or a mate distance, from White's point of view"""
+    if abs(score) >= MATE_THRESHOLD:
+        plies = MATE_SCORE - abs(score)
+        return f"{'' if score > 0 else '-'}M{(plies + 1) // 2}"
+    return f"{score / 100:+.2f}"
+
+
+class LiveAnalyser:
+    """Analyses the shown position on a background thread, streaming every completed depth"""
+
+    def __init__(self, max_depth=ANALYSIS_DEPTH, cache_size=ANALYSIS_CACHE_SIZE, notify=None):
+        # Its own searcher, so analysis never races the AI worker or the ponderer
+        self.searcher = Searcher()
+        self.max_depth = max_depth
+        self.cache_size = cache_size
+        self.cache = OrderedDict()
+        self.updates = queue.Queue()
+        self.notify = notify  # Called from the analysis thread after every completed depth
+        self.thread = None
+        self.stop_event = None
+        self.key = None
+
+    def follow(self, board):
+        """Analyse board unless it is already the position being analysed"""
+        key = chess.polyglot.zobrist_hash(board)
+        if key == self.key:
+            return
+        self.stop()
+        self.key = key
+
+        # Positions analysed as deep as we go need no new search
+        cached = self.cache.get(key)
+        if cached is not None:
+            self.cache.move_to_end(key)
+            if cached.depth >= self.max_depth or abs(cached.score) >= MATE_THRESHOLD:
+                return
+        if not any(board.legal_moves):
+            return
+
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self._run, args=(board.copy(), key, self.stop_event),
+                                       daemon=True)
+        self.thread.start()
+
+    def _run(self, board, key, stop_event):
+        self.searcher.search(board, max_depth=self.max_depth, stop_event=stop_event,
+                             on_iteration=lambda result: self._publish(key, result))
+
+    def _publish(self, key, result):
+        self.updates.put((key, result))
+        if self.notify is not None:
+            self.notify()
+
+    def poll(self):
+        """Fold in finished depths without blocking and return the current position's best result"""
+        while True:
+            try:
+                key, result = self.updates.get_nowait()
+            except queue.Empty:
+                break
+            # Keep the deepest analysis; a restarted search reports shallow depths first
+            cached = self.cache.get(key)
+            if cached is None or result.depth >= cached.depth:
+                self.cache[key] = result
+                self.cache.move_to_end(key)
+                if len(self.cache) > self.cache_size:
+                    self.cache.popitem(last=False)
+        return self.cache.get(self.key)
+
+    def stop(self):
+        """Stop the running search, keeping what it found"""
+        if self.thread is not None:
+            self.stop_event.set()
+            self.thread.join()
+            self.thread = None
+        self.key = None
@@ -0,0 +1,130 @@
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+
+import chess
+
+from server import DEFAULT_HOST, DEFAULT_PORT
+
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of a list of numbers"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(fraction * len(ordered))) - 1))
+    return ordered[index]
+
+
+class LoadClient:
+    """One connection playing one game against the server"""
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.next_id = 1
+
+    async def request(self, message):
+        """Send a request and wait for the reply carrying its id"""
+        request_id = self.next_id
+        self.next_id += 1
+        self.writer.write((json.dumps(dict(message, id=request_id)) + "\n").encode("utf-8"))
+        await self.writer.drain()
+        while True:
+            reply = await self.read()
+            if reply.get("id") == request_id:
+                return reply
+
+    async def read(self):
+        """Read the next message from the server"""
+        line = await self.reader.readline()
+        if not line:
+            raise ConnectionError("server closed the connection")
+        return json.loads(line)
+
+
+async def play_game(host, port, mode, max_moves, time_control, rng, latencies):
+    """Play random moves (against the AI in ai mode) and record each move's round trip"""
+    reader, writer = await asyncio.open_connection(host, port)
+    client = LoadClient(reader, writer)
+    moves = 0
+    try:
+        reply = await client.request({"cmd": "new", "mode": mode, "time": time_control})
+        game_id = reply["game"]
+        board = chess.Board()
+
+        while moves < max_moves and not board.is_game_over():
+            move = rng.choice(list(board.legal_moves))
+            start = time.perf_counter()
+            reply = await client.request({"cmd": "move", "game": game_id, "move": move.uci()})
+            latencies.append(time.perf_counter() - start)
+            if reply.get("event") != "move":
+                break
+            board.push(move)
+            moves += 1
+            if reply.get("game_over"):
+                break
+
+            # In ai mode wait for the server's reply move
+            if mode == "ai":
+                while True:
+                    message = await client.read()
+                    if message.get("event") == "move":
+                        board.push_uci(message["move"])
+                        moves += 1
+                        break
+                    if message.get("event") == "game_over":
+                        return moves
+                if board.is_game_over():
+                    break
+    finally:
+        writer.close()
+    return moves
+
+
+async def run(host, port, games, concurrency, mode, max_moves, time_control, seed):
+    latencies = []
+    semaphore = asyncio.Semaphore(concurrency)
+    rng = random.Random(seed)
+
+    async def limited(index):
+        async with semaphore:
+            return await play_game(host, port, mode, max_moves, time_control,
+                                   random.Random(rng.random() + index), latencies)
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(limited(i) for i in range(games)), return_exceptions=True)
+    elapsed = time.perf_counter() - start
+
+    failures = [result for result in results if isinstance(result, Exception)]
+    total_moves = sum(result for result in results if not isinstance(result, Exception))
+    print(f"Games: {games - len(failures)} ok, {len(failures)} failed")
+    print(f"Moves: {total_moves} in {elapsed:.2f} s ({total_moves / elapsed:.0f} moves/sec)")
+    print(f"Move latency: p50 {percentile(latencies, 0.5) * 1000:.2f} ms, "
+          f"p99 {percentile(latencies, 0.99) * 1000:.2f} ms")
+    if failures:
+        print(f"First failure: {failures[0]!r}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test the chess game server")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("-n", "--games", type=int, default=1000, help="games to play")
+    parser.add_argument("-c", "--concurrency", type=int, default=500, help="games open at once")
+    parser.add_argument("--mode", choices=("hotseat", "ai"), default="hotseat")
+    parser.add_argument("--moves", type=int, default=40, help="maximum moves per game")
+    parser.add_argument("--time-control", type=float, default=180)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    asyncio.run(run(args.host, args.port, args.games, args.concurrency, args.mode, args.moves,
+                    args.time_control, args.seed))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
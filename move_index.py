@@ -0,0 +1,82 @@
+import threading
+from collections import OrderedDict
+
+import chess
+import chess.polyglot
+
+
+class MoveIndex:
+    """Legal moves of one position, grouped by from-square for O(1) lookups"""
+
+    def __init__(self, board):
+        self.moves = list(board.legal_moves)
+        self.targets = {}       # from-square -> frozenset of to-squares
+        self.target_masks = {}  # from-square -> bitmask of to-squares
+        self.by_squares = {}    # (from, to) -> list of moves, several for promotions
+
+        targets = {}
+        for move in self.moves:
+            targets.setdefault(move.from_square, set()).add(move.to_square)
+            self.by_squares.setdefault((move.from_square, move.to_square), []).append(move)
+        for from_square, squares in targets.items():
+            self.targets[from_square] = frozenset(squares)
+            mask = 0
+            for square in squares:
+                mask |= chess.BB_SQUARES[square]
+            self.target_masks[from_square] = mask
+
+        self.move_set = frozenset(self.moves)
+
+    def __len__(self):
+        return len(self.moves)
+
+    def __contains__(self, move):
+        return move in self.move_set
+
+    def targets_from(self, from_square):
+        """Squares the piece on from_square can move to"""
+        return self.targets.get(from_square, frozenset())
+
+    def find(self, from_square, to_square, promotion=chess.QUEEN):
+        """Return the legal move between two squares, picking the promotion piece if needed"""
+        moves = self.by_squares.get((from_square, to_square))
+        if not moves:
+            return None
+        for move in moves:
+            if move.promotion == promotion:
+                return move
+        return moves[0]
+
+
+class MoveIndexCache:
+    """Small LRU of move indexes keyed by the Polyglot Zobrist hash"""
+
+    def __init__(self, size=64):
+        self.size = size
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()  # Shared by the render loop and the AI worker
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, board):
+        """Return the MoveIndex for board, building it on a miss"""
+        key = chess.polyglot.zobrist_hash(board)
+        with self.lock:
+            index = self.entries.get(key)
+            if index is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return index
+
+        index = MoveIndex(board)
+        with self.lock:
+            self.misses += 1
+            self.entries[key] = index
+            if len(self.entries) > self.size:
+                self.entries.popitem(last=False)
+        return index
+
+    def clear(self):
+        """Forget every cached position"""
+        with self.lock:
+            self.entries.clear()
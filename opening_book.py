@@ -0,0 +1,76 @@
+import os
+import random
+import time
+
+import chess
+import chess.polyglot
+
+DEFAULT_BOOK_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "book.bin")
+DEFAULT_MAX_PLY = 20  # Stop using the book after this many half-moves
+
+
+class OpeningBook:
+    """Polyglot opening book, memory-mapped and binary-searched by Zobrist key"""
+
+    def __init__(self, path=None, max_ply=DEFAULT_MAX_PLY, seed=None):
+        self.path = path or os.environ.get("CHESS_BOOK") or DEFAULT_BOOK_PATH
+        self.max_ply = max_ply
+        self.random = random.Random(seed)
+        self.reader = None
+        self._opened = False
+
+        # Statistics
+        self.lookups = 0
+        self.hits = 0
+        self.lookup_time = 0.0
+
+    def open(self):
+        """Map the book file; a missing book simply disables lookups"""
+        self._opened = True
+        if not os.path.exists(self.path):
+            return False
+        try:
+            # open_reader memory-maps the file, so large books are never read into RAM
+            self.reader = chess.polyglot.open_reader(self.path)
+        except OSError as e:
+            print(f"Could not open opening book {self.path}: {e}")
+            self.reader = None
+        return self.reader is not None
+
+    @property
+    def available(self):
+        """True if a book file is mapped"""
+        if not self._opened:
+            self.open()
+        return self.reader is not None
+
+    def choose(self, board):
+        """Pick a weighted random book move for board, or None when out of book"""
+        if board.ply() >= self.max_ply or not self.available:
+            return None
+
+        start = time.perf_counter()
+        try:
+            move = self.reader.weighted_choice(board, random=self.random).move
+        except IndexError:
+            move = None
+        self.lookup_time += time.perf_counter() - start
+        self.lookups += 1
+        if move is not None:
+            self.hits += 1
+        return move
+
+    def stats(self):
+        """Hit rate and average lookup latency in microseconds"""
+        return {
+            "lookups": self.lookups,
+            "hits": self.hits,
+            "hit_rate": self.hits / self.lookups if self.lookups else 0.0,
+            "avg_lookup_us": self.lookup_time / self.lookups * 1e6 if self.lookups else 0.0,
+        }
+
+    def close(self):
+        """Unmap the book file"""
+        if self.reader is not None:
+            self.reader.close()
+            self.reader = None
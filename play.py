@@ -0,0 +1,45 @@
+import argparse
+import sys
+
+from game_core import BRONSTEIN, DEFAULT_TIME_CONTROL, FISCHER
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Play chess against the computer")
+    parser.add_argument("--trace", metavar="PATH", help="write a Chrome trace of frames and AI moves to PATH")
+    parser.add_argument("--simul", type=int, metavar="N", help="play a simul against the AI on N boards")
+    parser.add_argument("--spectate", type=int, metavar="N", help="watch the AI play itself on N boards")
+    parser.add_argument("--time-control", type=float,
+                        help=f"seconds per side (default: {DEFAULT_TIME_CONTROL}, longer on simul boards)")
+    parser.add_argument("--increment", type=float, default=0.0, help="seconds added per move")
+    parser.add_argument("--bronstein", action="store_true",
+                        help="give back the time each move took, up to the increment, instead of adding it")
+    parser.add_argument("--uci", action="store_true",
+                        help="run the AI as a UCI engine on stdin/stdout instead of opening the board")
+    args = parser.parse_args(argv)
+
+    # The engine never loads pygame: it need not be installed, and its banner would corrupt the protocol
+    if args.uci:
+        from uci import UCIEngine
+        UCIEngine().run()
+        return 0
+
+    try:
+        import chess_gui
+    except ImportError as e:
+        parser.error(f"the board needs pygame ({e}); only --uci runs without it")
+
+    if args.simul or args.spectate:
+        options = {} if args.time_control is None else {"time_control": args.time_control}
+        view = chess_gui.SimulView(args.simul or args.spectate, spectate=bool(args.spectate), **options)
+        view.run()
+    else:
+        game = chess_gui.ChessGame(trace_path=args.trace, time_control=args.time_control or DEFAULT_TIME_CONTROL,
+                                   increment=args.increment,
+                                   increment_mode=BRONSTEIN if args.bronstein else FISCHER)
+        game.run()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,193 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+
+STAGES = ("events", "ai", "analysis", "update_timer", "draw_board", "draw_pieces", "draw_ui", "hud", "flip")
+TRACE_FLUSH_EVENTS = 2000  # Trace events buffered before they are appended to the file
+TRACE_THREADS = {"main": 1, "ai": 2}
+STAGE_SMOOTHING = 0.05  # Weight of the newest frame in the per-stage moving averages
+
+
+def percentile(samples, fraction):
+    """Nearest-rank percentile of an unsorted sequence"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class TraceWriter:
+    """Streams Chrome trace events (chrome://tracing, Perfetto) to a JSON array file"""
+
+    def __init__(self, path):
+        self.path = path
+        self.events = []
+        self.lock = threading.Lock()
+        self.origin = time.perf_counter()
+        self.file = open(path, "w")
+        self.file.write("[\n")
+        self.first = True
+        self.add({"name": "process_name", "ph": "M", "pid": os.getpid(), "tid": 0,
+                  "args": {"name": "Chess Game"}})
+        for name, tid in TRACE_THREADS.items():
+            self.add({"name": "thread_name", "ph": "M", "pid": os.getpid(), "tid": tid,
+                      "args": {"name": name}})
+
+    def timestamp(self, seconds):
+        """perf_counter seconds to trace microseconds"""
+        return round((seconds - self.origin) * 1e6, 1)
+
+    def add(self, event):
+        with self.lock:
+            self.events.append(event)
+            if len(self.events) >= TRACE_FLUSH_EVENTS:
+                self._flush()
+
+    def complete(self, name, start, end, thread="main", args=None):
+        """Record a finished span"""
+        event = {"name": name, "ph": "X", "pid": os.getpid(), "tid": TRACE_THREADS[thread],
+                 "ts": self.timestamp(start), "dur": round((end - start) * 1e6, 1)}
+        if args:
+            event["args"] = args
+        self.add(event)
+
+    def counter(self, name, when, values):
+        """Record counter values, drawn as a graph by the trace viewer"""
+        self.add({"name": name, "ph": "C", "pid": os.getpid(), "ts": self.timestamp(when), "args": values})
+
+    def _flush(self):
+        for event in self.events:
+            self.file.write(("" if self.first else ",\n") + json.dumps(event))
+            self.first = False
+        self.events = []
+        self.file.flush()
+
+    def close(self):
+        """Write the remaining events and terminate the array"""
+        with self.lock:
+            self._flush()
+            self.file.write("\n]\n")
+            self.file.close()
+
+
+class FrameProfiler:
+    """Per-frame stage timings, AI stats and input latency for the HUD and trace export"""
+
+    def __init__(self, history=240, trace_path=None):
+        self.show_hud = False
+        self.trace = TraceWriter(trace_path) if trace_path else None
+        self.enabled = self.trace is not None
+
+        self.frame_times = deque(maxlen=history)
+        self.stage_averages = dict.fromkeys(STAGES, 0.0)
+        self.frame_start = None
+        self.last_mark = None
+        self.stages = {}
+
+        self.input_time = None
+        self.input_latencies = deque(maxlen=32)
+        self.ai_start = None
+        self.ai_stats = None
+
+    def toggle_hud(self):
+        """Show or hide the overlay; instrumentation runs only while something consumes it"""
+        self.show_hud = not self.show_hud
+        self.enabled = self.show_hud or self.trace is not None
+
+        # Skip the rest of this frame rather than time half of it
+        self.frame_start = None
+        self.last_mark = None
+
+    def begin_frame(self):
+        """Start timing a frame"""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self.frame_start = now
+        self.last_mark = now
+        self.stages = {}
+
+    def mark(self, stage):
+        """Charge the time since the previous mark to stage"""
+        if not self.enabled or self.last_mark is None:
+            return
+        now = time.perf_counter()
+        self.stages[stage] = self.stages.get(stage, 0.0) + now - self.last_mark
+        if self.trace is not None:
+            self.trace.complete(stage, self.last_mark, now)
+        self.last_mark = now
+
+    def end_frame(self):
+        """Fold this frame's stages into the moving averages"""
+        if not self.enabled or self.last_mark is None:
+            return
+        # Frames are drawn on demand, so the time spent in one, not the gap between them, is what counts
+        self.frame_times.append(self.last_mark - self.frame_start)
+        for stage, average in self.stage_averages.items():
+            seconds = self.stages.get(stage, 0.0)
+            self.stage_averages[stage] = average + (seconds - average) * STAGE_SMOOTHING
+        if self.trace is not None:
+            self.trace.complete("frame", self.frame_start, self.last_mark)
+
+    def input_move(self):
+        """A human move was just made; latency runs until it reaches the screen"""
+        if self.enabled:
+            self.input_time = time.perf_counter()
+
+    def move_shown(self):
+        """The frame showing the last move has been flipped"""
+        if self.input_time is None:
+            return
+        now = time.perf_counter()
+        self.input_latencies.append(now - self.input_time)
+        if self.trace is not None:
+            self.trace.complete("input to screen", self.input_time, now)
+        self.input_time = None
+
+    def ai_started(self):
+        """An AI search was requested"""
+        if self.enabled:
+            self.ai_start = time.perf_counter()
+
+    def ai_finished(self, search):
+        """Record an AI move; search is the built-in engine's SearchResult, if it ran"""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        start = self.ai_start if self.ai_start is not None else now
+        self.ai_start = None
+        self.ai_stats = {"think": now - start}
+        if search is not None:
+            self.ai_stats.update(search=search.time, depth=search.depth, nodes=search.nodes, nps=search.nps)
+        if self.trace is not None:
+            self.trace.complete("ai move", start, now, thread="ai", args=self.ai_stats)
+            if search is not None:
+                self.trace.counter("search", now, {"depth": search.depth, "knps": search.nps / 1000})
+
+    def summary_lines(self):
+        """Text lines for the overlay"""
+        frames = list(self.frame_times)
+        lines = [
+            f"frame p50 {percentile(frames, 0.5) * 1000:5.1f} ms",
+            f"frame p95 {percentile(frames, 0.95) * 1000:5.1f} ms",
+            f"frame p99 {percentile(frames, 0.99) * 1000:5.1f} ms",
+        ]
+        for stage, average in self.stage_averages.items():
+            lines.append(f"{stage:12} {average * 1000:6.2f} ms")
+        if self.input_latencies:
+            lines.append(f"input  {self.input_latencies[-1] * 1000:6.1f} ms")
+        if self.ai_stats is not None:
+            stats = self.ai_stats
+            lines.append(f"AI think {stats['think']:.2f} s")
+            if "depth" in stats:
+                lines.append(f"depth {stats['depth']}  {stats['nps'] / 1000:.0f} knps")
+        return lines
+
+    def close(self):
+        """Finish the trace file"""
+        if self.trace is not None:
+            self.trace.close()
+            self.trace = None
+            self.enabled = self.show_hud
@@ -0,0 +1,80 @@
+from collections import OrderedDict
+
+import pygame
+
+
+class TextCache:
+    """Bounded LRU of rendered text surfaces keyed on (font, text, colour)"""
+
+    def __init__(self, size=256):
+        self.size = size
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font, text, color, antialias=True):
+        """Return the rendered surface for text, rasterizing it only on a miss"""
+        key = (font, text, color, antialias)
+        surface = self.entries.get(key)
+        if surface is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        self.entries[key] = surface
+        if len(self.entries) > self.size:
+            self.entries.popitem(last=False)
+        return surface
+
+    def hit_rate(self):
+        """Fraction of lookups served from the cache"""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def clear(self):
+        """Drop every cached surface"""
+        self.entries.clear()
+
+
+class SpriteAtlas:
+    """Every piece sprite scaled once to one square size and packed side by side in a single surface"""
+
+    def __init__(self, sources, square_size):
+        self.square_size = square_size
+        keys = sorted(sources)
+        self.surface = pygame.Surface((square_size * len(keys), square_size), pygame.SRCALPHA)
+        if pygame.display.get_surface():
+            self.surface = self.surface.convert_alpha()
+
+        # Scale straight into the atlas; the sprites are views into it
+        self.sprites = {}
+        for i, key in enumerate(keys):
+            cell = self.surface.subsurface((i * square_size, 0, square_size, square_size))
+            pygame.transform.smoothscale(sources[key], (square_size, square_size), cell)
+            self.sprites[key] = cell
+
+
+class AtlasCache:
+    """Bounded LRU of sprite atlases keyed on square size, so resizing back and forth costs nothing"""
+
+    def __init__(self, sources, size=4):
+        self.sources = sources
+        self.size = size
+        self.entries = OrderedDict()
+        self.builds = 0
+
+    def get(self, square_size):
+        """Return the atlas for square_size, building it on a miss"""
+        atlas = self.entries.get(square_size)
+        if atlas is not None:
+            self.entries.move_to_end(square_size)
+            return atlas
+
+        self.builds += 1
+        atlas = SpriteAtlas(self.sources, square_size)
+        self.entries[square_size] = atlas
+        if len(self.entries) > self.size:
+            self.entries.popitem(last=False)
+        return atlas
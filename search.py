@@ -0,0 +1,506 @@
+import math
+import time
+from collections import namedtuple
+
+import chess
+import chess.polyglot
+
+# Scores
+MATE_SCORE = 100000
+MATE_THRESHOLD = MATE_SCORE - 1000
+INFINITY = MATE_SCORE + 1
+MAX_PLY = 64
+
+# Nodes between checks of the time, node and stop limits, minus one. A node costs tens of
+# microseconds here, so checking every 64 keeps overruns to a few milliseconds for a
+# perf_counter call that is lost in the noise
+CHECK_MASK = 63
+
+# Fewest times longer than the last iteration the next one is assumed to take
+MIN_BRANCHING = 2.0
+
+# Transposition table entry flags
+EXACT = 0
+LOWER = 1
+UPPER = 2
+
+PIECE_VALUES = {
+    chess.PAWN: 100,
+    chess.KNIGHT: 320,
+    chess.BISHOP: 330,
+    chess.ROOK: 500,
+    chess.QUEEN: 900,
+    chess.KING: 0,
+}
+
+# Piece-square tables from White's point of view, written rank 8 first
+PAWN_TABLE = [
+    0, 0, 0, 0, 0, 0, 0, 0,
+    50, 50, 50, 50, 50, 50, 50, 50,
+    10, 10, 20, 30, 30, 20, 10, 10,
+    5, 5, 10, 25, 25, 10, 5, 5,
+    0, 0, 0, 20, 20, 0, 0, 0,
+    5, -5, -10, 0, 0, -10, -5, 5,
+    5, 10, 10, -20, -20, 10, 10, 5,
+    0, 0, 0, 0, 0, 0, 0, 0,
+]
+KNIGHT_TABLE = [
+    -50, -40, -30, -30, -30, -30, -40, -50,
+    -40, -20, 0, 0, 0, 0, -20, -40,
+    -30, 0, 10, 15, 15, 10, 0, -30,
+    -30, 5, 15, 20, 20, 15, 5, -30,
+    -30, 0, 15, 20, 20, 15, 0, -30,
+    -30, 5, 10, 15, 15, 10, 5, -30,
+    -40, -20, 0, 5, 5, 0, -20, -40,
+    -50, -40, -30, -30, -30, -30, -40, -50,
+]
+BISHOP_TABLE = [
+    -20, -10, -10, -10, -10, -10, -10, -20,
+    -10, 0, 0, 0, 0, 0, 0, -10,
+    -10, 0, 5, 10, 10, 5, 0, -10,
+    -10, 5, 5, 10, 10, 5, 5, -10,
+    -10, 0, 10, 10, 10, 10, 0, -10,
+    -10, 10, 10, 10, 10, 10, 10, -10,
+    -10, 5, 0, 0, 0, 0, 5, -10,
+    -20, -10, -10, -10, -10, -10, -10, -20,
+]
+ROOK_TABLE = [
+    0, 0, 0, 0, 0, 0, 0, 0,
+    5, 10, 10, 10, 10, 10, 10, 5,
+    -5, 0, 0, 0, 0, 0, 0, -5,
+    -5, 0, 0, 0, 0, 0, 0, -5,
+    -5, 0, 0, 0, 0, 0, 0, -5,
+    -5, 0, 0, 0, 0, 0, 0, -5,
+    -5, 0, 0, 0, 0, 0, 0, -5,
+    0, 0, 0, 5, 5, 0, 0, 0,
+]
+QUEEN_TABLE = [
+    -20, -10, -10, -5, -5, -10, -10, -20,
+    -10, 0, 0, 0, 0, 0, 0, -10,
+    -10, 0, 5, 5, 5, 5, 0, -10,
+    -5, 0, 5, 5, 5, 5, 0, -5,
+    0, 0, 5, 5, 5, 5, 0, -5,
+    -10, 5, 5, 5, 5, 5, 0, -10,
+    -10, 0, 5, 0, 0, 0, 0, -10,
+    -20, -10, -10, -5, -5, -10, -10, -20,
+]
+KING_TABLE = [
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -20, -30, -30, -40, -40, -30, -30, -20,
+    -10, -20, -20, -20, -20, -20, -20, -10,
+    20, 20, 0, 0, 0, 0, 20, 20,
+    20, 30, 10, 0, 0, 10, 30, 20,
+]
+KING_END_TABLE = [
+    -50, -40, -30, -20, -20, -30, -40, -50,
+    -30, -20, -10, 0, 0, -10, -20, -30,
+    -30, -10, 20, 30, 30, 20, -10, -30,
+    -30, -10, 30, 40, 40, 30, -10, -30,
+    -30, -10, 30, 40, 40, 30, -10, -30,
+    -30, -10, 20, 30, 30, 20, -10, -30,
+    -30, -30, 0, 0, 0, 0, -30, -30,
+    -50, -30, -30, -30, -30, -30, -30, -50,
+]
+
+PIECE_TABLES = {
+    chess.PAWN: PAWN_TABLE,
+    chess.KNIGHT: KNIGHT_TABLE,
+    chess.BISHOP: BISHOP_TABLE,
+    chess.ROOK: ROOK_TABLE,
+    chess.QUEEN: QUEEN_TABLE,
+    chess.KING: KING_TABLE,
+}
+
+SearchResult = namedtuple("SearchResult", "move score depth nodes time nps pv")
+
+
+class SearchAborted(Exception):
+    """Raised inside the search when the time or node budget runs out"""
+
+
+def is_endgame(board):
+    """Rough endgame test: no queens, or little material besides them"""
+    queens = board.queens
+    if not queens:
+        return True
+    minors_and_rooks = board.knights | board.bishops | board.rooks
+    return chess.popcount(minors_and_rooks) <= 2
+
+
+def evaluate(board):
+    """Static evaluation in centipawns from the side to move's point of view"""
+    score = 0
+    endgame = is_endgame(board)
+
+    for piece_type in chess.PIECE_TYPES:
+        value = PIECE_VALUES[piece_type]
+        table = KING_END_TABLE if piece_type == chess.KING and endgame else PIECE_TABLES[piece_type]
+
+        # Tables are written rank 8 first, so White squares are flipped
+        for square in chess.scan_forward(board.pieces_mask(piece_type, chess.WHITE)):
+            score += value + table[square ^ 56]
+        for square in chess.scan_forward(board.pieces_mask(piece_type, chess.BLACK)):
+            score -= value + table[square]
+
+    return score if board.turn == chess.WHITE else -score
+
+
+def mvv_lva(board, move):
+    """Most valuable victim / least valuable attacker capture score"""
+    victim = board.piece_type_at(move.to_square)
+    if victim is None:
+        # En passant
+        victim = chess.PAWN
+    attacker = board.piece_type_at(move.from_square)
+    return PIECE_VALUES[victim] * 10 - PIECE_VALUES[attacker] // 10
+
+
+class TranspositionTable:
+    """Fixed-size hash table keyed by the Polyglot Zobrist hash"""
+
+    def __init__(self, size=1 << 18):
+        self.size = size
+        self.clear()
+
+    def clear(self):
+        """Drop every entry"""
+        self.table = [None] * self.size
+        self.generation = 0
+
+    def new_search(self):
+        """Age existing entries so the next search can overwrite them first"""
+        self.generation = (self.generation + 1) & 0xFF
+
+    def get(self, key):
+        """Return (depth, flag, score, move) for key, or None"""
+        entry = self.table[key % self.size]
+        if entry is not None and entry[0] == key:
+            return entry[1:5]
+        return None
+
+    def store(self, key, depth, flag, score, move):
+        """Store an entry using a depth-preferred, age-aware replacement scheme"""
+        index = key % self.size
+        entry = self.table[index]
+        if (entry is None or entry[0] == key or entry[5] != self.generation
+                or depth >= entry[1]):
+            # Keep the old best move if this search found none
+            if move is None and entry is not None and entry[0] == key:
+                move = entry[4]
+            self.table[index] = (key, depth, flag, score, move, self.generation)
+
+
+class Searcher:
+    """Negamax alpha-beta search with iterative deepening and quiescence"""
+
+    def __init__(self, tt_size=1 << 18):
+        self.tt = TranspositionTable(tt_size)
+        self.history = [[0] * 4096, [0] * 4096]
+        self.killers = [[None, None] for _ in range(MAX_PLY + 1)]
+        self.nodes = 0
+        self.deadline = None
+        self.soft_deadline = None  # Armed once a depth is complete, so a move is always found
+        self.max_nodes = None
+        self.stop_event = None
+        self.root_best = None
+        self.root_hint = None
+        self.root_scores = None
+
+        # Root moves are ordered by a batched static evaluation when NumPy is installed
+        try:
+            from batch_eval import evaluate_moves
+        except ImportError:
+            evaluate_moves = None
+        self.evaluate_moves = evaluate_moves
+
+    def clear(self):
+        """Forget the hash table and move-ordering statistics, e.g. before a new game"""
+        self.tt.clear()
+        self.history = [[0] * 4096, [0] * 4096]
+        self.killers = [[None, None] for _ in range(MAX_PLY + 1)]
+
+    def resize(self, tt_size):
+        """Replace the hash table with an empty one of tt_size entries"""
+        self.tt = TranspositionTable(tt_size)
+
+    def search(self, board, max_time=None, max_nodes=None, max_depth=MAX_PLY, soft_time=None,
+               stop_event=None, on_iteration=None):
+        """Search board within the given budget; on_iteration gets each completed depth's SearchResult"""
+        board = board.copy()
+        root_ply = len(board.move_stack)
+        start = time.perf_counter()
+        self.nodes = 0
+        self.deadline = start + max_time if max_time is not None else None
+        self.max_nodes = max_nodes
+        self.stop_event = stop_event
+
+        # max_time is a hard deadline; no new iteration starts after soft_time, and the
+        # running one stops there once it has a result for its first root move
+        if soft_time is None and max_time is not None:
+            soft_time = max_time * 0.5
+        self.soft_deadline = None
+        self.tt.new_search()
+        self.killers = [[None, None] for _ in range(MAX_PLY + 1)]
+        for table in self.history:
+            for i in range(4096):
+                table[i] >>= 1
+
+        legal_moves = list(board.legal_moves)
+        if not legal_moves:
+            return SearchResult(None, 0, 0, 0, 0.0, 0, [])
+
+        best_move = legal_moves[0]
+        best_score = 0
+        completed_depth = 0
+
+        # Score every root move's resulting position in one call
+        self.root_scores = None
+        if self.evaluate_moves is not None and len(legal_moves) > 1:
+            self.root_scores = dict(zip(legal_moves, self.evaluate_moves(board, legal_moves).tolist()))
+
+        # A forced move needs no search
+        if len(legal_moves) == 1:
+            max_depth = 1
+
+        iteration_nodes = []
+        for depth in range(1, max_depth + 1):
+            self.root_best = None
+            self.root_hint = best_move if completed_depth else None
+            iteration_start = time.perf_counter()
+            nodes_before = self.nodes
+            try:
+                score = self._negamax(board, depth, -INFINITY, INFINITY, 0)
+            except SearchAborted:
+                # Unwind the moves left on the board by the aborted search
+                while len(board.move_stack) > root_ply:
+                    board.pop()
+                # Keep a better root move found before the budget ran out
+                if self.root_best is not None:
+                    best_move, best_score = self.root_best
+                break
+
+            best_move, best_score = self.root_best
+            completed_depth = depth
+            if soft_time is not None:
+                self.soft_deadline = start + soft_time
+            now = time.perf_counter()
+            elapsed = now - start
+            if on_iteration is not None:
+                pv = self._principal_variation(board, best_move, depth)
+                on_iteration(SearchResult(best_move, best_score, depth, self.nodes, elapsed,
+                                          int(self.nodes / elapsed) if elapsed > 0 else 0, pv))
+
+            # Stop early on a found mate or if the next iteration cannot finish
+            if abs(score) >= MATE_THRESHOLD:
+                break
+            if soft_time is not None and elapsed > soft_time:
+                break
+
+            # Don't start an iteration that would end past soft_time. Its cost is the last one's times
+            # the branching factor, measured over two plies since odd and even depths alternate
+            # between cheap and dear; the first few iterations are too small to measure it
+            iteration_nodes.append(self.nodes - nodes_before)
+            branching = MIN_BRANCHING
+            if depth >= 4 and iteration_nodes[-3]:
+                branching = max(math.sqrt(iteration_nodes[-1] / iteration_nodes[-3]), MIN_BRANCHING)
+            if soft_time is not None and elapsed + (now - iteration_start) * branching > soft_time:
+                break
+
+        elapsed = time.perf_counter() - start
+        nps = int(self.nodes / elapsed) if elapsed > 0 else 0
+        pv = self._principal_variation(board, best_move, completed_depth)
+        return SearchResult(best_move, best_score, completed_depth, self.nodes, elapsed, nps, pv)
+
+    def _check_limits(self):
+        """Abort the search once the time or node budget is spent"""
+        if self.max_nodes is not None and self.nodes >= self.max_nodes:
+            raise SearchAborted()
+        now = time.perf_counter()
+        if self.deadline is not None and now >= self.deadline:
+            raise SearchAborted()
+        # Past soft time, give up on the iteration unless its first root move is still unscored
+        if self.soft_deadline is not None and now >= self.soft_deadline and self.root_best is not None:
+            raise SearchAborted()
+        if self.stop_event is not None and self.stop_event.is_set():
+            raise SearchAborted()
+
+    def _order_moves(self, board, moves, tt_move, ply):
+        """Sort moves: hash move, captures by MVV-LVA, killers, then history"""
+        killers = self.killers[ply]
+        history = self.history[board.turn]
+        scored = []
+        for move in moves:
+            if move == tt_move:
+                score = 10000000
+            elif board.is_capture(move):
+                score = 1000000 + mvv_lva(board, move)
+            elif move.promotion:
+                score = 900000 + PIECE_VALUES[move.promotion]
+            elif move == killers[0]:
+                score = 800000
+            elif move == killers[1]:
+                score = 700000
+            elif ply == 0 and self.root_scores is not None:
+                score = self.root_scores[move]
+            else:
+                score = history[move.from_square * 64 + move.to_square]
+            scored.append((score, move))
+        scored.sort(key=lambda item: item[0], reverse=True)
+        return [move for _, move in scored]
+
+    def _negamax(self, board, depth, alpha, beta, ply):
+        """Alpha-beta search returning a score from the side to move's view"""
+        self.nodes += 1
+        if self.nodes & CHECK_MASK == 0:
+            self._check_limits()
+
+        if ply > 0:
+            if board.halfmove_clock >= 100 or board.is_insufficient_material():
+                return 0
+            if board.halfmove_clock >= 4 and board.is_repetition(2):
+                return 0
+
+        in_check = board.is_check()
+        if in_check:
+            depth += 1
+        if depth <= 0 or ply >= MAX_PLY:
+            return self._quiesce(board, alpha, beta, ply)
+
+        key = chess.polyglot.zobrist_hash(board)
+        alpha_orig = alpha
+        tt_move = None
+        entry = self.tt.get(key)
+        if entry is not None:
+            tt_depth, tt_flag, tt_score, tt_move = entry
+            if ply > 0 and tt_depth >= depth:
+                tt_score = _score_from_tt(tt_score, ply)
+                if tt_flag == EXACT:
+                    return tt_score
+                if tt_flag == LOWER:
+                    alpha = max(alpha, tt_score)
+                elif tt_flag == UPPER:
+                    beta = min(beta, tt_score)
+                if alpha >= beta:
+                    return tt_score
+
+        moves = list(board.legal_moves)
+        if not moves:
+            return -MATE_SCORE + ply if in_check else 0
+
+        # Always try the previous iteration's best move first at the root
+        if ply == 0 and self.root_hint is not None:
+            tt_move = self.root_hint
+
+        best_score = -INFINITY
+        best_move = None
+        for move in self._order_moves(board, moves, tt_move, ply):
+            quiet = not board.is_capture(move) and not move.promotion
+            board.push(move)
+            score = -self._negamax(board, depth - 1, -beta, -alpha, ply + 1)
+            board.pop()
+
+            if score > best_score:
+                best_score = score
+                best_move = move
+                if ply == 0:
+                    self.root_best = (move, score)
+            if score > alpha:
+                alpha = score
+            if alpha >= beta:
+                if quiet:
+                    killers = self.killers[ply]
+                    if killers[0] != move:
+                        killers[1] = killers[0]
+                        killers[0] = move
+                    self.history[board.turn][move.from_square * 64 + move.to_square] += depth * depth
+                break
+
+        if best_score <= alpha_orig:
+            flag = UPPER
+        elif best_score >= beta:
+            flag = LOWER
+        else:
+            flag = EXACT
+        self.tt.store(key, depth, flag, _score_to_tt(best_score, ply), best_move)
+        return best_score
+
+    def _quiesce(self, board, alpha, beta, ply):
+        """Search captures only, so the static evaluation is not taken mid-exchange"""
+        self.nodes += 1
+        if self.nodes & CHECK_MASK == 0:
+            self._check_limits()
+
+        in_check = board.is_check()
+        if in_check:
+            moves = list(board.legal_moves)
+            if not moves:
+                return -MATE_SCORE + ply
+        else:
+            stand_pat = evaluate(board)
+            if stand_pat >= beta or ply >= MAX_PLY:
+                return stand_pat
+            if stand_pat > alpha:
+                alpha = stand_pat
+            moves = list(board.generate_legal_captures())
+            if not moves:
+                return stand_pat
+
+        if in_check:
+            ordered = self._order_moves(board, moves, None, min(ply, MAX_PLY))
+        else:
+            ordered = sorted(moves, key=lambda move: mvv_lva(board, move), reverse=True)
+
+        best_score = alpha if not in_check else -INFINITY
+        for move in ordered:
+            board.push(move)
+            score = -self._quiesce(board, -beta, -alpha, ply + 1)
+            board.pop()
+
+            if score > best_score:
+                best_score = score
+            if score > alpha:
+                alpha = score
+                if alpha >= beta:
+                    break
+        return best_score
+
+    def _principal_variation(self, board, first_move, depth):
+        """Follow hash moves from the root to rebuild the principal variation"""
+        if first_move is None:
+            return []
+        pv = [first_move]
+        board = board.copy(stack=False)
+        board.push(first_move)
+        seen = {chess.polyglot.zobrist_hash(board)}
+        while len(pv) < max(depth, 1):
+            entry = self.tt.get(chess.polyglot.zobrist_hash(board))
+            if entry is None or entry[3] is None or not board.is_legal(entry[3]):
+                break
+            board.push(entry[3])
+            key = chess.polyglot.zobrist_hash(board)
+            if key in seen:
+                break
+            seen.add(key)
+            pv.append(entry[3])
+        return pv
+
+
+def _score_to_tt(score, ply):
+    """Store mate scores relative to the node rather than the root"""
+    if score >= MATE_THRESHOLD:
+        return score + ply
+    if score <= -MATE_THRESHOLD:
+        return score - ply
+    return score
+
+
+def _score_from_tt(score, ply):
+    """Convert a stored mate score back to the current root distance"""
+    if score >= MATE_THRESHOLD:
+        return score - ply
+    if score <= -MATE_THRESHOLD:
+        return score + ply
+    return score
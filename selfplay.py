@@ -0,0 +1,224 @@
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import chess
+import chess.pgn
+
+from game_core import BRONSTEIN, DEFAULT_TIME_CONTROL, FISCHER, GameCore, ManualClock
+from opening_book import DEFAULT_MAX_PLY, OpeningBook
+from tablebase import Tablebase
+
+# Used when no openings file is given
+DEFAULT_OPENINGS = [
+    "",
+    "e2e4 e7e5",
+    "e2e4 c7c5",
+    "e2e4 e7e6",
+    "e2e4 c7c6",
+    "d2d4 d7d5",
+    "d2d4 g8f6 c2c4 e7e6",
+    "c2c4 e7e5",
+    "g1f3 d7d5",
+]
+MAX_PLIES = 400  # Adjudicate long games as draws
+
+
+def load_openings(path):
+    """Read openings, one per line, as a FEN or a list of UCI/SAN moves"""
+    openings = []
+    with open(path) as f:
+        for line in f:
+            line = line.split("#", 1)[0].strip()
+            if line:
+                openings.append(line)
+    return openings
+
+
+def opening_board(opening):
+    """Build the starting board for an opening line"""
+    if "/" in opening:
+        return chess.Board(opening)
+    board = chess.Board()
+    for token in opening.split():
+        try:
+            board.push_uci(token)
+        except ValueError:
+            board.push_san(token)
+    return board
+
+
+def termination(core, plies):
+    """Describe why a finished game ended"""
+    if core.white_time <= 0 or core.black_time <= 0:
+        return "time forfeit"
+    if core.status.reason:
+        return core.status.reason
+    if plies >= MAX_PLIES:
+        return "move limit"
+    return "unterminated"
+
+
+def result_string(winner):
+    """Map GameCore.winner to a PGN result"""
+    if winner == "White":
+        return "1-0"
+    if winner == "Black":
+        return "0-1"
+    if winner == "Draw":
+        return "1/2-1/2"
+    return "*"
+
+
+def play_game(index, opening, time_control, think_time, max_nodes, seed, book_path=None,
+              book_depth=DEFAULT_MAX_PLY, syzygy_path=None, increment=0.0, collect_positions=False,
+              increment_mode=FISCHER):
+    """Play one AI-vs-AI game headlessly and return its PGN, summary and, if asked, its positions"""
+    random.seed(seed)
+    clock = ManualClock()
+    book = OpeningBook(book_path, max_ply=book_depth, seed=seed) if book_path else None
+    tablebase = Tablebase(syzygy_path) if syzygy_path else None
+    core = GameCore(time_control=time_control, time_source=clock,
+                    ai_think_time=think_time, ai_max_nodes=max_nodes, book=book,
+                    tablebase=tablebase, increment=increment, increment_mode=increment_mode)
+    core.set_position(opening_board(opening))
+
+    move_times = []
+    positions = [] if collect_positions else None
+    plies = 0
+    started = time.perf_counter()
+    while not core.game_over and plies < MAX_PLIES:
+        if positions is not None:
+            from batch_eval import board_row
+            positions.append((board_row(core.board), core.board.turn))
+        think_start = time.perf_counter()
+        move = core.choose_ai_move()
+        elapsed = time.perf_counter() - think_start
+        move_times.append(round(elapsed, 4))
+
+        # Charge the thinking time to the side to move, flagging it if needed
+        clock.advance(elapsed)
+        core.update_timer()
+        if core.game_over or move is None:
+            break
+        core.make_move(move)
+        plies += 1
+
+    if not core.game_over:
+        core.winner = "Draw"
+    result = result_string(core.winner)
+    reason = termination(core, plies)
+
+    game = chess.pgn.Game.from_board(core.board)
+    game.headers["Event"] = "Self-play"
+    game.headers["Round"] = str(index + 1)
+    game.headers["White"] = "ChessGame AI"
+    game.headers["Black"] = "ChessGame AI"
+    game.headers["Result"] = result
+    game.headers["TimeControl"] = f"{time_control:g}+{increment:g}" if increment else f"{time_control:g}"
+    game.headers["Termination"] = reason
+
+    summary = {
+        "game": index,
+        "opening": opening,
+        "result": result,
+        "termination": reason,
+        "plies": plies,
+        "white_time": round(core.white_time, 3),
+        "black_time": round(core.black_time, 3),
+        "duration": round(time.perf_counter() - started, 3),
+        "move_times": move_times,
+    }
+    if book is not None:
+        summary["book"] = book.stats()
+    core.shutdown()
+    return str(game), summary, positions
+
+
+def save_dataset(path, games):
+    """Write (positions, result) pairs as bitboards, side to move, static evals and game results"""
+    import numpy as np
+    from batch_eval import evaluate_encoded, split_rows
+
+    rows = [row for positions, _ in games for row, _ in positions]
+    turns = np.array([turn for positions, _ in games for _, turn in positions], dtype=bool)
+    # Results are from the side to move's point of view: 1 win, 0 draw, -1 loss
+    outcomes = {"1-0": 1, "0-1": -1}
+    results = np.array([outcomes.get(result, 0) if turn else -outcomes.get(result, 0)
+                        for positions, result in games for _, turn in positions], dtype=np.int8)
+    bitboards = split_rows(rows) if rows else np.zeros((0, 12), dtype=np.uint64)
+    np.savez_compressed(path, bitboards=bitboards, turns=turns,
+                        evals=evaluate_encoded(bitboards, turns), results=results)
+    return len(rows)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Play AI-vs-AI games in parallel")
+    parser.add_argument("-n", "--games", type=int, default=10, help="number of games")
+    parser.add_argument("-j", "--workers", type=int, default=os.cpu_count(), help="worker processes")
+    parser.add_argument("--time-control", type=float, default=DEFAULT_TIME_CONTROL,
+                        help="seconds per side")
+    parser.add_argument("--increment", type=float, default=0.0, help="seconds added per move")
+    parser.add_argument("--bronstein", action="store_true",
+                        help="give back the time each move took, up to the increment, instead of adding it")
+    parser.add_argument("--think-time", type=float, default=None,
+                        help="maximum seconds per move (default: budget from the clock)")
+    parser.add_argument("--nodes", type=int, default=None, help="node budget per move")
+    parser.add_argument("--openings", help="file with one FEN or move list per line")
+    parser.add_argument("--seed", type=int, default=0, help="seed for opening choice")
+    parser.add_argument("--book", help="Polyglot opening book (.bin)")
+    parser.add_argument("--book-depth", type=int, default=DEFAULT_MAX_PLY,
+                        help="maximum ply to play book moves")
+    parser.add_argument("--syzygy", help="directory with Syzygy tablebase files")
+    parser.add_argument("--pgn", default="selfplay.pgn", help="PGN output file")
+    parser.add_argument("--jsonl", default="selfplay.jsonl", help="JSONL summary output file")
+    parser.add_argument("--dataset", help="NumPy .npz file of every position with its eval and result")
+    args = parser.parse_args(argv)
+
+    if args.dataset:
+        try:
+            import numpy  # noqa: F401
+        except ImportError:
+            parser.error("--dataset needs NumPy installed")
+
+    openings = load_openings(args.openings) if args.openings else DEFAULT_OPENINGS
+    rng = random.Random(args.seed)
+    scores = {"1-0": 0, "0-1": 0, "1/2-1/2": 0, "*": 0}
+    dataset = []
+
+    with open(args.pgn, "w") as pgn_file, open(args.jsonl, "w") as jsonl_file, \
+            ProcessPoolExecutor(max_workers=args.workers) as pool:
+        futures = [
+            pool.submit(play_game, i, rng.choice(openings), args.time_control,
+                        args.think_time, args.nodes, args.seed + i, args.book, args.book_depth,
+                        args.syzygy, args.increment, args.dataset is not None,
+                        BRONSTEIN if args.bronstein else FISCHER)
+            for i in range(args.games)
+        ]
+
+        # Stream games to disk in the order they finish
+        for future in as_completed(futures):
+            pgn, summary, positions = future.result()
+            if positions is not None:
+                dataset.append((positions, summary["result"]))
+            pgn_file.write(pgn + "\n\n")
+            pgn_file.flush()
+            jsonl_file.write(json.dumps(summary) + "\n")
+            jsonl_file.flush()
+            scores[summary["result"]] += 1
+            print(f"Game {summary['game'] + 1}: {summary['result']} ({summary['termination']}, "
+                  f"{summary['plies']} plies)")
+
+    print(f"White {scores['1-0']}, Black {scores['0-1']}, Draw {scores['1/2-1/2']}")
+    if args.dataset:
+        count = save_dataset(args.dataset, dataset)
+        print(f"Saved {count} positions to {args.dataset}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
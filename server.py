@@ -0,0 +1,354 @@
+import argparse
+import asyncio
+import json
+import math
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import chess
+
+from game_core import BRONSTEIN, DEFAULT_TIME_CONTROL, FISCHER, GameCore
+from move_index import MoveIndexCache
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+MODES = ("ai", "human", "hotseat")
+INCREMENT_MODES = (FISCHER, BRONSTEIN)
+
+# One headless core per worker process, so its search tables survive between moves
+_worker_core = None
+
+
+def _init_worker(think_time):
+    global _worker_core
+    _worker_core = GameCore(ai_think_time=think_time)
+
+
+def search_move(root_fen, moves, remaining, increment):
+    """Process-pool entry point: pick the AI move for a position given as FEN plus UCI moves"""
+    board = chess.Board(root_fen)
+    for uci in moves:
+        board.push_uci(uci)
+    _worker_core.increment = increment
+    move = _worker_core.choose_ai_move(board, remaining)
+    return move.uci() if move is not None else None
+
+
+class GameSession:
+    """One hosted game: the headless core plus its players, watchers and flag timer"""
+
+    def __init__(self, game_id, core, mode):
+        self.id = game_id
+        self.core = core
+        self.mode = mode
+        self.players = {}  # color -> writer
+        self.watchers = set()
+        self.flag_timer = None
+        self.ai_task = None
+
+    @property
+    def ai_color(self):
+        """The side the server's AI plays, if any"""
+        return chess.BLACK if self.mode == "ai" else None
+
+    def state(self):
+        """Snapshot of the game for clients"""
+        core = self.core
+        return {
+            "game": self.id,
+            "mode": self.mode,
+            "fen": core.board.fen(),
+            "turn": "white" if core.board.turn == chess.WHITE else "black",
+            "white_time": round(core.white_time, 3),
+            "black_time": round(core.black_time, 3),
+            "game_over": core.game_over,
+            "winner": core.winner,
+        }
+
+
+class GameServer:
+    """Hosts many concurrent headless games over newline-delimited JSON on TCP"""
+
+    def __init__(self, ai_workers=None, ai_think_time=1.0):
+        self.games = {}
+        self.next_id = 1
+        # Spawned, not forked, so workers never inherit open client sockets
+        self.ai_pool = ProcessPoolExecutor(max_workers=ai_workers,
+                                           mp_context=multiprocessing.get_context("spawn"),
+                                           initializer=_init_worker, initargs=(ai_think_time,))
+        self.moves_played = 0
+
+    async def start(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        """Start listening and return the asyncio server"""
+        return await asyncio.start_server(self.handle_client, host, port)
+
+    def close(self):
+        """Cancel every timer and AI task and stop the process pool"""
+        for session in list(self.games.values()):
+            self.drop_game(session)
+        self.ai_pool.shutdown(wait=False, cancel_futures=True)
+
+    # Networking
+
+    def send(self, writer, message):
+        """Queue one JSON message to a client"""
+        if not writer.is_closing():
+            writer.write((json.dumps(message) + "\n").encode("utf-8"))
+
+    def broadcast(self, session, message, sender=None, request_id=None):
+        """Send message to everyone in the game, tagging the sender's copy with its request id"""
+        for writer in set(session.players.values()) | session.watchers:
+            if writer is sender and request_id is not None:
+                self.send(writer, dict(message, id=request_id))
+            else:
+                self.send(writer, message)
+
+    async def handle_client(self, reader, writer):
+        """Serve one connection until it closes"""
+        joined = set()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                except ValueError:
+                    self.send(writer, {"event": "error", "error": "invalid JSON"})
+                    continue
+                if not isinstance(request, dict):
+                    self.send(writer, {"event": "error", "error": "request must be a JSON object"})
+                    continue
+                session = self.dispatch(request, writer)
+                if session is not None:
+                    joined.add(session)
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            for session in joined:
+                self.leave(session, writer)
+            writer.close()
+
+    def dispatch(self, request, writer):
+        """Handle one request; returns the game the client joined, if any"""
+        command = request.get("cmd")
+        request_id = request.get("id")
+
+        def error(text):
+            self.send(writer, {"event": "error", "error": text, "id": request_id})
+
+        if command == "new":
+            mode = request.get("mode", "ai")
+            if mode not in MODES:
+                error(f"mode must be one of {', '.join(MODES)}")
+                return None
+            try:
+                time_control = float(request.get("time", DEFAULT_TIME_CONTROL))
+                increment = float(request.get("increment", 0.0))
+            except (TypeError, ValueError):
+                error("time and increment must be numbers")
+                return None
+            if not (math.isfinite(time_control) and time_control > 0):
+                error("time must be a positive number of seconds")
+                return None
+            if not (math.isfinite(increment) and increment >= 0):
+                error("increment must not be negative")
+                return None
+            increment_mode = request.get("increment_mode", FISCHER)
+            if increment_mode not in INCREMENT_MODES:
+                error(f"increment_mode must be one of {', '.join(INCREMENT_MODES)}")
+                return None
+            session = self.create_game(mode, time_control, increment, increment_mode)
+            session.players[chess.WHITE] = writer
+            if mode == "hotseat":
+                session.players[chess.BLACK] = writer
+            self.send(writer, dict(session.state(), event="created", color="white", id=request_id))
+            return session
+
+        game_id = request.get("game")
+        if not isinstance(game_id, int) or isinstance(game_id, bool):
+            error("game must be an integer id")
+            return None
+        session = self.games.get(game_id)
+        if session is None:
+            error("unknown game")
+            return None
+
+        if command == "join":
+            if session.mode != "human" or chess.BLACK in session.players:
+                error("game is full")
+                return None
+            session.players[chess.BLACK] = writer
+            self.broadcast(session, dict(session.state(), event="joined", color="black"), writer, request_id)
+            return session
+        if command == "watch":
+            session.watchers.add(writer)
+            self.send(writer, dict(session.state(), event="state", id=request_id))
+            return session
+        if command == "state":
+            session.core.update_timer()
+            self.send(writer, dict(session.state(), event="state", id=request_id))
+            return None
+        if command == "move":
+            self.play_human_move(session, request.get("move", ""), writer, request_id)
+            return None
+
+        error(f"unknown command {command!r}")
+        return None
+
+    # Games
+
+    def create_game(self, mode, time_control, increment, increment_mode=FISCHER):
+        """Create a game whose clocks run on the event loop's monotonic time"""
+        loop = asyncio.get_running_loop()
+        core = GameCore(time_control=time_control, increment=increment, ai_enabled=False,
+                        time_source=loop.time, increment_mode=increment_mode)
+        core.move_cache = MoveIndexCache(size=4)
+        session = GameSession(self.next_id, core, mode)
+        self.games[session.id] = session
+        self.next_id += 1
+        return session
+
+    def drop_game(self, session):
+        """Forget a game and cancel its timers"""
+        if session.flag_timer is not None:
+            session.flag_timer.cancel()
+        if session.ai_task is not None:
+            session.ai_task.cancel()
+        self.games.pop(session.id, None)
+
+    def leave(self, session, writer):
+        """Remove a disconnected client, dropping the game once nobody is left"""
+        session.watchers.discard(writer)
+        for color, player in list(session.players.items()):
+            if player is writer:
+                del session.players[color]
+        if not session.players and not session.watchers:
+            self.drop_game(session)
+
+    def play_human_move(self, session, uci, writer, request_id):
+        """Validate and play a move sent by a client"""
+        core = session.core
+
+        def error(text):
+            self.send(writer, {"event": "error", "error": text, "game": session.id, "id": request_id})
+
+        if core.game_over:
+            error("game is over")
+            return
+        if session.players.get(core.board.turn) is not writer:
+            error("not your turn")
+            return
+        if not isinstance(uci, str):
+            error("move must be a UCI string")
+            return
+        try:
+            move = chess.Move.from_uci(uci)
+        except ValueError:
+            error("invalid move")
+            return
+        if move not in core.legal_move_index():
+            error("illegal move")
+            return
+
+        self.apply_move(session, move, writer, request_id)
+
+    def apply_move(self, session, move, sender=None, request_id=None):
+        """Charge the clock, play the move and tell everyone"""
+        core = session.core
+        core.update_timer()
+        if core.game_over:
+            self.finish(session)
+            return
+
+        core.make_move(move)
+        self.moves_played += 1
+        message = dict(session.state(), event="move", move=move.uci())
+        self.broadcast(session, message, sender, request_id)
+
+        if core.game_over:
+            self.finish(session)
+            return
+        self.schedule_flag(session)
+        if core.board.turn == session.ai_color:
+            session.ai_task = asyncio.ensure_future(self.play_ai_move(session))
+
+    def schedule_flag(self, session):
+        """Wake up exactly when the side to move would run out of time"""
+        if session.flag_timer is not None:
+            session.flag_timer.cancel()
+            session.flag_timer = None
+        deadline = session.core.flag_deadline()
+        if deadline is None:
+            return
+        loop = asyncio.get_running_loop()
+        session.flag_timer = loop.call_at(deadline + 0.001, self.check_flag, session)
+
+    def check_flag(self, session):
+        """Flag-fall timer callback"""
+        session.flag_timer = None
+        session.core.update_timer()
+        if session.core.game_over:
+            self.finish(session)
+        else:
+            self.schedule_flag(session)
+
+    def finish(self, session):
+        """Announce the result and stop the clocks"""
+        if session.flag_timer is not None:
+            session.flag_timer.cancel()
+            session.flag_timer = None
+        core = session.core
+        reason = core.status.reason
+        if core.white_time <= 0 or core.black_time <= 0:
+            reason = "time forfeit"
+        self.broadcast(session, dict(session.state(), event="game_over", reason=reason))
+
+    async def play_ai_move(self, session):
+        """Search in the process pool and play the result if the game has not moved on"""
+        core = session.core
+        board = core.board
+        ply = len(board.move_stack)
+        remaining = core.white_time if board.turn == chess.WHITE else core.black_time
+        moves = [move.uci() for move in board.move_stack]
+
+        loop = asyncio.get_running_loop()
+        uci = await loop.run_in_executor(self.ai_pool, search_move, board.root().fen(), moves,
+                                         remaining, core.increment)
+        session.ai_task = None
+        if uci is None or core.game_over or len(core.board.move_stack) != ply:
+            return
+        self.apply_move(session, chess.Move.from_uci(uci))
+
+
+async def serve(host, port, ai_workers, ai_think_time):
+    game_server = GameServer(ai_workers, ai_think_time)
+    server = await game_server.start(host, port)
+    print(f"Serving chess games on {host}:{port}")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        game_server.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Host many concurrent chess games over TCP")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--ai-workers", type=int, default=os.cpu_count(), help="AI search processes")
+    parser.add_argument("--think-time", type=float, default=1.0, help="maximum AI seconds per move")
+    args = parser.parse_args(argv)
+
+    try:
+        asyncio.run(serve(args.host, args.port, args.ai_workers, args.think_time))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
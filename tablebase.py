@@ -0,0 +1,135 @@
+import os
+import threading
+from collections import OrderedDict
+
+import chess
+import chess.polyglot
+import chess.syzygy
+
+DEFAULT_SYZYGY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "syzygy")
+
+
+class Tablebase:
+    """Syzygy WDL/DTZ probing with tables kept open and a bounded result cache"""
+
+    def __init__(self, path=None, cache_size=4096, max_fds=128):
+        self.path = path or os.environ.get("SYZYGY_PATH") or DEFAULT_SYZYGY_PATH
+        self.cache_size = cache_size
+        self.max_fds = max_fds  # Bounds the number of tables mapped at once
+        self.tables = None
+        self.max_pieces = 0
+        self.cache = OrderedDict()
+        self.lock = threading.Lock()  # Probed from both the AI worker and the UI thread
+        self._opened = False
+
+        # Statistics
+        self.probes = 0
+        self.cache_hits = 0
+
+    def open(self):
+        """Open every table in the directory once; missing tables just disable probing"""
+        self._opened = True
+        if not os.path.isdir(self.path):
+            return False
+        try:
+            tables = chess.syzygy.open_tablebase(self.path, max_fds=self.max_fds)
+        except OSError as e:
+            print(f"Could not open Syzygy tables in {self.path}: {e}")
+            return False
+
+        max_pieces = tables.largest_wdl()
+        if not max_pieces:
+            tables.close()
+            return False
+        self.tables = tables
+        self.max_pieces = max_pieces
+        return True
+
+    @property
+    def available(self):
+        """True if at least one table was found"""
+        if not self._opened:
+            self.open()
+        return self.tables is not None
+
+    def covers(self, board):
+        """True if the position has few enough pieces to be in the tables"""
+        return (self.available and not board.castling_rights
+                and chess.popcount(board.occupied) <= self.max_pieces)
+
+    def probe(self, board):
+        """Return (wdl, dtz) from the side to move's point of view, or None"""
+        with self.lock:
+            if not self.covers(board):
+                return None
+
+            key = chess.polyglot.zobrist_hash(board)
+            if key in self.cache:
+                self.cache.move_to_end(key)
+                self.cache_hits += 1
+                return self.cache[key]
+
+            self.probes += 1
+            try:
+                result = (self.tables.probe_wdl(board), self.tables.probe_dtz(board))
+            except KeyError:
+                # MissingTableError, or a position the tables cannot answer
+                result = None
+
+            self.cache[key] = result
+            if len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+            return result
+
+    def best_move(self, board):
+        """Pick the move that keeps the best WDL result and converts fastest, or None"""
+        if self.probe(board) is None:
+            return None
+
+        board = board.copy(stack=False)
+        best_move = None
+        best_key = None
+        for move in board.legal_moves:
+            board.push(move)
+            if board.is_checkmate():
+                board.pop()
+                return move
+            result = self.probe(board)
+            board.pop()
+            if result is None:
+                return None
+
+            # Results are from the opponent's side after our move
+            wdl, dtz = -result[0], -result[1]
+            zeroing = board.is_zeroing(move)
+            if wdl > 0:
+                # Winning: prefer zeroing moves, then the shortest distance to zeroing
+                key = (wdl, zeroing, -abs(dtz))
+            else:
+                # Drawing or losing: hold on as long as possible
+                key = (wdl, not zeroing, abs(dtz))
+            if best_key is None or key > best_key:
+                best_key = key
+                best_move = move
+        return best_move
+
+    def describe(self, board):
+        """Short text for the tablebase result of the position, or None"""
+        result = self.probe(board)
+        if result is None:
+            return None
+        wdl = result[0]
+        if wdl == 0:
+            return "Tablebase: draw"
+        if abs(wdl) == 1:
+            return "Tablebase: draw (50-move rule)"
+        winner = board.turn if wdl > 0 else not board.turn
+        name = "White" if winner == chess.WHITE else "Black"
+        return f"Tablebase: {name} wins"
+
+    def close(self):
+        """Close the table files"""
+        with self.lock:
+            if self.tables is not None:
+                self.tables.close()
+                self.tables = None
@@ -0,0 +1,50 @@
+# Minimal UCI engine for tests: plays the first legal move, and can be told to crash
+import argparse
+import os
+import sys
+import time
+
+import chess
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--crash-after", type=int, help="exit without answering the Nth go")
+    parser.add_argument("--crashed-marker", help="file created on crashing; refuse to start while it exists")
+    parser.add_argument("--delay", type=float, default=0.0, help="seconds to think per go")
+    args = parser.parse_args()
+
+    if args.crashed_marker and os.path.exists(args.crashed_marker):
+        sys.exit(1)
+
+    board = chess.Board()
+    searches = 0
+    for line in sys.stdin:
+        tokens = line.split()
+        if not tokens:
+            continue
+        command = tokens[0]
+        if command == "uci":
+            print("id name Fake\nuciok", flush=True)
+        elif command == "isready":
+            print("readyok", flush=True)
+        elif command == "position":
+            moves = tokens.index("moves") if "moves" in tokens else len(tokens)
+            board = chess.Board() if tokens[1] == "startpos" else chess.Board(" ".join(tokens[2:moves]))
+            for uci in tokens[moves + 1:]:
+                board.push_uci(uci)
+        elif command == "go":
+            searches += 1
+            if searches == args.crash_after:
+                if args.crashed_marker:
+                    open(args.crashed_marker, "w").close()
+                sys.exit(1)
+            time.sleep(args.delay)
+            move = next(iter(board.legal_moves), None)
+            print(f"bestmove {move.uci() if move else '0000'}", flush=True)
+        elif command == "quit":
+            break
+
+
+if __name__ == "__main__":
+    main()
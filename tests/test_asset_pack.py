@@ -0,0 +1,47 @@
+import os
+
+import pygame
+
+from asset_pack import AssetPack, encode_pack, source_stamps, write_pack
+
+
+def build(tmp_path, sources):
+    """Write a pack holding one sprite and one sound, stamped with sources"""
+    sprite = pygame.Surface((4, 4), pygame.SRCALPHA)
+    sound = (44100, 1, 2, b"\x00\x00" * 8)
+    path = str(tmp_path / "assets.pack")
+    write_pack(path, encode_pack(4, {"wp": sprite}, {"move": sound}, source_stamps(sources)))
+    return path
+
+
+def test_pack_round_trip(tmp_path):
+    path = build(tmp_path, [])
+    pack = AssetPack.load(path, 4, {})
+    assert pack is not None
+    assert pack.sprite("wp").get_size() == (4, 4)
+    assert pack.sound_names() == ["move"]
+    assert AssetPack.load(path, 8) is None
+
+
+def test_pack_stale_when_a_source_changes(tmp_path):
+    images = tmp_path / "images"
+    images.mkdir()
+    image = images / "wp.png"
+    image.write_bytes(b"old")
+    sources = [str(image), str(images / "bp.png")]
+    path = build(tmp_path, sources)
+    assert AssetPack.load(path, 4, source_stamps(sources)) is not None
+
+    # Edited in place
+    image.write_bytes(b"edited")
+    assert AssetPack.load(path, 4, source_stamps(sources)) is None
+
+    # Added
+    path = build(tmp_path, sources)
+    (images / "bp.png").write_bytes(b"new")
+    assert AssetPack.load(path, 4, source_stamps(sources)) is None
+
+    # Removed
+    path = build(tmp_path, sources)
+    os.remove(image)
+    assert AssetPack.load(path, 4, source_stamps(sources)) is None
@@ -0,0 +1,70 @@
+import random
+
+import chess
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from batch_eval import MOBILITY_WEIGHT, evaluate_batch, evaluate_moves  # noqa: E402
+from search import evaluate  # noqa: E402
+
+
+def random_positions(count=60, seed=7):
+    """Positions from seeded random playouts, openings through endgames"""
+    rng = random.Random(seed)
+    positions = []
+    while len(positions) < count:
+        board = chess.Board()
+        for _ in range(rng.randrange(10, 120)):
+            moves = list(board.legal_moves)
+            if not moves:
+                break
+            board.push(rng.choice(moves))
+        positions.append(board)
+    return positions
+
+
+def reference_mobility(board, color):
+    """Squares attacked by color's knights, bishops, rooks and queens that it does not occupy"""
+    occupied = board.occupied
+    knights = diagonal = orthogonal = 0
+    for square in board.pieces(chess.KNIGHT, color):
+        knights |= chess.BB_KNIGHT_ATTACKS[square]
+    for square in board.pieces(chess.BISHOP, color) | board.pieces(chess.QUEEN, color):
+        diagonal |= chess.BB_DIAG_ATTACKS[square][chess.BB_DIAG_MASKS[square] & occupied]
+    for square in board.pieces(chess.ROOK, color) | board.pieces(chess.QUEEN, color):
+        orthogonal |= chess.BB_RANK_ATTACKS[square][chess.BB_RANK_MASKS[square] & occupied]
+        orthogonal |= chess.BB_FILE_ATTACKS[square][chess.BB_FILE_MASKS[square] & occupied]
+    free = ~board.occupied_co[color]
+    return sum(chess.popcount(attacks & free) for attacks in (knights, diagonal, orthogonal))
+
+
+def test_matches_search_evaluate_without_mobility():
+    boards = random_positions()
+    assert evaluate_batch(boards, mobility_weight=0).tolist() == [evaluate(board) for board in boards]
+
+
+def test_mobility_term():
+    boards = random_positions()
+    expected = []
+    for board in boards:
+        score = MOBILITY_WEIGHT * (reference_mobility(board, chess.WHITE) - reference_mobility(board, chess.BLACK))
+        expected.append(evaluate(board) + (score if board.turn == chess.WHITE else -score))
+    assert evaluate_batch(boards).tolist() == expected
+
+
+def test_evaluate_moves_scores_for_the_mover():
+    for board in random_positions(count=10, seed=3):
+        moves = list(board.legal_moves)
+        if not moves:
+            continue
+        expected = []
+        for move in moves:
+            board.push(move)
+            expected.append(-evaluate(board))
+            board.pop()
+        assert evaluate_moves(board, moves, mobility_weight=0).tolist() == expected
+
+
+def test_empty_batch():
+    assert len(evaluate_batch([])) == 0
@@ -0,0 +1,90 @@
+import chess
+import pytest
+
+from game_core import BRONSTEIN, FISCHER, GameCore, ManualClock
+
+
+def new_game(increment=0.0, increment_mode=FISCHER):
+    clock = ManualClock()
+    core = GameCore(time_control=60, ai_enabled=False, time_source=clock,
+                    increment=increment, increment_mode=increment_mode)
+    return core, clock
+
+
+def play(core, clock, *moves, think=0.0):
+    """Play UCI moves, each after think seconds on the mover's clock"""
+    for uci in moves:
+        clock.advance(think)
+        core.update_timer()
+        core.make_move(chess.Move.from_uci(uci))
+
+
+def test_clocks_start_after_the_first_moves():
+    core, clock = new_game()
+    play(core, clock, "e2e4", "e7e5", think=5)
+    assert core.game_started
+    assert (core.white_time, core.black_time) == (60, 60)
+
+    play(core, clock, "g1f3", think=7)
+    assert core.white_time == pytest.approx(53)
+    play(core, clock, "b8c6", think=2)
+    assert core.black_time == pytest.approx(58)
+
+
+def test_fischer_increment_is_added_every_move():
+    core, clock = new_game(increment=2)
+    play(core, clock, "e2e4", "e7e5")
+    play(core, clock, "g1f3", think=1)
+    assert core.white_time == pytest.approx(61)
+    play(core, clock, "b8c6", think=5)
+    assert core.black_time == pytest.approx(57)
+
+
+def test_bronstein_gives_back_at_most_the_time_used():
+    core, clock = new_game(increment=2, increment_mode=BRONSTEIN)
+    play(core, clock, "e2e4", "e7e5")
+    play(core, clock, "g1f3", think=1)
+    assert core.white_time == pytest.approx(60)
+    play(core, clock, "b8c6", think=5)
+    assert core.black_time == pytest.approx(57)
+
+
+def test_flag_fall_ends_the_game_without_playing_the_move():
+    core, clock = new_game()
+    play(core, clock, "e2e4", "e7e5")
+    clock.advance(61)
+    core.make_move(chess.Move.from_uci("g1f3"))
+    assert core.game_over and core.winner == "Black"
+    assert core.white_time == 0
+    assert len(core.board.move_stack) == 2
+
+
+def test_flag_fall_keeps_the_redo_line():
+    core, clock = new_game()
+    play(core, clock, "e2e4", "e7e5", "g1f3")
+    core.undo_move()
+    clock.advance(61)
+    core.make_move(chess.Move.from_uci("d2d4"))
+    assert core.game_over
+    assert core.redo_stack == [chess.Move.from_uci("g1f3")]
+
+
+def test_manual_clock_only_moves_when_told():
+    clock = ManualClock(10)
+    assert clock() == 10
+    clock.advance(2.5)
+    assert clock() == 12.5
+
+
+def test_undo_charges_the_side_that_was_thinking():
+    core, clock = new_game()
+    play(core, clock, "e2e4", "e7e5", "g1f3", think=1)
+    clock.advance(4)
+    core.undo_move()
+    assert core.black_time == pytest.approx(56)
+    assert core.white_time == pytest.approx(59)
+
+    clock.advance(2)
+    core.update_timer()
+    assert core.white_time == pytest.approx(57)
+    assert core.black_time == pytest.approx(56)
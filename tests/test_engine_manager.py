@@ -0,0 +1,134 @@
+import os
+import sys
+import threading
+import time
+
+import chess
+import chess.engine
+
+from engine_manager import EngineManager
+from game_core import GameCore
+
+FAKE_ENGINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fake_uci_engine.py")
+
+
+def fake_engine(*args):
+    return [sys.executable, FAKE_ENGINE, *args]
+
+
+def test_best_move_from_pool():
+    manager = EngineManager(fake_engine(), pool_size=1)
+    try:
+        board = chess.Board()
+        assert manager.best_move(board) in board.legal_moves
+        assert manager.best_move(board) in board.legal_moves
+        assert manager.restarts == 0
+    finally:
+        manager.shutdown()
+
+
+def test_restart_after_engine_dies():
+    manager = EngineManager(fake_engine("--crash-after", "2"), pool_size=1)
+    try:
+        board = chess.Board()
+        assert manager.best_move(board) is not None
+        # The second search kills the engine; the call is retried on a fresh process
+        assert manager.best_move(board) in board.legal_moves
+        assert manager.restarts == 1
+        assert manager.best_move(board) is not None
+    finally:
+        manager.shutdown()
+
+
+def test_failed_restart_does_not_hang(tmp_path):
+    marker = str(tmp_path / "crashed")
+    manager = EngineManager(fake_engine("--crash-after", "1", "--crashed-marker", marker), pool_size=1)
+    try:
+        board = chess.Board()
+        assert manager.best_move(board) is None
+        assert not manager.available
+
+        # Later callers fall back at once instead of waiting for an engine that is gone
+        start = time.perf_counter()
+        assert manager.best_move(board) is None
+        assert time.perf_counter() - start < 1.0
+    finally:
+        manager.shutdown()
+
+
+def test_concurrent_callers_share_the_pool():
+    manager = EngineManager(fake_engine("--delay", "0.02"), pool_size=2)
+    results = []
+    lock = threading.Lock()
+
+    def play():
+        for _ in range(5):
+            move = manager.best_move(chess.Board())
+            with lock:
+                results.append(move)
+
+    try:
+        threads = [threading.Thread(target=play) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=30)
+        assert len(results) == 30
+        assert all(move in chess.Board().legal_moves for move in results)
+        assert len(manager._engines) == 2
+    finally:
+        manager.shutdown()
+
+
+def test_shutdown_releases_waiting_callers():
+    manager = EngineManager(fake_engine("--delay", "1.0"), pool_size=1)
+    manager.start()
+    results = []
+    busy = threading.Thread(target=lambda: results.append(manager.best_move(chess.Board())))
+    waiting = threading.Thread(target=lambda: results.append(manager.best_move(chess.Board())))
+    busy.start()
+    time.sleep(0.2)
+    waiting.start()
+    time.sleep(0.2)
+
+    manager.shutdown()
+    waiting.join(timeout=2)
+    busy.join(timeout=5)
+    assert not waiting.is_alive()
+    assert not busy.is_alive()
+
+
+class RecordingEngine:
+    """Stands in for EngineManager, remembering the limits it was asked to play with"""
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.limits = []
+
+    def best_move(self, board, limit=None):
+        self.limits.append(limit)
+        return next(iter(board.legal_moves))
+
+    def shutdown(self):
+        pass
+
+
+def test_engine_moves_use_the_time_budget():
+    engine = RecordingEngine(chess.engine.Limit(depth=15))
+    core = GameCore(ai_enabled=False, engine=engine)
+    move = core.choose_ai_move(chess.Board(), budget=(0.5, 1.5))
+    assert move is not None
+    assert engine.limits[-1].time == 0.5 and engine.limits[-1].depth == 15
+
+    core.choose_ai_move(chess.Board(), budget=(None, 2.0), max_depth=6, max_nodes=1000)
+    limit = engine.limits[-1]
+    assert (limit.time, limit.depth, limit.nodes) == (2.0, 6, 1000)
+
+
+def test_engine_move_is_not_made_after_stop():
+    engine = RecordingEngine(chess.engine.Limit(depth=15))
+    core = GameCore(ai_enabled=False, engine=engine)
+    stop_event = threading.Event()
+    stop_event.set()
+    assert core.choose_ai_move(chess.Board(), stop_event=stop_event, budget=(1.0, 1.0)) is None
+    assert engine.limits == []
@@ -0,0 +1,25 @@
+import json
+
+from epd_suite import budget_label, main
+
+MATE_IN_ONE = '6k1/5ppp/8/8/8/8/8/R5K1 w - - bm Ra8; id "back rank";\n'
+
+
+def test_distinct_budgets_get_distinct_labels():
+    assert budget_label(("time", 0.1)) == "0.1s"
+    assert budget_label(("time", 2.0)) == "2s"
+    assert budget_label(("time", 0.1000001)) != budget_label(("time", 0.1))
+    assert budget_label(("nodes", 500)) == "500n"
+
+
+def test_repeated_budget_runs_once(tmp_path):
+    suite = tmp_path / "suite.epd"
+    suite.write_text(MATE_IN_ONE)
+    output = tmp_path / "results.json"
+    assert main([str(suite), "--nodes", "500", "500", "2000", "-j", "1", "--json", str(output)]) == 0
+
+    results = json.loads(output.read_text())
+    assert results["budgets"] == ["500n", "2000n"]
+    position = results["positions"][0]
+    assert position["id"] == "back rank"
+    assert all(position["results"][label]["solved"] for label in results["budgets"])
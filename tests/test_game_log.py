@@ -0,0 +1,85 @@
+import chess
+import pytest
+
+from game_core import BRONSTEIN, FISCHER, GameCore, ManualClock
+from game_log import RECORD_SIZE, GameRecorder, read_game, read_games
+
+FEN = "r1bqkbnr/pppp1ppp/2n5/4p3/4P3/5N2/PPPP1PPP/RNBQKB1R w KQkq - 2 3"
+
+
+def test_round_trip_from_a_position_with_undo(tmp_path):
+    log = str(tmp_path / "games.log")
+    recorder = GameRecorder(log)
+    board = chess.Board(FEN)
+    for uci in ("f1b5", "a7a6", "b5a4"):
+        board.push_uci(uci)
+        recorder.record_move(board, 300, 2, 290.5, 280.25, BRONSTEIN)
+    board.pop()
+    recorder.record_undo(291, 280.25)
+    board.push_uci("b5c6")
+    recorder.record_move(board, 300, 2, 289, 280.25, BRONSTEIN)
+    recorder.finish("White", "abandoned")
+    recorder.close()
+
+    games = list(read_games(log))
+    assert len(games) == 1
+    game = games[0]
+    assert game.finished and game.winner == "White" and game.reason == "abandoned"
+    assert game.fen == FEN
+    assert (game.time_control, game.increment, game.increment_mode) == (300, 2, BRONSTEIN)
+    assert game.moves == board.move_stack
+    assert game.clock == (289, 280.25)
+    assert game.board().fen() == board.fen()
+    assert game.to_pgn().headers["Result"] == "1-0"
+    assert read_game(log, game.number).moves == game.moves
+
+
+def test_resume_unfinished_game_with_clocks(tmp_path):
+    log = str(tmp_path / "games.log")
+    clock = ManualClock()
+    core = GameCore(time_control=60, ai_enabled=False, time_source=clock, increment=1,
+                    recorder=GameRecorder(log))
+    for uci in ("e2e4", "e7e5", "g1f3"):
+        clock.advance(3)
+        core.update_timer()
+        core.make_move(chess.Move.from_uci(uci))
+    clock.advance(4)
+    core.shutdown()
+
+    # A session started with another control still continues the recorded one
+    resumed = GameCore(time_control=300, increment=5, increment_mode=BRONSTEIN, ai_enabled=False,
+                       time_source=ManualClock(), recorder=GameRecorder(log))
+    assert resumed.resume_recorded_game()
+    assert resumed.board.fen() == core.board.fen()
+    assert (resumed.time_control, resumed.increment, resumed.increment_mode) == (60, 1, FISCHER)
+    assert resumed.white_time == pytest.approx(core.white_time, abs=0.001)
+    assert resumed.black_time == pytest.approx(56, abs=0.001)
+    assert resumed.game_started
+    resumed.shutdown()
+
+
+def test_finished_game_is_not_resumed(tmp_path):
+    log = str(tmp_path / "games.log")
+    recorder = GameRecorder(log)
+    board = chess.Board()
+    board.push_uci("e2e4")
+    recorder.record_move(board, 60, 0, 60, 60)
+    recorder.finish("Draw", "abandoned")
+    recorder.close()
+    assert GameRecorder(log).unfinished_game() is None
+
+
+def test_torn_last_record_is_dropped(tmp_path):
+    log = str(tmp_path / "games.log")
+    recorder = GameRecorder(log)
+    board = chess.Board()
+    for uci in ("d2d4", "d7d5"):
+        board.push_uci(uci)
+        recorder.record_move(board, 60, 0, 60, 60)
+    recorder.close()
+    with open(log, "ab") as f:
+        f.write(b"\x03" * (RECORD_SIZE // 2))
+
+    game = GameRecorder(log).unfinished_game()
+    assert game is not None
+    assert game.moves == board.move_stack
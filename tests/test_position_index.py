@@ -0,0 +1,114 @@
+import os
+
+import chess
+
+from game_log import INDEX_ENTRY, GameRecorder, PositionIndex
+
+
+def record_game(recorder, moves, winner="Draw", reason="abandoned"):
+    """Write a game of UCI moves to the log; winner None leaves it unfinished"""
+    board = chess.Board()
+    for uci in moves:
+        board.push_uci(uci)
+        recorder.record_move(board, 180, 0, 180, 180)
+    if winner is not None:
+        recorder.finish(winner, reason)
+    else:
+        recorder.in_game = False  # As if the process died mid-game
+    return board
+
+
+def test_find_positions_of_finished_games(tmp_path):
+    log = str(tmp_path / "games.log")
+    recorder = GameRecorder(log)
+    board = record_game(recorder, ["e2e4", "e7e5", "g1f3"])
+    record_game(recorder, ["d2d4", "d7d5"])
+
+    index = PositionIndex(str(tmp_path / "games.idx"))
+    assert index.update(log) == 2
+    assert index.count == 4 + 3
+    first = index.find(board)
+    assert len(first) == 1 and first[0][1] == 3
+    assert len(index.find(chess.Board())) == 2
+    index.close()
+    recorder.close()
+
+
+def test_abandoned_game_does_not_block_later_games(tmp_path):
+    log = str(tmp_path / "games.log")
+    recorder = GameRecorder(log)
+    record_game(recorder, ["e2e4", "e7e5"], winner=None)
+    after = record_game(recorder, ["c2c4", "c7c5"])
+
+    index = PositionIndex(str(tmp_path / "games.idx"))
+    assert index.update(log) == 1
+    assert index.find(after)
+    record_game(recorder, ["g1f3"])
+    assert index.update(log) == 1
+    index.close()
+    recorder.close()
+
+
+def test_game_in_progress_is_indexed_once_finished(tmp_path):
+    log = str(tmp_path / "games.log")
+    recorder = GameRecorder(log)
+    record_game(recorder, ["e2e4"])
+    board = chess.Board()
+    board.push_uci("d2d4")
+    recorder.record_move(board, 180, 0, 180, 180)
+
+    index = PositionIndex(str(tmp_path / "games.idx"))
+    assert index.update(log) == 1
+    assert index.update(log) == 0
+    assert not index.find(board)
+
+    recorder.finish("White", "time forfeit")
+    assert index.update(log) == 1
+    assert index.find(board)
+    index.close()
+    recorder.close()
+
+
+def test_updates_append_runs_and_survive_reopening(tmp_path):
+    log = str(tmp_path / "games.log")
+    path = str(tmp_path / "games.idx")
+    recorder = GameRecorder(log)
+    index = PositionIndex(path)
+    openings = ["e2e4", "d2d4", "c2c4", "g1f3", "b2b3", "f2f4", "b1c3", "g2g3"]
+    for number in range(40):
+        record_game(recorder, [openings[number % 8], "e7e5" if number % 2 else "d7d5"])
+        assert index.update(log) == 1
+    # Runs merge geometrically instead of the whole file being rewritten each time
+    assert len(index.runs) <= 6
+    assert index.count == 40 * 3
+    assert len(index.find(chess.Board())) == 40
+    index.close()
+
+    reopened = PositionIndex(path)
+    assert reopened.count == 40 * 3
+    assert reopened.update(log) == 0
+    reopened.close()
+    recorder.close()
+
+
+def test_run_cut_short_is_indexed_again(tmp_path):
+    log = str(tmp_path / "games.log")
+    path = str(tmp_path / "games.idx")
+    recorder = GameRecorder(log)
+    record_game(recorder, ["e2e4"])
+    index = PositionIndex(path)
+    index.update(log)
+    record_game(recorder, ["d2d4", "d7d5", "c2c4", "e7e6"])
+    index.update(log)
+    covered = index.covered
+    index.close()
+
+    # Lose the end of the last run, as a crash during a write would
+    with open(path, "r+b") as f:
+        f.truncate(os.path.getsize(path) - INDEX_ENTRY.size)
+    index = PositionIndex(path)
+    assert index.covered < covered
+    assert index.update(log) >= 1
+    assert index.count == 2 + 5
+    index.close()
+    recorder.close()
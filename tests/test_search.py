@@ -0,0 +1,40 @@
+import time
+
+import chess
+
+from search import CHECK_MASK, Searcher
+
+MIDDLEGAME = "r1bq1rk1/pp2bppp/2n1pn2/2pp4/3P4/2PBPN2/PP1N1PPP/R2QK2R w KQ - 0 8"
+
+
+def test_node_budget_is_checked_often():
+    result = Searcher().search(chess.Board(MIDDLEGAME), max_nodes=1000)
+    assert result.move is not None
+    assert 1000 <= result.nodes <= 1000 + CHECK_MASK
+
+
+def test_time_budget_is_not_overrun():
+    start = time.perf_counter()
+    result = Searcher().search(chess.Board(MIDDLEGAME), max_time=0.05, soft_time=0.05)
+    elapsed = time.perf_counter() - start
+    assert result.move is not None
+    # Generous for loaded machines; checking every 1024 nodes overran by tens of milliseconds
+    assert elapsed < 0.05 + 0.03
+
+
+def test_soft_time_does_not_run_on_to_hard():
+    start = time.perf_counter()
+    # Depth 4 ends well inside soft; depth 5 would take about three times soft
+    result = Searcher().search(chess.Board(MIDDLEGAME), max_time=10.0, soft_time=2.0)
+    elapsed = time.perf_counter() - start
+    assert result.depth >= 3
+    assert elapsed < 3.5
+
+
+def test_soft_time_cuts_the_running_iteration():
+    start = time.perf_counter()
+    # Depth 3 alone takes about half a second here; it is cut at soft once its first root move is scored
+    result = Searcher().search(chess.Board(MIDDLEGAME), max_time=10.0, soft_time=0.15)
+    elapsed = time.perf_counter() - start
+    assert result.move is not None and result.depth >= 1
+    assert elapsed < 0.3
@@ -0,0 +1,69 @@
+import asyncio
+import json
+
+from server import GameServer
+
+
+async def exchange(requests):
+    """Send each request on one connection and return the reply to each"""
+    server = GameServer(ai_workers=1)
+    listener = await server.start("127.0.0.1", 0)
+    port = listener.sockets[0].getsockname()[1]
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    replies = []
+    try:
+        for request in requests:
+            writer.write((request if isinstance(request, str) else json.dumps(request)).encode() + b"\n")
+            await writer.drain()
+            replies.append(json.loads(await asyncio.wait_for(reader.readline(), 5)))
+    finally:
+        writer.close()
+        listener.close()
+        await listener.wait_closed()
+        server.close()
+    return replies
+
+
+def errors(replies):
+    return [reply.get("error") for reply in replies]
+
+
+def test_hotseat_game():
+    created, moved = asyncio.run(exchange([
+        {"cmd": "new", "mode": "hotseat", "id": 1},
+        {"cmd": "move", "game": 1, "move": "e2e4", "id": 2},
+    ]))
+    assert created["event"] == "created" and created["id"] == 1
+    assert moved["event"] == "move" and moved["move"] == "e2e4" and moved["id"] == 2
+
+
+def test_malformed_requests_get_errors_and_keep_the_connection():
+    replies = asyncio.run(exchange([
+        "not json",
+        "[1, 2]",
+        "3",
+        {"cmd": "state", "game": [1]},
+        {"cmd": "state", "game": "1"},
+        {"cmd": "state", "game": True},
+        {"cmd": "new", "time": -5},
+        {"cmd": "new", "time": "nan"},
+        {"cmd": "new", "increment": -1},
+        {"cmd": "new", "mode": "hotseat"},
+        {"cmd": "move", "game": 1, "move": 5},
+        {"cmd": "state", "game": 1},
+    ]))
+    assert errors(replies) == [
+        "invalid JSON",
+        "request must be a JSON object",
+        "request must be a JSON object",
+        "game must be an integer id",
+        "game must be an integer id",
+        "game must be an integer id",
+        "time must be a positive number of seconds",
+        "time must be a positive number of seconds",
+        "increment must not be negative",
+        None,
+        "move must be a UCI string",
+        None,
+    ]
+    assert replies[-1]["event"] == "state"
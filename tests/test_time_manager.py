@@ -0,0 +1,54 @@
+import threading
+
+import chess
+
+from search import Searcher
+from time_manager import Ponderer, TimeManager
+
+
+def test_budget_never_exceeds_the_usable_clock():
+    manager = TimeManager()
+    board = chess.Board()
+    for remaining in (0.0, 0.3, 0.6, 1.0, 5.0, 60.0, 600.0):
+        for increment in (0.0, 1.0, 5.0, 30.0):
+            soft, hard = manager.budget(board, remaining, increment)
+            usable = max(remaining - manager.safety_margin, 0.0)
+            assert 0.0 <= soft <= hard <= usable
+
+
+def test_budget_respects_min_and_max_time():
+    manager = TimeManager(max_time=2.0)
+    board = chess.Board()
+    soft, hard = manager.budget(board, 600.0, 10.0)
+    assert manager.min_time <= soft <= hard <= 2.0
+
+
+def test_increment_buys_more_time():
+    manager = TimeManager()
+    board = chess.Board()
+    assert manager.budget(board, 60.0, 5.0)[0] > manager.budget(board, 60.0, 0.0)[0]
+
+
+def test_ponderer_stopped_from_many_threads():
+    ponderer = Ponderer(Searcher())
+    board = chess.Board()
+    board.push_uci("e2e4")
+    errors = []
+
+    def stop():
+        try:
+            ponderer.stop(board)
+        except Exception as e:
+            errors.append(e)
+
+    for _ in range(20):
+        ponderer.start(chess.Board(), chess.Move.from_uci("e2e4"))
+        threads = [threading.Thread(target=stop) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert not ponderer.active
+    assert errors == []
+    # Only one of each round's stops finds the thread running
+    assert ponderer.hits + ponderer.misses == 20
@@ -0,0 +1,116 @@
+import io
+
+import chess
+
+from search import MATE_SCORE
+from uci import UCIEngine, parse_go, uci_score
+
+
+def new_engine():
+    engine = UCIEngine(output=io.StringIO())
+    engine.handle("setoption name OwnBook value false")
+    return engine
+
+
+def lines(engine):
+    return engine.output.getvalue().splitlines()
+
+
+def bestmoves(engine):
+    return [line for line in lines(engine) if line.startswith("bestmove")]
+
+
+def finish(engine):
+    """Wait for a search that ends by itself"""
+    if engine.thread is not None:
+        engine.thread.join(10)
+
+
+def test_parse_go():
+    assert parse_go("wtime 1000 btime 2000 winc 10 ponder searchmoves e2e4".split()) == {
+        "wtime": 1000, "btime": 2000, "winc": 10, "ponder": True}
+    assert parse_go(["depth", "x", "infinite"]) == {"infinite": True}
+
+
+def test_uci_score():
+    assert uci_score(35) == "cp 35"
+    assert uci_score(MATE_SCORE - 1) == "mate 1"
+    assert uci_score(-(MATE_SCORE - 2)) == "mate -1"
+
+
+def test_handshake_and_quit():
+    engine = new_engine()
+    assert engine.handle("uci")
+    assert engine.handle("isready")
+    output = lines(engine)
+    assert output[0].startswith("id name")
+    assert "uciok" in output and output[-1] == "readyok"
+    assert not engine.handle("quit")
+
+
+def test_go_depth_sends_info_and_a_legal_bestmove():
+    engine = new_engine()
+    engine.handle("position startpos moves e2e4 e7e5")
+    engine.handle("go depth 2")
+    finish(engine)
+    assert any(line.startswith("info depth 2") for line in lines(engine))
+    move = bestmoves(engine)[0].split()[1]
+    board = chess.Board()
+    board.push_uci("e2e4")
+    board.push_uci("e7e5")
+    assert chess.Move.from_uci(move) in board.legal_moves
+
+
+def test_position_from_fen_and_mate_search():
+    engine = new_engine()
+    engine.handle("position fen 6k1/5ppp/8/8/8/8/8/R5K1 w - - 0 1")
+    engine.handle("go mate 1")
+    finish(engine)
+    assert bestmoves(engine)[0].split()[1] == "a1a8"
+
+
+def test_invalid_position_is_reported_and_ignored():
+    engine = new_engine()
+    engine.handle("position startpos moves e2e5")
+    assert lines(engine)[-1].startswith("info string invalid position")
+    assert engine.board == chess.Board()
+
+
+def test_infinite_search_waits_for_stop():
+    engine = new_engine()
+    engine.handle("position startpos")
+    engine.handle("go infinite")
+    engine.handle("isready")
+    assert "readyok" in lines(engine)
+    assert bestmoves(engine) == []
+    engine.handle("stop")
+    assert len(bestmoves(engine)) == 1
+
+
+def test_ponder_stop_always_answers():
+    # The predicted reply mates, so the ponderer has nothing to search
+    engine = new_engine()
+    engine.handle("position fen 6k1/5ppp/8/8/8/8/8/R5K1 w - - 0 1 moves a1a8")
+    engine.handle("go ponder wtime 1000 btime 1000")
+    engine.handle("stop")
+    assert bestmoves(engine) == ["bestmove 0000"]
+
+
+def test_ponderhit_continues_the_search():
+    engine = new_engine()
+    engine.handle("position startpos moves e2e4 e7e5")
+    engine.handle("go ponder wtime 2000 btime 2000")
+    engine.handle("ponderhit")
+    finish(engine)
+    assert len(bestmoves(engine)) == 1
+
+
+def test_setoption():
+    engine = new_engine()
+    assert engine.core.book is None
+    engine.handle("setoption name OwnBook value true")
+    assert engine.core.book is engine.book
+    engine.handle("setoption name Hash value 1")
+    engine.handle("setoption name Hash value lots")
+    engine.handle("ucinewgame")
+    assert bestmoves(engine) == []
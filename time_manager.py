@@ -0,0 +1,109 @@
+import threading
+
+import chess
+import chess.polyglot
+
+PONDER_LIMIT = 120.0  # Never ponder longer than this many seconds
+
+
+class TimeManager:
+    """Split the remaining clock into a think budget for each move"""
+
+    def __init__(self, max_time=None, min_time=0.05, safety_margin=0.5, moves_to_go=None):
+        self.max_time = max_time            # Optional cap on any single move
+        self.min_time = min_time
+        self.safety_margin = safety_margin  # Seconds always kept in reserve
+        self.moves_to_go = moves_to_go      # Moves until the next time control, if any
+
+    def budget(self, board, remaining, increment=0.0, legal_moves=None):
+        """Return (soft, hard) think times in seconds for this move"""
+        # Expect fewer moves left as the game goes on
+        if self.moves_to_go:
+            moves_left = self.moves_to_go
+        else:
+            moves_left = max(15, 40 - board.fullmove_number // 2)
+
+        base = remaining / moves_left + increment * 0.8
+
+        # Spend more on positions with many options, less on forced-looking ones
+        if legal_moves is None:
+            legal_moves = board.legal_moves.count()
+        complexity = min(1.5, max(0.6, 0.6 + legal_moves / 40))
+        if board.is_check():
+            complexity *= 0.75
+
+        # No new search iteration starts after soft; the search must stop at hard
+        usable = max(remaining - self.safety_margin, 0.0)
+        soft = min(base * complexity, usable)
+        # The increment only arrives after the move, so it never lifts hard past the clock
+        hard = min(soft * 3, usable * 0.5 + increment, usable)
+        if self.max_time is not None:
+            soft = min(soft, self.max_time)
+            hard = min(hard, self.max_time)
+
+        # min_time gives way to the clock too; the search still finishes its first depth
+        soft = max(soft, self.min_time)
+        hard = min(max(hard, soft), usable)
+        soft = min(soft, hard)
+        return soft, hard
+
+
+class Ponderer:
+    """Search the expected position on the opponent's time"""
+
+    def __init__(self, searcher, max_time=PONDER_LIMIT):
+        self.searcher = searcher
+        self.max_time = max_time
+        self.thread = None
+        self.stop_event = None
+        self.key = None
+        self.result = None
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()  # Started and stopped from both the main thread and the AI worker
+
+    @property
+    def active(self):
+        """True while a ponder search is running"""
+        return self.thread is not None
+
+    def start(self, board, predicted_move):
+        """Start searching the position after the predicted reply"""
+        with self.lock:
+            self._stop()
+            position = board.copy()
+            position.push(predicted_move)
+            if position.is_game_over():
+                return
+
+            self.key = chess.polyglot.zobrist_hash(position)
+            self.result = None
+            self.stop_event = threading.Event()
+            self.thread = threading.Thread(target=self._run, args=(position, self.stop_event), daemon=True)
+            self.thread.start()
+
+    def _run(self, position, stop_event):
+        self.result = self.searcher.search(position, max_time=self.max_time, soft_time=self.max_time,
+                                           stop_event=stop_event)
+
+    def stop(self, board=None):
+        """Stop pondering and return its result if board is the pondered position"""
+        with self.lock:
+            if not self._stop():
+                return None
+            if board is None:
+                return None
+            if chess.polyglot.zobrist_hash(board) == self.key and self.result is not None:
+                self.hits += 1
+                return self.result
+            self.misses += 1
+            return None
+
+    def _stop(self):
+        """Stop and join the ponder thread with the lock held; False if none was running"""
+        if self.thread is None:
+            return False
+        self.stop_event.set()
+        self.thread.join()
+        self.thread = None
+        return True
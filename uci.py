@@ -0,0 +1,252 @@
+import sys
+import threading
+
+import chess
+
+from game_core import GameCore
+from opening_book import OpeningBook
+from search import MATE_SCORE, MATE_THRESHOLD, MAX_PLY
+from tablebase import Tablebase
+
+ENGINE_NAME = "Chess-MS"
+ENGINE_AUTHOR = "Chess-MS contributors"
+
+HASH_ENTRY_BYTES = 200  # Rough size of one transposition table entry in CPython
+DEFAULT_HASH_MB = 64
+MAX_HASH_MB = 4096
+MOVE_OVERHEAD = 0.03  # Seconds kept back from movetime for the GUI round trip
+
+# go parameters taking a number; times are in milliseconds
+GO_NUMBERS = ("wtime", "btime", "winc", "binc", "movestogo", "depth", "nodes", "movetime", "mate")
+GO_FLAGS = ("infinite", "ponder")
+
+
+def parse_go(tokens):
+    """go arguments as a dict of numbers and flags; searchmoves and unknown tokens are skipped"""
+    limits = {}
+    i = 0
+    while i < len(tokens):
+        token = tokens[i]
+        if token in GO_NUMBERS and i + 1 < len(tokens):
+            try:
+                limits[token] = int(tokens[i + 1])
+            except ValueError:
+                pass
+            i += 2
+        else:
+            if token in GO_FLAGS:
+                limits[token] = True
+            i += 1
+    return limits
+
+
+def uci_score(score):
+    """A search score as a UCI score string"""
+    if abs(score) >= MATE_THRESHOLD:
+        moves = (MATE_SCORE - abs(score) + 1) // 2
+        return f"mate {moves if score > 0 else -moves}"
+    return f"cp {score}"
+
+
+class UCIEngine:
+    """Speaks UCI on a text stream, playing through the same AI path as the GUI"""
+
+    def __init__(self, output=None):
+        self.output = output or sys.stdout
+        self.lock = threading.Lock()  # The search thread writes info and bestmove lines too
+
+        # Book, tablebase and built-in engine like the GUI, but never an external engine:
+        # the point is to test this project's AI
+        self.book = OpeningBook()
+        self.core = GameCore(book=self.book, tablebase=Tablebase(), ponder=True)
+        self.core.searcher.resize(DEFAULT_HASH_MB * 1024 * 1024 // HASH_ENTRY_BYTES)
+        self.board = chess.Board()
+
+        self.thread = None
+        self.stop_event = None
+        self.report = True  # Whether the running search sends bestmove when it ends
+        self.ponder_limits = None  # Limits of a go ponder, waiting for ponderhit or stop
+
+    def send(self, line):
+        with self.lock:
+            self.output.write(line + "\n")
+            self.output.flush()
+
+    def run(self, stream=None):
+        """Answer commands until quit or end of input"""
+        for line in stream or sys.stdin:
+            if not self.handle(line):
+                break
+        self.stop(report=False)
+
+    def handle(self, line):
+        """Process one command line; False after quit"""
+        tokens = line.split()
+        if not tokens:
+            return True
+        command, args = tokens[0], tokens[1:]
+
+        if command == "uci":
+            self.send(f"id name {ENGINE_NAME}")
+            self.send(f"id author {ENGINE_AUTHOR}")
+            self.send(f"option name Hash type spin default {DEFAULT_HASH_MB} min 1 max {MAX_HASH_MB}")
+            # Searches are pure Python, so a single thread is all the GIL lets us use
+            self.send("option name Threads type spin default 1 min 1 max 1")
+            self.send("option name Ponder type check default true")
+            self.send("option name OwnBook type check default true")
+            self.send("uciok")
+        elif command == "isready":
+            # Answered at once, even mid-search; commands are only ever handled on this thread
+            self.send("readyok")
+        elif command == "setoption":
+            self.set_option(args)
+        elif command == "ucinewgame":
+            self.stop(report=False)
+            self.core.searcher.clear()
+        elif command == "position":
+            self.set_position(args)
+        elif command == "go":
+            self.go(parse_go(args))
+        elif command == "stop":
+            self.stop()
+        elif command == "ponderhit":
+            self.ponder_hit()
+        elif command == "quit":
+            return False
+        return True
+
+    def set_option(self, args):
+        """setoption name <name> [value <value>]"""
+        if "name" not in args:
+            return
+        start = args.index("name") + 1
+        end = args.index("value") if "value" in args else len(args)
+        name = " ".join(args[start:end]).lower()
+        value = " ".join(args[end + 1:])
+
+        if name == "hash":
+            try:
+                megabytes = min(max(int(value), 1), MAX_HASH_MB)
+            except ValueError:
+                return
+            self.stop(report=False)
+            self.core.searcher.resize(megabytes * 1024 * 1024 // HASH_ENTRY_BYTES)
+        elif name == "ownbook":
+            self.core.book = self.book if value.lower() == "true" else None
+
+    def set_position(self, args):
+        """position (startpos | fen <fen>) [moves <move>...]"""
+        moves = args.index("moves") if "moves" in args else len(args)
+        try:
+            if args and args[0] == "fen":
+                board = chess.Board(" ".join(args[1:moves]))
+            else:
+                board = chess.Board()
+            for uci in args[moves + 1:]:
+                board.push_uci(uci)
+        except ValueError as e:
+            self.send(f"info string invalid position: {e}")
+            return
+        self.board = board
+
+    def go(self, limits):
+        """Start thinking; bestmove is sent from the search thread"""
+        self.stop(report=False)
+        if limits.get("ponder"):
+            self.ponder_limits = limits
+            if self.board.move_stack:
+                # The GUI's position already ends with the reply we predicted; think on its time
+                # with the GUI's own ponderer, so the search after ponderhit can reuse the result
+                before = self.board.copy()
+                predicted = before.pop()
+                self.core.ponderer.start(before, predicted)
+                return
+        self.start(limits)
+
+    def start(self, limits):
+        # Clock settings are shared with the core, so they are only ever written on this thread
+        white = self.board.turn == chess.WHITE
+        self.core.increment = limits.get("winc" if white else "binc", 0) / 1000
+        self.core.time_manager.moves_to_go = limits.get("movestogo")
+
+        self.stop_event = threading.Event()
+        self.report = True
+        self.thread = threading.Thread(target=self._think, args=(self.board.copy(), limits, self.stop_event),
+                                       daemon=True)
+        self.thread.start()
+
+    def ponder_hit(self):
+        """The predicted reply was played; carry on with a normal search, keeping the ponder result"""
+        limits = self.ponder_limits
+        if limits is None:
+            return
+        self.ponder_limits = None
+        self.stop_thread(report=False)
+        self.start(dict(limits, ponder=False))
+
+    def stop(self, report=True):
+        """Stop thinking; the stopped search still sends its bestmove if report is set"""
+        # A go ponder owes a bestmove even if the ponderer had nothing to search,
+        # say after a game-ending prediction
+        if self.ponder_limits is not None and self.thread is None:
+            result = self.core.ponderer.stop(self.board)
+            if report:
+                move = result.move if result is not None else next(iter(self.board.legal_moves), None)
+                self.send(f"bestmove {move.uci() if move is not None else '0000'}")
+        self.ponder_limits = None
+        self.stop_thread(report)
+
+    def stop_thread(self, report):
+        if self.thread is None:
+            return
+        self.report = report
+        self.stop_event.set()
+        self.thread.join()
+        self.thread = None
+
+    def _think(self, board, limits, stop_event):
+        if "movetime" in limits:
+            move_time = max(limits["movetime"] / 1000 - MOVE_OVERHEAD, 0.0)
+            budget = (move_time, move_time)
+        elif ("wtime" if board.turn == chess.WHITE else "btime") in limits:
+            budget = None  # The time manager splits the clock as in a game
+        else:
+            budget = (None, None)
+        remaining = limits.get("wtime" if board.turn == chess.WHITE else "btime", 0) / 1000
+
+        # A mate in n is found within 2n - 1 plies
+        max_depth = limits.get("depth", MAX_PLY)
+        if "mate" in limits:
+            max_depth = min(max_depth, 2 * limits["mate"] - 1)
+
+        self.core.last_search = None
+        move = self.core.choose_ai_move(board, remaining, stop_event, budget=budget,
+                                        max_depth=max(max_depth, 1), max_nodes=limits.get("nodes"),
+                                        on_iteration=self.send_info)
+
+        # While pondering or in infinite mode the GUI expects no bestmove before it says stop
+        if limits.get("infinite") or limits.get("ponder"):
+            stop_event.wait()
+        if not self.report:
+            return
+
+        line = f"bestmove {move.uci() if move is not None else '0000'}"
+        search = self.core.last_search
+        if search is not None and len(search.pv) >= 2 and search.pv[0] == move:
+            line += f" ponder {search.pv[1].uci()}"
+        self.send(line)
+
+    def send_info(self, result):
+        """One info line per completed depth"""
+        pv = " ".join(move.uci() for move in result.pv)
+        self.send(f"info depth {result.depth} score {uci_score(result.score)} nodes {result.nodes} "
+                  f"nps {result.nps} time {int(result.time * 1000)} pv {pv}")
+
+
+def main():
+    UCIEngine().run()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())